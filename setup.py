@@ -0,0 +1,20 @@
+"""
+Optional compiled extensions.
+
+Project metadata lives in pyproject.toml. This file only adds the
+Cython extensions when Cython is available:
+
+    pip install cython && python setup.py build_ext --inplace
+
+Without them the pure-Python fallbacks are used.
+"""
+
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize(["src/ai/llm/_usage.pyx"], language_level=3)
+except ImportError:
+    ext_modules = []
+
+setup(ext_modules=ext_modules)
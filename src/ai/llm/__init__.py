@@ -1,9 +1,56 @@
 """LLM client integrations."""
-from .client import MultiModelClient
-from .extended_thinking import ExtendedThinkingReviewer
+import sys
+import asyncio
+
+from .client import MultiModelClient, BudgetExceededError
+from .limits import CircuitOpenError
+from .cache import LLMCache, InMemoryLRU, RedisBackend, FileBackend
+from .semantic_cache import SemanticCache
+from .batch import BatchJob
+from .pipeline import Pipeline, SemanticVariable
+from .extended_thinking import ExtendedThinkingReviewer, ReviewError
 from .model_router import ModelRouter
 
-__all__ = ["MultiModelClient", "ExtendedThinkingReviewer", "ModelRouter"]
+
+def _install_fast_loop() -> None:
+    """
+    Use a faster event loop for the I/O-bound LLM clients, if installed.
+
+    uringcore (io_uring, Linux kernel >= 5.11) is preferred; uvloop
+    (libuv) is the portable fallback. Without either, the default
+    asyncio loop is kept.
+    """
+    if sys.platform not in {"linux", "darwin"}:
+        return
+    try:
+        import uringcore
+        asyncio.set_event_loop_policy(uringcore.EventLoopPolicy())
+    except ImportError:
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
+
+
+_install_fast_loop()
+
+__all__ = [
+    "MultiModelClient",
+    "BudgetExceededError",
+    "CircuitOpenError",
+    "ExtendedThinkingReviewer",
+    "ReviewError",
+    "ModelRouter",
+    "LLMCache",
+    "InMemoryLRU",
+    "RedisBackend",
+    "FileBackend",
+    "SemanticCache",
+    "BatchJob",
+    "Pipeline",
+    "SemanticVariable",
+]
 
 
 
@@ -0,0 +1,74 @@
+# cython: language_level=3
+"""
+Compiled usage accumulator
+==========================
+
+Drop-in replacement for the pure-Python ``UsageStats`` in ``client.py``,
+with C-typed counters. Built optionally via ``setup.py``.
+"""
+
+
+cdef class UsageStats:
+    """Token usage statistics."""
+    cdef public long long input_tokens
+    cdef public long long output_tokens
+    cdef public long long thinking_tokens
+    cdef public long long cache_read_tokens
+    cdef public long long cache_write_tokens
+    cdef public double cost_usd
+    cdef public long long requests
+
+    def __init__(
+        self,
+        long long input_tokens=0,
+        long long output_tokens=0,
+        long long thinking_tokens=0,
+        long long cache_read_tokens=0,
+        long long cache_write_tokens=0,
+        double cost_usd=0.0,
+        long long requests=0,
+    ):
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.thinking_tokens = thinking_tokens
+        self.cache_read_tokens = cache_read_tokens
+        self.cache_write_tokens = cache_write_tokens
+        self.cost_usd = cost_usd
+        self.requests = requests
+
+    cpdef add(
+        self,
+        long long input_t,
+        long long output_t,
+        long long thinking_t=0,
+        double cost=0.0,
+        long long cache_read_t=0,
+        long long cache_write_t=0,
+    ):
+        self.input_tokens += input_t
+        self.output_tokens += output_t
+        self.thinking_tokens += thinking_t
+        self.cache_read_tokens += cache_read_t
+        self.cache_write_tokens += cache_write_t
+        self.cost_usd += cost
+        self.requests += 1
+
+    cpdef merge(self, UsageStats other):
+        """Fold another accumulator into this one."""
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.thinking_tokens += other.thinking_tokens
+        self.cache_read_tokens += other.cache_read_tokens
+        self.cache_write_tokens += other.cache_write_tokens
+        self.cost_usd += other.cost_usd
+        self.requests += other.requests
+
+    def __repr__(self):
+        return (
+            f"UsageStats(input_tokens={self.input_tokens}, "
+            f"output_tokens={self.output_tokens}, "
+            f"thinking_tokens={self.thinking_tokens}, "
+            f"cache_read_tokens={self.cache_read_tokens}, "
+            f"cache_write_tokens={self.cache_write_tokens}, "
+            f"cost_usd={self.cost_usd}, requests={self.requests})"
+        )
@@ -0,0 +1,136 @@
+"""
+Provider Batch APIs
+===================
+
+Request/response helpers for the OpenAI and Anthropic Batch APIs,
+which process large offline jobs asynchronously (24h window) at
+half the online price.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any
+
+
+# Batch API pricing relative to the online rate
+BATCH_DISCOUNT = 0.5
+
+OPENAI_BATCH_ENDPOINT = "/v1/chat/completions"
+
+# Provider statuses after which a batch will not change anymore
+TERMINAL_STATUSES = frozenset({
+    "completed", "failed", "expired", "cancelled",  # OpenAI
+    "ended",  # Anthropic
+})
+
+
+@dataclass
+class BatchJob:
+    """A submitted provider batch."""
+    provider: str
+    model: str
+    batch_id: str
+    input_file_id: Optional[str] = None
+    status: str = "submitted"
+    result_file_id: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the provider has finished processing the batch."""
+        return self.status in TERMINAL_STATUSES
+
+
+def _custom_id(request: Dict[str, Any], index: int) -> str:
+    return str(request.get("custom_id", f"request-{index}"))
+
+
+def build_openai_batch(
+    requests: List[Dict[str, Any]],
+    model_name: str,
+    default_max_tokens: int,
+) -> bytes:
+    """Serialize requests to the OpenAI batch JSONL input format."""
+    lines = []
+    for i, request in enumerate(requests):
+        messages = []
+        if request.get("system"):
+            messages.append({"role": "system", "content": request["system"]})
+        messages.append({"role": "user", "content": request["prompt"]})
+
+        lines.append(json.dumps({
+            "custom_id": _custom_id(request, i),
+            "method": "POST",
+            "url": OPENAI_BATCH_ENDPOINT,
+            "body": {
+                "model": model_name,
+                "max_tokens": request.get("max_tokens") or default_max_tokens,
+                "temperature": request.get("temperature", 0.7),
+                "messages": messages,
+            },
+        }, ensure_ascii=False))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def build_anthropic_batch(
+    requests: List[Dict[str, Any]],
+    model_name: str,
+    default_max_tokens: int,
+) -> List[Dict[str, Any]]:
+    """Build the `requests` payload for Anthropic message batches."""
+    batch = []
+    for i, request in enumerate(requests):
+        params = {
+            "model": model_name,
+            "max_tokens": request.get("max_tokens") or default_max_tokens,
+            "temperature": request.get("temperature", 0.7),
+            "messages": [{"role": "user", "content": request["prompt"]}],
+        }
+        if request.get("system"):
+            params["system"] = request["system"]
+        batch.append({"custom_id": _custom_id(request, i), "params": params})
+    return batch
+
+
+def parse_openai_results(jsonl: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse an OpenAI batch output file.
+
+    Returns:
+        custom_id -> {'content', 'input_tokens', 'output_tokens'} or {'error'}
+    """
+    results = {}
+    for line in jsonl.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        custom_id = record["custom_id"]
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code") != 200:
+            results[custom_id] = {
+                "error": record.get("error") or response.get("body"),
+            }
+            continue
+        body = response["body"]
+        results[custom_id] = {
+            "content": body["choices"][0]["message"]["content"],
+            "input_tokens": body["usage"]["prompt_tokens"],
+            "output_tokens": body["usage"]["completion_tokens"],
+        }
+    return results
+
+
+def parse_anthropic_result(entry: Any) -> Dict[str, Any]:
+    """Parse one Anthropic batch result entry."""
+    result = entry.result
+    if result.type != "succeeded":
+        return {"error": getattr(result, "error", None) or result.type}
+    message = result.message
+    content = "".join(
+        block.text for block in message.content
+        if getattr(block, "type", None) == "text"
+    )
+    return {
+        "content": content,
+        "input_tokens": message.usage.input_tokens,
+        "output_tokens": message.usage.output_tokens,
+    }
@@ -0,0 +1,294 @@
+"""
+LLM Response Cache
+==================
+
+Response caching for deterministic LLM calls.
+
+Only calls made with ``temperature == 0`` are cached, since sampled
+outputs are not reproducible. Storage is delegated to a pluggable
+backend (in-memory LRU, Redis, or local files) with optional TTL.
+Backends store opaque bytes; LLMCache handles (de)serialization and
+compression.
+"""
+
+import json
+import time
+import struct
+import asyncio
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Any, Tuple, Protocol
+
+import xxhash
+from loguru import logger
+
+# Lazy imports for optional dependencies
+redis_asyncio = None
+zstandard = None
+
+
+def get_redis():
+    global redis_asyncio
+    if redis_asyncio is None:
+        import redis.asyncio as _redis_asyncio
+        redis_asyncio = _redis_asyncio
+    return redis_asyncio
+
+
+def get_zstd():
+    global zstandard
+    if zstandard is None:
+        import zstandard as _zstandard
+        zstandard = _zstandard
+    return zstandard
+
+
+# Serialized entry tags
+_RAW = b"J"
+_ZSTD = b"Z"
+
+
+class CacheBackend(Protocol):
+    """Storage interface for serialized cache entries."""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        ...
+
+    async def delete(self, key: str) -> None:
+        ...
+
+    async def clear(self) -> None:
+        ...
+
+
+class InMemoryLRU:
+    """In-process LRU backend with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[Optional[float], bytes]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+
+class RedisBackend:
+    """Redis backend, shared across processes."""
+
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "llm:"):
+        self.prefix = prefix
+        self._redis = get_redis().from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        await self._redis.set(self.prefix + key, value, ex=int(ttl) if ttl else None)
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(self.prefix + key)
+
+    async def clear(self) -> None:
+        async for key in self._redis.scan_iter(match=self.prefix + "*"):
+            await self._redis.delete(key)
+
+
+class FileBackend:
+    """One file per entry under a cache directory."""
+
+    # Entry header: expiry as a unix timestamp (0 = never)
+    _HEADER = struct.Struct("<d")
+
+    def __init__(self, cache_dir: Path = Path("data/llm_cache")):
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.cache"
+
+    def _read(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        if len(data) < self._HEADER.size:
+            return None
+        (expires_at,) = self._HEADER.unpack_from(data)
+        if expires_at and expires_at < time.time():
+            path.unlink(missing_ok=True)
+            return None
+        return data[self._HEADER.size:]
+
+    def _write(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        header = self._HEADER.pack(time.time() + ttl if ttl else 0.0)
+        self._path(key).write_bytes(header + value)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        await asyncio.to_thread(self._write, key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    async def clear(self) -> None:
+        for path in self.cache_dir.glob("*.cache"):
+            path.unlink(missing_ok=True)
+
+
+class LLMCache:
+    """
+    Cache for deterministic LLM responses.
+
+    Keys are derived from (model, system, prompt, max_tokens) and are
+    only produced for temperature == 0 calls.
+
+    Writes are queued and flushed to the backend by a background task,
+    so a slow backend does not delay generate(). Entries are stored as
+    zstd-compressed JSON when ``zstandard`` is installed.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl: Optional[float] = None,
+        compress: bool = True,
+        compression_level: int = 3,
+        max_pending_writes: int = 1024,
+    ):
+        self.backend = backend or InMemoryLRU()
+        self.ttl = ttl
+        self.stats = {"hits": 0, "misses": 0, "dropped_writes": 0}
+
+        self._compressor = None
+        self._decompressor = None
+        if compress:
+            try:
+                zstd = get_zstd()
+                self._compressor = zstd.ZstdCompressor(level=compression_level)
+                self._decompressor = zstd.ZstdDecompressor()
+            except ImportError:
+                logger.warning("zstandard not installed; cache entries stored uncompressed")
+
+        self.max_pending_writes = max_pending_writes
+        self._pending: "OrderedDict[str, bytes]" = OrderedDict()
+        self._write_q: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def cache_key(
+        model: str,
+        system: Optional[str],
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+    ) -> Optional[str]:
+        """Return the cache key for a call, or None if it is not cacheable."""
+        if temperature > 0:
+            return None
+        # Hash fields incrementally (NUL-separated) rather than building
+        # one large serialized buffer; collisions only cost a cache miss
+        h = xxhash.xxh3_128()
+        for part in (model, "" if system is None else "\x01" + system, str(max_tokens)):
+            h.update(part.encode())
+            h.update(b"\x00")
+        h.update(prompt.encode())
+        return h.hexdigest()
+
+    def _encode(self, value: Dict[str, Any]) -> bytes:
+        raw = json.dumps(value, ensure_ascii=False, default=str).encode()
+        if self._compressor is not None:
+            return _ZSTD + self._compressor.compress(raw)
+        return _RAW + raw
+
+    def _decode(self, blob: bytes) -> Dict[str, Any]:
+        tag, body = blob[:1], blob[1:]
+        if tag == _ZSTD:
+            decompressor = self._decompressor or get_zstd().ZstdDecompressor()
+            body = decompressor.decompress(body)
+        return json.loads(body)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response and record hit/miss."""
+        blob = self._pending.get(key)
+        if blob is None:
+            blob = await self.backend.get(key)
+        if blob is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return self._decode(blob)
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Queue a response for storage; returns without waiting for the backend."""
+        if self._write_q is None:
+            self._write_q = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self._writer())
+
+        # Bounded backlog: drop the oldest unwritten entry
+        if len(self._pending) >= self.max_pending_writes:
+            self._pending.popitem(last=False)
+            self.stats["dropped_writes"] += 1
+
+        self._pending[key] = self._encode(value)
+        self._pending.move_to_end(key)
+        self._write_q.put_nowait(key)
+
+    async def _writer(self) -> None:
+        """Persist queued entries to the backend."""
+        while True:
+            key = await self._write_q.get()
+            try:
+                blob = self._pending.get(key)
+                if blob is not None:
+                    await self.backend.set(key, blob, self.ttl)
+                    if self._pending.get(key) is blob:
+                        del self._pending[key]
+            except Exception as e:
+                logger.warning(f"Cache write failed for {key}: {e}")
+            finally:
+                self._write_q.task_done()
+
+    async def flush(self) -> None:
+        """Wait until all queued writes have reached the backend."""
+        if self._write_q is not None:
+            await self._write_q.join()
+
+    async def clear(self) -> None:
+        """Drop all cached responses."""
+        self._pending.clear()
+        await self.backend.clear()
+
+    async def aclose(self) -> None:
+        """Flush queued writes and stop the writer task."""
+        await self.flush()
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            self._writer_task = None
+            self._write_q = None
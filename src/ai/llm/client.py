@@ -4,21 +4,46 @@ Multi-Model LLM Client
 
 Unified client for multiple LLM providers (Anthropic, OpenAI, Google, DeepSeek).
 Supports automatic model routing, cost tracking, and extended thinking.
+
+Importing ``src.ai.llm`` switches asyncio to a faster event loop when
+one is installed (``pip install connectome-fellows[fastloop]``):
+uringcore on Linux kernels >= 5.11, otherwise uvloop.
 """
 
 import os
+import time
 import asyncio
+import threading
+import functools
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Literal
+from typing import Dict, List, Optional, Any, Literal, Union, Callable, Tuple, AsyncIterator
 from enum import Enum
+import xxhash
 from loguru import logger
 
+from .cache import LLMCache
+from .semantic_cache import SemanticCache
+from .limits import TokenBucket, CircuitBreaker, CircuitOpenError, is_retryable, backoff_delay
+from .model_router import ModelRouter
+from .batch import (
+    BatchJob,
+    BATCH_DISCOUNT,
+    OPENAI_BATCH_ENDPOINT,
+    build_openai_batch,
+    build_anthropic_batch,
+    parse_openai_results,
+    parse_anthropic_result,
+)
+
 # Lazy imports for API clients
 anthropic = None
 openai = None
 google_genai = None
+httpx = None
 
 
 def get_anthropic():
@@ -45,6 +70,14 @@ def get_google():
     return google_genai
 
 
+def get_httpx():
+    global httpx
+    if httpx is None:
+        import httpx as _httpx
+        httpx = _httpx
+    return httpx
+
+
 class Provider(str, Enum):
     """LLM provider enum."""
     ANTHROPIC = "anthropic"
@@ -53,7 +86,11 @@ class Provider(str, Enum):
     DEEPSEEK = "deepseek"
 
 
-@dataclass
+class BudgetExceededError(Exception):
+    """Raised when a call could push spend past the monthly budget."""
+
+
+@dataclass(slots=True)
 class ModelConfig:
     """Configuration for a specific model."""
     name: str
@@ -63,23 +100,98 @@ class ModelConfig:
     cost_per_1k_output: float = 0.03
     supports_thinking: bool = False
     default_thinking_budget: int = 8000
+    context_window: int = 128000
+    # Per-token prices, derived from the per-1k prices
+    _cit: float = field(init=False, repr=False)
+    _cot: float = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        self._cit = self.cost_per_1k_input / 1000.0
+        self._cot = self.cost_per_1k_output / 1000.0
 
 
-@dataclass
+@dataclass(slots=True)
 class UsageStats:
     """Token usage statistics."""
     input_tokens: int = 0
     output_tokens: int = 0
     thinking_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
     cost_usd: float = 0.0
     requests: int = 0
     
-    def add(self, input_t: int, output_t: int, thinking_t: int = 0, cost: float = 0.0):
+    def add(
+        self,
+        input_t: int,
+        output_t: int,
+        thinking_t: int = 0,
+        cost: float = 0.0,
+        cache_read_t: int = 0,
+        cache_write_t: int = 0,
+    ):
         self.input_tokens += input_t
         self.output_tokens += output_t
         self.thinking_tokens += thinking_t
+        self.cache_read_tokens += cache_read_t
+        self.cache_write_tokens += cache_write_t
         self.cost_usd += cost
         self.requests += 1
+    
+    def merge(self, other: "UsageStats") -> None:
+        """Fold another accumulator into this one."""
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.thinking_tokens += other.thinking_tokens
+        self.cache_read_tokens += other.cache_read_tokens
+        self.cache_write_tokens += other.cache_write_tokens
+        self.cost_usd += other.cost_usd
+        self.requests += other.requests
+
+
+try:
+    # Compiled accumulator, if built (see setup.py)
+    from ._usage import UsageStats  # noqa: F811
+except ImportError:
+    pass
+
+
+# Task-local usage accumulators: (owning task, {client: UsageStats}).
+# Each task counts into its own UsageStats, which is merged into the
+# client total when the task finishes.
+_task_usage: ContextVar[Optional[Tuple[Any, Dict[Any, UsageStats]]]] = ContextVar(
+    "llm_task_usage", default=None
+)
+
+
+# Shared HTTP connection pool for all provider SDKs
+HTTP_POOL_LIMITS = {
+    "max_connections": 200,
+    "max_keepalive_connections": 100,
+    "keepalive_expiry": 30,
+}
+HTTP_TIMEOUT = {"connect": 5.0, "read": 600.0, "write": 30.0, "pool": 5.0}
+
+
+# Default per-provider rate limits: requests/min and tokens/min
+PROVIDER_RATE_LIMITS = {
+    Provider.ANTHROPIC: {"rpm": 50, "tpm": 80000},
+    Provider.OPENAI: {"rpm": 500, "tpm": 300000},
+    Provider.GOOGLE: {"rpm": 150, "tpm": 1000000},
+    Provider.DEEPSEEK: {"rpm": 60, "tpm": 200000},
+}
+
+# Consecutive transient failures before a provider is short-circuited
+CIRCUIT_FAIL_THRESHOLD = 5
+CIRCUIT_RESET_SECONDS = 30.0
+
+# Smoothing factor for per-provider latency averages
+LATENCY_EMA_ALPHA = 0.2
+
+
+# Anthropic prompt-cache pricing relative to the base input rate
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.10
 
 
 # Model configurations
@@ -93,6 +205,7 @@ MODELS = {
         cost_per_1k_output=0.075,
         supports_thinking=True,
         default_thinking_budget=12000,
+        context_window=200000,
     ),
     "claude-sonnet-4": ModelConfig(
         name="claude-sonnet-4-20250514",
@@ -101,6 +214,7 @@ MODELS = {
         cost_per_1k_input=0.003,
         cost_per_1k_output=0.015,
         supports_thinking=False,
+        context_window=200000,
     ),
     # OpenAI
     "gpt-5": ModelConfig(
@@ -110,6 +224,7 @@ MODELS = {
         cost_per_1k_input=0.01,
         cost_per_1k_output=0.03,
         supports_thinking=True,
+        context_window=400000,
     ),
     "gpt-4o": ModelConfig(
         name="gpt-4o",
@@ -127,6 +242,7 @@ MODELS = {
         cost_per_1k_output=0.005,
         supports_thinking=True,
         default_thinking_budget=20000,
+        context_window=1048576,
     ),
     # DeepSeek
     "deepseek-r1": ModelConfig(
@@ -136,10 +252,37 @@ MODELS = {
         cost_per_1k_input=0.00055,
         cost_per_1k_output=0.0022,
         supports_thinking=True,
+        context_window=64000,
     ),
 }
 
 
+# Gemini token counts keyed by (model name, text digest)
+_GEMINI_TOKEN_CACHE: "OrderedDict[Tuple[str, bytes], int]" = OrderedDict()
+_GEMINI_TOKEN_CACHE_SIZE = 4096
+
+
+async def _count_gemini_tokens(model: Any, model_name: str, text: str) -> int:
+    """Count tokens with the Gemini tokenizer, memoized per text."""
+    key = (model_name, xxhash.xxh3_128_digest(text.encode()))
+    count = _GEMINI_TOKEN_CACHE.get(key)
+    if count is not None:
+        _GEMINI_TOKEN_CACHE.move_to_end(key)
+        return count
+    
+    count = (await model.count_tokens_async(text)).total_tokens
+    _GEMINI_TOKEN_CACHE[key] = count
+    if len(_GEMINI_TOKEN_CACHE) > _GEMINI_TOKEN_CACHE_SIZE:
+        _GEMINI_TOKEN_CACHE.popitem(last=False)
+    return count
+
+
+@functools.lru_cache(maxsize=128)
+def _system_msg(text: str) -> Dict[str, str]:
+    """Shared chat system message per system prompt (treat as read-only)."""
+    return {"role": "system", "content": text}
+
+
 class MultiModelClient:
     """
     Unified client for multiple LLM providers.
@@ -148,70 +291,247 @@ class MultiModelClient:
     - Automatic provider detection
     - Cost tracking
     - Extended thinking support
-    - Fallback on errors
+    - Fallback to other providers on transient errors
+    - Exact and semantic response caching for deterministic (temperature=0) calls
+    - Budget and rate-limit admission control, per-provider circuit breakers
     """
     
     def __init__(
         self,
         default_model: str = "claude-sonnet-4",
         monthly_budget_usd: float = 500.0,
+        cache: Optional[LLMCache] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        rate_limits: Optional[Dict[Provider, Dict[str, float]]] = None,
+        router: Optional[ModelRouter] = None,
     ):
         self.default_model = default_model
         self.monthly_budget_usd = monthly_budget_usd
-        self.usage = UsageStats()
+        self._usage_total = UsageStats()
+        self._usage_pending: Dict[int, UsageStats] = {}
+        self._usage_lock = threading.Lock()
+        self.cache = cache
+        self.semantic_cache = semantic_cache
         self._clients: Dict[Provider, Any] = {}
+        self._http = None
+        
+        # Admission control: per-provider rate limits and circuit breakers
+        rate_limits = {**PROVIDER_RATE_LIMITS, **(rate_limits or {})}
+        self._rpm_buckets = {
+            p: TokenBucket.per_minute(limits["rpm"]) for p, limits in rate_limits.items()
+        }
+        self._tpm_buckets = {
+            p: TokenBucket.per_minute(limits["tpm"]) for p, limits in rate_limits.items()
+        }
+        self._breakers = {
+            p: CircuitBreaker(p.value, CIRCUIT_FAIL_THRESHOLD, CIRCUIT_RESET_SECONDS)
+            for p in Provider
+        }
+        
+        # Fallback routing; no tier-down to cheaper models unless asked for
+        self.router = router or ModelRouter(enable_cost_optimization=False)
+        self._latency: Dict[Provider, float] = {}
+        
+        # Deterministic calls in flight, by cache key
+        self._inflight: Dict[str, asyncio.Future] = {}
         
-        # Initialize clients lazily
+        # API keys only; SDK clients are created on first use
         self._init_clients()
+        
+        # Provider dispatch, resolved once per model key
+        self._dispatch: Dict[Provider, Callable] = {
+            Provider.ANTHROPIC: self._generate_anthropic,
+            Provider.OPENAI: self._generate_openai,
+            Provider.GOOGLE: self._generate_google,
+            Provider.DEEPSEEK: self._generate_deepseek,
+        }
+        self._routes: Dict[str, Tuple[ModelConfig, Callable]] = {
+            key: (cfg, self._dispatch[cfg.provider])
+            for key, cfg in MODELS.items()
+        }
+        self._stream_dispatch: Dict[Provider, Callable] = {
+            Provider.ANTHROPIC: self._stream_anthropic,
+            Provider.OPENAI: self._stream_openai,
+            Provider.GOOGLE: self._stream_google,
+            Provider.DEEPSEEK: self._stream_deepseek,
+        }
+    
+    @property
+    def usage(self) -> UsageStats:
+        """Usage snapshot, including counters of still-running tasks."""
+        snapshot = UsageStats()
+        with self._usage_lock:
+            snapshot.merge(self._usage_total)
+            for local in self._usage_pending.values():
+                snapshot.merge(local)
+        return snapshot
+    
+    def _local_usage(self) -> UsageStats:
+        """Usage accumulator owned by the current task."""
+        task = asyncio.current_task()
+        entry = _task_usage.get()
+        if entry is None or entry[0] is not task:
+            # Child tasks inherit the parent's context; give them their own
+            entry = (task, {})
+            _task_usage.set(entry)
+        
+        local = entry[1].get(self)
+        if local is None:
+            local = UsageStats()
+            entry[1][self] = local
+            with self._usage_lock:
+                self._usage_pending[id(local)] = local
+            if task is not None:
+                task.add_done_callback(lambda _: self._flush_usage(local))
+        return local
+    
+    def _flush_usage(self, local: UsageStats) -> None:
+        """Merge a finished task's accumulator into the client total."""
+        with self._usage_lock:
+            if self._usage_pending.pop(id(local), None) is not None:
+                self._usage_total.merge(local)
+    
+    def _get_http_client(self) -> Any:
+        """Shared keep-alive HTTP/2 connection pool for provider SDKs."""
+        if self._http is None:
+            _httpx = get_httpx()
+            self._http = _httpx.AsyncClient(
+                http2=True,
+                limits=_httpx.Limits(**HTTP_POOL_LIMITS),
+                timeout=_httpx.Timeout(**HTTP_TIMEOUT),
+            )
+        return self._http
     
     def _init_clients(self) -> None:
-        """Initialize API clients from environment variables."""
-        # Anthropic
-        if os.getenv("ANTHROPIC_API_KEY"):
-            try:
-                client = get_anthropic().Anthropic()
-                self._clients[Provider.ANTHROPIC] = client
-                logger.info("Anthropic client initialized")
-            except Exception as e:
-                logger.warning(f"Failed to init Anthropic: {e}")
+        """Read API keys from the environment; clients are built on first use."""
+        self._api_keys: Dict[Provider, Optional[str]] = {
+            Provider.ANTHROPIC: os.getenv("ANTHROPIC_API_KEY"),
+            Provider.OPENAI: os.getenv("OPENAI_API_KEY"),
+            Provider.GOOGLE: os.getenv("GOOGLE_API_KEY"),
+            Provider.DEEPSEEK: os.getenv("DEEPSEEK_API_KEY"),
+        }
+        self._init_locks = {provider: asyncio.Lock() for provider in Provider}
+    
+    def _is_configured(self, provider: Provider) -> bool:
+        return bool(self._api_keys.get(provider))
+    
+    def _build_client(self, provider: Provider) -> Any:
+        """Construct the SDK client for a provider."""
+        api_key = self._api_keys[provider]
         
-        # OpenAI
-        if os.getenv("OPENAI_API_KEY"):
-            try:
-                client = get_openai().OpenAI()
-                self._clients[Provider.OPENAI] = client
-                logger.info("OpenAI client initialized")
-            except Exception as e:
-                logger.warning(f"Failed to init OpenAI: {e}")
+        if provider == Provider.ANTHROPIC:
+            return get_anthropic().AsyncAnthropic(
+                api_key=api_key,
+                http_client=self._get_http_client(),
+            )
         
-        # Google
-        if os.getenv("GOOGLE_API_KEY"):
-            try:
-                genai = get_google()
-                genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-                self._clients[Provider.GOOGLE] = genai
-                logger.info("Google client initialized")
-            except Exception as e:
-                logger.warning(f"Failed to init Google: {e}")
+        if provider == Provider.OPENAI:
+            return get_openai().AsyncOpenAI(
+                api_key=api_key,
+                http_client=self._get_http_client(),
+            )
+        
+        if provider == Provider.GOOGLE:
+            genai = get_google()
+            genai.configure(api_key=api_key)
+            return genai
         
         # DeepSeek (uses OpenAI-compatible API)
-        if os.getenv("DEEPSEEK_API_KEY"):
-            try:
-                client = get_openai().OpenAI(
-                    api_key=os.getenv("DEEPSEEK_API_KEY"),
-                    base_url="https://api.deepseek.com/v1"
-                )
-                self._clients[Provider.DEEPSEEK] = client
-                logger.info("DeepSeek client initialized")
-            except Exception as e:
-                logger.warning(f"Failed to init DeepSeek: {e}")
+        return get_openai().AsyncOpenAI(
+            api_key=api_key,
+            base_url="https://api.deepseek.com/v1",
+            http_client=self._get_http_client(),
+        )
     
-    def _get_client(self, provider: Provider) -> Any:
-        """Get client for a provider."""
-        if provider not in self._clients:
+    async def _get_client(self, provider: Provider) -> Any:
+        """Get client for a provider, initializing it on first use."""
+        client = self._clients.get(provider)
+        if client is not None:
+            return client
+        
+        if not self._is_configured(provider):
             raise ValueError(f"Provider {provider} not configured")
+        
+        async with self._init_locks[provider]:
+            if provider not in self._clients:
+                self._clients[provider] = self._build_client(provider)
+                logger.info(f"{provider.value} client initialized")
         return self._clients[provider]
     
+    @staticmethod
+    def _estimate_tokens(prompt: str, system: Optional[str], max_tokens: int) -> int:
+        """Worst-case tokens for a call (~4 chars per prompt token)."""
+        return (len(prompt) + len(system or "")) // 4 + max_tokens
+    
+    async def _admit(
+        self,
+        config: ModelConfig,
+        prompt: str,
+        system: Optional[str],
+        max_tokens: int,
+    ) -> None:
+        """
+        Admit a call before dispatch.
+        
+        Rejects calls whose worst-case cost could exceed the budget or
+        whose provider circuit is open, then waits for rate-limit tokens.
+        """
+        est_tokens = self._estimate_tokens(prompt, system, max_tokens)
+        est_cost = est_tokens * max(config._cit, config._cot)
+        spent = self.usage.cost_usd
+        if spent + est_cost > self.monthly_budget_usd:
+            raise BudgetExceededError(
+                f"Call to {config.name} (up to ${est_cost:.4f}) would exceed the "
+                f"monthly budget (${spent:.2f} of ${self.monthly_budget_usd:.2f} spent)"
+            )
+        
+        self._breakers[config.provider].check()
+        await self._rpm_buckets[config.provider].acquire()
+        await self._tpm_buckets[config.provider].acquire(est_tokens)
+    
+    def _record_outcome(self, provider: Provider, error: Optional[BaseException]) -> None:
+        """Feed a call outcome to the provider's circuit breaker."""
+        breaker = self._breakers[provider]
+        if error is None:
+            breaker.record_success()
+        elif is_retryable(error):
+            breaker.record_failure()
+    
+    def _record_latency(self, provider: Provider, seconds: float) -> None:
+        previous = self._latency.get(provider)
+        self._latency[provider] = seconds if previous is None else (
+            LATENCY_EMA_ALPHA * seconds + (1 - LATENCY_EMA_ALPHA) * previous
+        )
+    
+    def _fallback_chain(
+        self,
+        model_key: str,
+        prompt: str,
+        system: Optional[str],
+        max_tokens: int,
+    ) -> List[str]:
+        """Models to try for a call, from the router."""
+        spent = self.usage.cost_usd
+        est_costs = {}
+        unavailable = set()
+        latency = {}
+        for key, cfg in MODELS.items():
+            tokens = self._estimate_tokens(prompt, system, min(max_tokens, cfg.max_tokens))
+            est_costs[key] = tokens * max(cfg._cit, cfg._cot)
+            if not self._is_configured(cfg.provider) or self._breakers[cfg.provider].state == "open":
+                unavailable.add(key)
+            if cfg.provider in self._latency:
+                latency[key] = self._latency[cfg.provider]
+        
+        return self.router.fallback_chain(
+            prompt,
+            model_key,
+            est_costs=est_costs,
+            budget_remaining=self.monthly_budget_usd - spent,
+            unavailable=unavailable,
+            latency=latency,
+        )
+    
     async def generate(
         self,
         prompt: str,
@@ -238,38 +558,366 @@ class MultiModelClient:
             Dict with 'content', 'thinking', 'usage', 'model'
         """
         model_key = model or self.default_model
+        route = self._routes.get(model_key)
+        
+        if route is None:
+            raise ValueError(f"Unknown model: {model_key}")
+        
+        config = route[0]
+        max_tokens = max_tokens or config.max_tokens
+        
+        # Deterministic calls are keyed for in-flight coalescing, and for
+        # the response cache when one is configured
+        cache_key = None
+        if not enable_thinking:
+            cache_key = LLMCache.cache_key(
+                model_key, system, prompt, max_tokens, temperature
+            )
+        if cache_key is not None and self.cache is not None:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return {**cached, "cached": True}
+        
+        # Serve paraphrased prompts from the semantic cache; sampled calls
+        # are skipped since a reused response would defeat the sampling
+        prompt_vec = None
+        namespace = (model_key, system, max_tokens, temperature)
+        if self.semantic_cache is not None and not enable_thinking and temperature <= 0:
+            prompt_vec = await self.semantic_cache.embed(prompt)
+            similar = self.semantic_cache.search(namespace, prompt_vec)
+            if similar is not None:
+                return {**similar, "cached": True}
+        
+        # Coalesce identical deterministic calls already in flight
+        pending = None
+        if cache_key is not None:
+            leader = self._inflight.get(cache_key)
+            if leader is not None:
+                try:
+                    return {**await asyncio.shield(leader), "cached": True}
+                except asyncio.CancelledError:
+                    # Only the leading call was cancelled; run this one
+                    if not leader.cancelled():
+                        raise
+            if cache_key not in self._inflight:
+                pending = asyncio.get_running_loop().create_future()
+                self._inflight[cache_key] = pending
+        
+        try:
+            result = await self._generate_with_fallback(
+                model_key, prompt, system, max_tokens, temperature,
+                enable_thinking, thinking_budget
+            )
+        except BaseException as e:
+            if pending is not None:
+                if isinstance(e, asyncio.CancelledError):
+                    pending.cancel()
+                else:
+                    pending.set_exception(e)
+                    pending.exception()  # retrieved by followers, if any
+            raise
+        else:
+            if pending is not None:
+                pending.set_result(result)
+            # Cache before leaving the in-flight table so later callers hit one of them
+            if cache_key is not None and self.cache is not None:
+                await self.cache.set(cache_key, result)
+        finally:
+            if pending is not None:
+                del self._inflight[cache_key]
+        
+        if prompt_vec is not None:
+            self.semantic_cache.add(namespace, prompt_vec, result)
+        
+        return result
+    
+    async def _generate_with_fallback(
+        self,
+        model_key: str,
+        prompt: str,
+        system: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        enable_thinking: bool,
+        thinking_budget: Optional[int],
+    ) -> Dict[str, Any]:
+        """Dispatch a call along the fallback chain."""
+        # Try the requested model, then fall back on transient errors
+        last_error: Optional[Exception] = None
+        for candidate in self._fallback_chain(model_key, prompt, system, max_tokens):
+            config, dispatch = self._routes[candidate]
+            call_max_tokens = (
+                max_tokens if candidate == model_key
+                else min(max_tokens, config.max_tokens)
+            )
+            try:
+                await self._admit(config, prompt, system, call_max_tokens)
+            except CircuitOpenError as e:
+                last_error = e
+                continue
+            
+            start = time.monotonic()
+            try:
+                result = await dispatch(
+                    prompt, config, system, call_max_tokens, temperature,
+                    enable_thinking, thinking_budget
+                )
+            except Exception as e:
+                self._record_outcome(config.provider, e)
+                if not is_retryable(e):
+                    raise
+                last_error = e
+                logger.warning(f"{candidate} failed, trying next model: {e}")
+                continue
+            
+            self._record_outcome(config.provider, None)
+            self._record_latency(config.provider, time.monotonic() - start)
+            break
+        else:
+            raise last_error
+        
+        return result
+    
+    async def generate_stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.7,
+        enable_thinking: bool = False,
+        thinking_budget: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response as text deltas while it is being generated.
+        
+        Takes the same arguments as generate(). Usage and cost are
+        booked once the stream completes. Thinking content is not
+        streamed and responses are not cached.
+        
+        Example:
+            async for delta in client.generate_stream("Summarize ..."):
+                print(delta, end="", flush=True)
+        """
+        model_key = model or self.default_model
         config = MODELS.get(model_key)
         
         if not config:
             raise ValueError(f"Unknown model: {model_key}")
         
-        provider = config.provider
         max_tokens = max_tokens or config.max_tokens
+        await self._admit(config, prompt, system, max_tokens)
         
-        # Route to appropriate provider
-        if provider == Provider.ANTHROPIC:
-            return await self._generate_anthropic(
-                prompt, config, system, max_tokens, temperature,
-                enable_thinking, thinking_budget
+        stream = self._stream_dispatch[config.provider]
+        try:
+            async for delta in stream(
+                prompt, config, system, max_tokens,
+                temperature, enable_thinking, thinking_budget
+            ):
+                yield delta
+        except Exception as e:
+            self._record_outcome(config.provider, e)
+            raise
+        self._record_outcome(config.provider, None)
+    
+    async def generate_many(
+        self,
+        requests: List[Union[str, Dict[str, Any]]],
+        *,
+        max_concurrency: int = 10,
+        rate_limit_rpm: Optional[int] = None,
+        max_retries: int = 3,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Generate responses for many prompts concurrently.
+        
+        Args:
+            requests: Prompts, or dicts of `generate()` keyword arguments
+            max_concurrency: Max in-flight requests
+            rate_limit_rpm: Optional cap on requests per minute
+            max_retries: Retries for rate-limit/overload errors
+            on_progress: Called as on_progress(done, total) after each item
+            
+        Returns:
+            Results in input order; failed items hold the raised exception
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        limiter = TokenBucket.per_minute(rate_limit_rpm) if rate_limit_rpm else None
+        
+        async def run_one(index: int, request: Union[str, Dict[str, Any]]):
+            kwargs = request if isinstance(request, dict) else {"prompt": request}
+            async with semaphore:
+                for attempt in range(max_retries + 1):
+                    if limiter is not None:
+                        await limiter.acquire()
+                    try:
+                        return index, await self.generate(**kwargs)
+                    except Exception as e:
+                        if attempt == max_retries or not is_retryable(e):
+                            return index, e
+                        delay = backoff_delay(attempt)
+                        logger.warning(
+                            f"Retrying request {index} in {delay:.1f}s "
+                            f"(attempt {attempt + 1}/{max_retries}): {e}"
+                        )
+                        await asyncio.sleep(delay)
+        
+        total = len(requests)
+        results: List[Union[Dict[str, Any], Exception]] = [None] * total
+        tasks = [run_one(i, r) for i, r in enumerate(requests)]
+        for done, next_result in enumerate(asyncio.as_completed(tasks), start=1):
+            index, result = await next_result
+            results[index] = result
+            if on_progress is not None:
+                on_progress(done, total)
+        
+        return results
+    
+    async def submit_batch(
+        self,
+        requests: List[Dict[str, Any]],
+        model: Optional[str] = None,
+    ) -> BatchJob:
+        """
+        Submit requests to the provider Batch API (50% cost, 24h window).
+        
+        Args:
+            requests: Dicts with 'prompt' and optional 'system',
+                'max_tokens', 'temperature', 'custom_id'
+            model: Model key (OpenAI or Anthropic models only)
+            
+        Returns:
+            BatchJob handle for poll_batch/fetch_batch_results
+        """
+        model_key = model or self.default_model
+        config = MODELS.get(model_key)
+        if not config:
+            raise ValueError(f"Unknown model: {model_key}")
+        
+        if config.provider == Provider.OPENAI:
+            client = await self._get_client(Provider.OPENAI)
+            jsonl = build_openai_batch(requests, config.name, config.max_tokens)
+            input_file = await client.files.create(
+                file=("batch.jsonl", jsonl),
+                purpose="batch",
             )
-        elif provider == Provider.OPENAI:
-            return await self._generate_openai(
-                prompt, config, system, max_tokens, temperature,
-                enable_thinking
+            batch = await client.batches.create(
+                input_file_id=input_file.id,
+                endpoint=OPENAI_BATCH_ENDPOINT,
+                completion_window="24h",
             )
-        elif provider == Provider.GOOGLE:
-            return await self._generate_google(
-                prompt, config, system, max_tokens, temperature,
-                enable_thinking, thinking_budget
+            job = BatchJob(
+                provider=config.provider.value,
+                model=model_key,
+                batch_id=batch.id,
+                input_file_id=input_file.id,
+                status=batch.status,
+            )
+        elif config.provider == Provider.ANTHROPIC:
+            client = await self._get_client(Provider.ANTHROPIC)
+            batch = await client.messages.batches.create(
+                requests=build_anthropic_batch(requests, config.name, config.max_tokens),
             )
-        elif provider == Provider.DEEPSEEK:
-            return await self._generate_deepseek(
-                prompt, config, system, max_tokens, temperature
+            job = BatchJob(
+                provider=config.provider.value,
+                model=model_key,
+                batch_id=batch.id,
+                status=batch.processing_status,
             )
         else:
-            raise ValueError(f"Unsupported provider: {provider}")
+            raise ValueError(f"Batch API not supported for provider: {config.provider}")
+        
+        logger.info(f"Batch submitted: {job.batch_id} ({len(requests)} requests)")
+        return job
     
-    async def _generate_anthropic(
+    async def poll_batch(self, job: BatchJob) -> BatchJob:
+        """Refresh the status of a submitted batch."""
+        if job.provider == Provider.OPENAI:
+            client = await self._get_client(Provider.OPENAI)
+            batch = await client.batches.retrieve(job.batch_id)
+            job.status = batch.status
+            job.result_file_id = batch.output_file_id
+        else:
+            client = await self._get_client(Provider.ANTHROPIC)
+            batch = await client.messages.batches.retrieve(job.batch_id)
+            job.status = batch.processing_status
+        return job
+    
+    async def fetch_batch_results(self, job: BatchJob) -> Dict[str, Dict[str, Any]]:
+        """
+        Download results of a finished batch.
+        
+        Returns:
+            Dict mapping custom_id to a result with 'content', 'usage',
+            'model' (as from generate), or 'error' for failed requests
+        """
+        config = MODELS[job.model]
+        
+        if job.provider == Provider.OPENAI:
+            if not job.result_file_id:
+                raise ValueError(f"Batch {job.batch_id} has no results yet (status={job.status})")
+            client = await self._get_client(Provider.OPENAI)
+            content = await client.files.content(job.result_file_id)
+            parsed = parse_openai_results(content.text)
+        else:
+            client = await self._get_client(Provider.ANTHROPIC)
+            entries = [
+                entry async for entry in await client.messages.batches.results(job.batch_id)
+            ]
+            parsed = {e.custom_id: parse_anthropic_result(e) for e in entries}
+        
+        results = {}
+        for custom_id, item in parsed.items():
+            if "error" in item:
+                results[custom_id] = item
+                continue
+            input_t = item["input_tokens"]
+            output_t = item["output_tokens"]
+            cost = BATCH_DISCOUNT * (input_t * config._cit + output_t * config._cot)
+            self._local_usage().add(input_t, output_t, 0, cost)
+            results[custom_id] = {
+                "content": item["content"],
+                "thinking": "",
+                "usage": {
+                    "input_tokens": input_t,
+                    "output_tokens": output_t,
+                    "cost_usd": cost,
+                },
+                "model": config.name,
+            }
+        
+        return results
+    
+    def rate_cache_hit(self, request_id: str, good: bool) -> None:
+        """
+        Rate a response served by the semantic cache.
+        
+        Args:
+            request_id: The 'cache_hit_id' of the served response
+            good: Whether the cached response was acceptable
+        """
+        if self.semantic_cache is None:
+            raise ValueError("Semantic cache not configured")
+        self.semantic_cache.record_feedback(request_id, good)
+    
+    def _record_usage(
+        self,
+        config: ModelConfig,
+        input_t: int,
+        output_t: int,
+        thinking_t: int = 0,
+    ) -> Dict[str, Any]:
+        """Book one call's usage and return its per-call usage dict."""
+        cost = input_t * config._cit + output_t * config._cot
+        self._local_usage().add(input_t, output_t, thinking_t, cost)
+        return {
+            "input_tokens": input_t,
+            "output_tokens": output_t,
+            "cost_usd": cost,
+        }
+    
+    def _anthropic_kwargs(
         self,
         prompt: str,
         config: ModelConfig,
@@ -279,19 +927,22 @@ class MultiModelClient:
         enable_thinking: bool,
         thinking_budget: Optional[int],
     ) -> Dict[str, Any]:
-        """Generate using Anthropic API."""
-        client = self._get_client(Provider.ANTHROPIC)
-        
-        messages = [{"role": "user", "content": prompt}]
-        
+        """Build Anthropic Messages API arguments."""
         kwargs = {
             "model": config.name,
             "max_tokens": max_tokens,
-            "messages": messages,
+            "messages": [{"role": "user", "content": prompt}],
         }
         
+        # Only the system prompt is a cache breakpoint: it repeats across
+        # calls, while a single-turn prompt would be written to the cache
+        # (at a premium) and never read back
         if system:
-            kwargs["system"] = system
+            kwargs["system"] = [{
+                "type": "text",
+                "text": system,
+                "cache_control": {"type": "ephemeral"},
+            }]
         
         # Extended thinking
         if enable_thinking and config.supports_thinking:
@@ -305,11 +956,55 @@ class MultiModelClient:
         else:
             kwargs["temperature"] = temperature
         
-        # Make request
-        response = await asyncio.to_thread(
-            client.messages.create, **kwargs
+        return kwargs
+    
+    def _record_anthropic_usage(self, config: ModelConfig, usage: Any) -> Dict[str, Any]:
+        """Book Anthropic usage, including prompt-cache reads and writes."""
+        input_t = usage.input_tokens
+        output_t = usage.output_tokens
+        thinking_t = getattr(usage, 'thinking_tokens', 0) or 0
+        cache_write_t = getattr(usage, 'cache_creation_input_tokens', 0) or 0
+        cache_read_t = getattr(usage, 'cache_read_input_tokens', 0) or 0
+        
+        # input_tokens only counts the uncached part of the prompt
+        cost = (
+            (input_t +
+             cache_write_t * CACHE_WRITE_MULTIPLIER +
+             cache_read_t * CACHE_READ_MULTIPLIER) * config._cit +
+            output_t * config._cot
+        )
+        self._local_usage().add(
+            input_t, output_t, thinking_t, cost,
+            cache_read_t=cache_read_t, cache_write_t=cache_write_t,
         )
         
+        return {
+            "input_tokens": input_t,
+            "output_tokens": output_t,
+            "thinking_tokens": thinking_t,
+            "cache_read_tokens": cache_read_t,
+            "cache_write_tokens": cache_write_t,
+            "cost_usd": cost,
+        }
+    
+    async def _generate_anthropic(
+        self,
+        prompt: str,
+        config: ModelConfig,
+        system: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        enable_thinking: bool,
+        thinking_budget: Optional[int],
+    ) -> Dict[str, Any]:
+        """Generate using Anthropic API."""
+        client = await self._get_client(Provider.ANTHROPIC)
+        
+        response = await client.messages.create(**self._anthropic_kwargs(
+            prompt, config, system, max_tokens, temperature,
+            enable_thinking, thinking_budget
+        ))
+        
         # Parse response
         content = ""
         thinking = ""
@@ -321,31 +1016,14 @@ class MultiModelClient:
                 elif block.type == "text":
                     content = block.text
         
-        # Track usage
-        usage = response.usage
-        input_t = usage.input_tokens
-        output_t = usage.output_tokens
-        thinking_t = getattr(usage, 'thinking_tokens', 0) or 0
-        
-        cost = (
-            input_t * config.cost_per_1k_input / 1000 +
-            output_t * config.cost_per_1k_output / 1000
-        )
-        self.usage.add(input_t, output_t, thinking_t, cost)
-        
         return {
             "content": content,
             "thinking": thinking,
-            "usage": {
-                "input_tokens": input_t,
-                "output_tokens": output_t,
-                "thinking_tokens": thinking_t,
-                "cost_usd": cost,
-            },
+            "usage": self._record_anthropic_usage(config, response.usage),
             "model": config.name,
         }
     
-    async def _generate_openai(
+    async def _stream_anthropic(
         self,
         prompt: str,
         config: ModelConfig,
@@ -353,57 +1031,142 @@ class MultiModelClient:
         max_tokens: int,
         temperature: float,
         enable_thinking: bool,
-    ) -> Dict[str, Any]:
-        """Generate using OpenAI API."""
-        client = self._get_client(Provider.OPENAI)
+        thinking_budget: Optional[int],
+    ) -> AsyncIterator[str]:
+        """Stream text deltas from the Anthropic API."""
+        client = await self._get_client(Provider.ANTHROPIC)
+        kwargs = self._anthropic_kwargs(
+            prompt, config, system, max_tokens, temperature,
+            enable_thinking, thinking_budget
+        )
         
-        messages = []
-        if system:
-            messages.append({"role": "system", "content": system})
-        messages.append({"role": "user", "content": prompt})
+        async with client.messages.stream(**kwargs) as stream:
+            async for text in stream.text_stream:
+                yield text
+            message = await stream.get_final_message()
         
-        kwargs = {
+        self._record_anthropic_usage(config, message.usage)
+    
+    def _chat_kwargs(
+        self,
+        prompt: str,
+        config: ModelConfig,
+        system: Optional[str],
+        max_tokens: int,
+        temperature: float,
+    ) -> Dict[str, Any]:
+        """Build Chat Completions arguments (OpenAI and DeepSeek)."""
+        user_msg = {"role": "user", "content": prompt}
+        messages = [_system_msg(system), user_msg] if system else [user_msg]
+        
+        return {
             "model": config.name,
             "max_tokens": max_tokens,
             "temperature": temperature,
             "messages": messages,
         }
+    
+    def _openai_kwargs(
+        self,
+        prompt: str,
+        config: ModelConfig,
+        system: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        enable_thinking: bool,
+    ) -> Dict[str, Any]:
+        kwargs = self._chat_kwargs(prompt, config, system, max_tokens, temperature)
         
         # GPT-5 thinking mode
         if enable_thinking and config.supports_thinking:
             kwargs["reasoning_effort"] = "high"
         
-        response = await asyncio.to_thread(
-            client.chat.completions.create, **kwargs
+        return kwargs
+    
+    def _record_openai_usage(self, config: ModelConfig, usage: Any) -> Dict[str, Any]:
+        reasoning_t = getattr(usage, 'reasoning_tokens', 0) or 0
+        return {
+            **self._record_usage(
+                config, usage.prompt_tokens, usage.completion_tokens, reasoning_t
+            ),
+            "reasoning_tokens": reasoning_t,
+        }
+    
+    async def _stream_chat(
+        self,
+        provider: Provider,
+        kwargs: Dict[str, Any],
+    ) -> AsyncIterator[Any]:
+        """
+        Stream a Chat Completions call.
+        
+        Yields content deltas (str), then the final usage object once
+        the stream ends (sent because of include_usage).
+        """
+        client = await self._get_client(provider)
+        stream = await client.chat.completions.create(
+            **kwargs,
+            stream=True,
+            stream_options={"include_usage": True},
         )
         
-        content = response.choices[0].message.content
+        usage = None
+        async for chunk in stream:
+            if chunk.usage is not None:
+                usage = chunk.usage
+            if chunk.choices:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
         
-        # Track usage
-        usage = response.usage
-        input_t = usage.prompt_tokens
-        output_t = usage.completion_tokens
-        reasoning_t = getattr(usage, 'reasoning_tokens', 0) or 0
+        if usage is not None:
+            yield usage
+    
+    async def _generate_openai(
+        self,
+        prompt: str,
+        config: ModelConfig,
+        system: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        enable_thinking: bool,
+        thinking_budget: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Generate using OpenAI API."""
+        client = await self._get_client(Provider.OPENAI)
         
-        cost = (
-            input_t * config.cost_per_1k_input / 1000 +
-            output_t * config.cost_per_1k_output / 1000
-        )
-        self.usage.add(input_t, output_t, reasoning_t, cost)
+        response = await client.chat.completions.create(**self._openai_kwargs(
+            prompt, config, system, max_tokens, temperature, enable_thinking
+        ))
         
         return {
-            "content": content,
+            "content": response.choices[0].message.content,
             "thinking": "",  # OpenAI doesn't expose thinking
-            "usage": {
-                "input_tokens": input_t,
-                "output_tokens": output_t,
-                "reasoning_tokens": reasoning_t,
-                "cost_usd": cost,
-            },
+            "usage": self._record_openai_usage(config, response.usage),
             "model": config.name,
         }
     
-    async def _generate_google(
+    async def _stream_openai(
+        self,
+        prompt: str,
+        config: ModelConfig,
+        system: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        enable_thinking: bool,
+        thinking_budget: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """Stream text deltas from the OpenAI API."""
+        kwargs = self._openai_kwargs(
+            prompt, config, system, max_tokens, temperature, enable_thinking
+        )
+        async for item in self._stream_chat(Provider.OPENAI, kwargs):
+            if isinstance(item, str):
+                yield item
+            else:
+                self._record_openai_usage(config, item)
+    
+    async def _google_request(
         self,
         prompt: str,
         config: ModelConfig,
@@ -412,9 +1175,9 @@ class MultiModelClient:
         temperature: float,
         enable_thinking: bool,
         thinking_budget: Optional[int],
-    ) -> Dict[str, Any]:
-        """Generate using Google Gemini API."""
-        genai = self._get_client(Provider.GOOGLE)
+    ) -> Tuple[Any, str, Dict[str, Any]]:
+        """Build (model, prompt, generation_config) for a Gemini call."""
+        genai = await self._get_client(Provider.GOOGLE)
         
         model = genai.GenerativeModel(config.name)
         
@@ -433,35 +1196,91 @@ class MultiModelClient:
                 "thinking_budget": budget
             }
         
-        response = await asyncio.to_thread(
-            model.generate_content,
+        return model, full_prompt, generation_config
+    
+    async def _record_google_usage(
+        self,
+        model: Any,
+        config: ModelConfig,
+        response: Any,
+        full_prompt: str,
+        content: str,
+    ) -> Dict[str, Any]:
+        # Prefer reported token counts; fall back to the tokenizer
+        meta = getattr(response, "usage_metadata", None)
+        if meta is not None and meta.prompt_token_count:
+            input_t = meta.prompt_token_count
+            output_t = meta.candidates_token_count or 0
+        else:
+            input_t = await _count_gemini_tokens(model, config.name, full_prompt)
+            output_t = await _count_gemini_tokens(model, config.name, content)
+        
+        return self._record_usage(config, input_t, output_t)
+    
+    async def _generate_google(
+        self,
+        prompt: str,
+        config: ModelConfig,
+        system: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        enable_thinking: bool,
+        thinking_budget: Optional[int],
+    ) -> Dict[str, Any]:
+        """Generate using Google Gemini API."""
+        model, full_prompt, generation_config = await self._google_request(
+            prompt, config, system, max_tokens, temperature,
+            enable_thinking, thinking_budget
+        )
+        
+        response = await model.generate_content_async(
             full_prompt,
             generation_config=generation_config
         )
         
         content = response.text
         
-        # Estimate tokens (Gemini doesn't always report accurately)
-        input_t = len(full_prompt.split()) * 1.3
-        output_t = len(content.split()) * 1.3
-        
-        cost = (
-            input_t * config.cost_per_1k_input / 1000 +
-            output_t * config.cost_per_1k_output / 1000
-        )
-        self.usage.add(int(input_t), int(output_t), 0, cost)
-        
         return {
             "content": content,
             "thinking": "",
-            "usage": {
-                "input_tokens": int(input_t),
-                "output_tokens": int(output_t),
-                "cost_usd": cost,
-            },
+            "usage": await self._record_google_usage(
+                model, config, response, full_prompt, content
+            ),
             "model": config.name,
         }
     
+    async def _stream_google(
+        self,
+        prompt: str,
+        config: ModelConfig,
+        system: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        enable_thinking: bool,
+        thinking_budget: Optional[int],
+    ) -> AsyncIterator[str]:
+        """Stream text chunks from the Google Gemini API."""
+        model, full_prompt, generation_config = await self._google_request(
+            prompt, config, system, max_tokens, temperature,
+            enable_thinking, thinking_budget
+        )
+        
+        response = await model.generate_content_async(
+            full_prompt,
+            generation_config=generation_config,
+            stream=True,
+        )
+        
+        parts = []
+        async for chunk in response:
+            if chunk.text:
+                parts.append(chunk.text)
+                yield chunk.text
+        
+        await self._record_google_usage(
+            model, config, response, full_prompt, "".join(parts)
+        )
+    
     async def _generate_deepseek(
         self,
         prompt: str,
@@ -469,21 +1288,14 @@ class MultiModelClient:
         system: Optional[str],
         max_tokens: int,
         temperature: float,
+        enable_thinking: bool = False,
+        thinking_budget: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Generate using DeepSeek API (OpenAI-compatible)."""
-        client = self._get_client(Provider.DEEPSEEK)
+        client = await self._get_client(Provider.DEEPSEEK)
         
-        messages = []
-        if system:
-            messages.append({"role": "system", "content": system})
-        messages.append({"role": "user", "content": prompt})
-        
-        response = await asyncio.to_thread(
-            client.chat.completions.create,
-            model=config.name,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            messages=messages,
+        response = await client.chat.completions.create(
+            **self._chat_kwargs(prompt, config, system, max_tokens, temperature)
         )
         
         content = response.choices[0].message.content
@@ -494,41 +1306,98 @@ class MultiModelClient:
         ) or ''
         
         usage = response.usage
-        input_t = usage.prompt_tokens
-        output_t = usage.completion_tokens
-        
-        cost = (
-            input_t * config.cost_per_1k_input / 1000 +
-            output_t * config.cost_per_1k_output / 1000
-        )
-        self.usage.add(input_t, output_t, 0, cost)
         
         return {
             "content": content,
             "thinking": reasoning,
-            "usage": {
-                "input_tokens": input_t,
-                "output_tokens": output_t,
-                "cost_usd": cost,
-            },
+            "usage": self._record_usage(
+                config, usage.prompt_tokens, usage.completion_tokens
+            ),
             "model": config.name,
         }
     
+    async def _stream_deepseek(
+        self,
+        prompt: str,
+        config: ModelConfig,
+        system: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        enable_thinking: bool = False,
+        thinking_budget: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """Stream answer deltas from the DeepSeek API (reasoning is not streamed)."""
+        kwargs = self._chat_kwargs(prompt, config, system, max_tokens, temperature)
+        async for item in self._stream_chat(Provider.DEEPSEEK, kwargs):
+            if isinstance(item, str):
+                yield item
+            else:
+                self._record_usage(config, item.prompt_tokens, item.completion_tokens)
+    
     def get_usage_summary(self) -> Dict[str, Any]:
         """Get usage summary."""
-        return {
-            "total_requests": self.usage.requests,
-            "total_input_tokens": self.usage.input_tokens,
-            "total_output_tokens": self.usage.output_tokens,
-            "total_thinking_tokens": self.usage.thinking_tokens,
-            "total_cost_usd": round(self.usage.cost_usd, 4),
+        usage = self.usage
+        summary = {
+            "total_requests": usage.requests,
+            "total_input_tokens": usage.input_tokens,
+            "total_output_tokens": usage.output_tokens,
+            "total_thinking_tokens": usage.thinking_tokens,
+            "total_cache_read_tokens": usage.cache_read_tokens,
+            "total_cache_write_tokens": usage.cache_write_tokens,
+            "total_cost_usd": round(usage.cost_usd, 4),
             "budget_remaining_usd": round(
-                self.monthly_budget_usd - self.usage.cost_usd, 4
+                self.monthly_budget_usd - usage.cost_usd, 4
             ),
             "budget_utilization_pct": round(
-                self.usage.cost_usd / self.monthly_budget_usd * 100, 2
+                usage.cost_usd / self.monthly_budget_usd * 100, 2
             ),
         }
+        if self.cache is not None:
+            summary["cache"] = dict(self.cache.stats)
+        if self.semantic_cache is not None:
+            summary["semantic_cache"] = {
+                **self.semantic_cache.stats,
+                "threshold": self.semantic_cache.threshold,
+            }
+        return summary
+    
+    async def warm_up(self, models: Optional[List[str]] = None) -> None:
+        """
+        Build the provider clients for ``models`` ahead of the first call.
+        
+        Unconfigured providers are skipped. Defaults to the default model.
+        """
+        providers = {MODELS[m].provider for m in (models or [self.default_model])}
+        for provider in providers:
+            if self._is_configured(provider):
+                await self._get_client(provider)
+    
+    async def aclose(self) -> None:
+        """Flush pending cache writes and close the shared HTTP connection pool."""
+        if self.cache is not None:
+            await self.cache.aclose()
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+            # SDK clients hold the closed pool; rebuild them on next use
+            self._clients.clear()
+    
+    async def __aenter__(self) -> "MultiModelClient":
+        await self.warm_up()
+        return self
+    
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+    
+    def get_provider_health(self) -> Dict[str, Dict[str, Any]]:
+        """Circuit state ('closed', 'open', 'half_open') and latency per provider."""
+        return {
+            p.value: {
+                "state": breaker.state,
+                "latency_s": self._latency.get(p),
+            }
+            for p, breaker in self._breakers.items()
+        }
     
     def is_within_budget(self) -> bool:
         """Check if still within budget."""
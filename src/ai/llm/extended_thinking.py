@@ -6,13 +6,27 @@ AI-powered research review system using extended thinking
 for deep analysis of research proposals and papers.
 """
 
+import json
 import asyncio
+from collections import Counter
+from pathlib import Path
+from types import MappingProxyType
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, AsyncIterator, Iterable, Tuple, NamedTuple
 from enum import Enum
+import numpy as np
+import xxhash
 from loguru import logger
 
-from .client import MultiModelClient
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+from .client import MultiModelClient, MODELS
+from .cache import LLMCache
+from .semantic_cache import SemanticCache
+from .tokens import count_tokens, truncate_middle
 
 
 class ReviewType(str, Enum):
@@ -24,138 +38,240 @@ class ReviewType(str, Enum):
     CODE_REVIEW = "code_review"
 
 
-@dataclass
+class ReviewError(Exception):
+    """A failed review, tagged with the ID of the item it was for."""
+    
+    def __init__(self, item_id: Any, error: BaseException):
+        super().__init__(f"Review failed for {item_id}: {error}")
+        self.item_id = item_id
+        self.error = error
+    
+    def to_record(self) -> Dict[str, Any]:
+        """Error record as returned in batch results."""
+        return {"error": str(self.error), "item_id": self.item_id}
+
+
+class RubricRow(NamedTuple):
+    """One rubric criterion."""
+    category: str
+    description: str
+    weight: float
+    max_score: int
+
+
+@dataclass(frozen=True, slots=True)
 class ReviewConfig:
     """Configuration for a review task."""
     review_type: ReviewType
     thinking_budget: int
-    criteria: List[str]
-    rubric: Dict[str, Dict]  # category -> {description, weight, max_score}
+    criteria: Tuple[str, ...]
+    rubric: Tuple[RubricRow, ...]
 
 
-# Review configurations
-REVIEW_CONFIGS = {
+# Review configurations (read-only)
+REVIEW_CONFIGS = MappingProxyType({
     ReviewType.APPLICATION: ReviewConfig(
         review_type=ReviewType.APPLICATION,
         thinking_budget=12000,
-        criteria=[
+        criteria=(
             "academic_excellence",
             "research_potential",
             "motivation_clarity",
             "technical_skills",
             "communication",
-        ],
-        rubric={
-            "academic_excellence": {
-                "description": "GPA, relevant coursework, academic achievements",
-                "weight": 0.20,
-                "max_score": 100,
-            },
-            "research_potential": {
-                "description": "Research plan quality, creativity, feasibility",
-                "weight": 0.30,
-                "max_score": 100,
-            },
-            "motivation_clarity": {
-                "description": "Clear motivation, alignment with program goals",
-                "weight": 0.20,
-                "max_score": 100,
-            },
-            "technical_skills": {
-                "description": "Programming, ML/AI, neuroscience tools",
-                "weight": 0.20,
-                "max_score": 100,
-            },
-            "communication": {
-                "description": "Writing clarity, presentation skills, English",
-                "weight": 0.10,
-                "max_score": 100,
-            },
-        }
+        ),
+        rubric=(
+            RubricRow("academic_excellence", "GPA, relevant coursework, academic achievements", 0.20, 100),
+            RubricRow("research_potential", "Research plan quality, creativity, feasibility", 0.30, 100),
+            RubricRow("motivation_clarity", "Clear motivation, alignment with program goals", 0.20, 100),
+            RubricRow("technical_skills", "Programming, ML/AI, neuroscience tools", 0.20, 100),
+            RubricRow("communication", "Writing clarity, presentation skills, English", 0.10, 100),
+        ),
     ),
     ReviewType.RESEARCH_PROPOSAL: ReviewConfig(
         review_type=ReviewType.RESEARCH_PROPOSAL,
         thinking_budget=16000,
-        criteria=[
+        criteria=(
             "novelty",
             "methodology",
             "feasibility",
             "significance",
             "presentation",
-        ],
-        rubric={
-            "novelty": {
-                "description": "Original contribution, advances the field",
-                "weight": 0.25,
-                "max_score": 100,
-            },
-            "methodology": {
-                "description": "Sound methods, appropriate techniques",
-                "weight": 0.25,
-                "max_score": 100,
-            },
-            "feasibility": {
-                "description": "Achievable within timeframe and resources",
-                "weight": 0.20,
-                "max_score": 100,
-            },
-            "significance": {
-                "description": "Impact on field, broader implications",
-                "weight": 0.20,
-                "max_score": 100,
-            },
-            "presentation": {
-                "description": "Clear writing, logical structure, figures",
-                "weight": 0.10,
-                "max_score": 100,
-            },
-        }
+        ),
+        rubric=(
+            RubricRow("novelty", "Original contribution, advances the field", 0.25, 100),
+            RubricRow("methodology", "Sound methods, appropriate techniques", 0.25, 100),
+            RubricRow("feasibility", "Achievable within timeframe and resources", 0.20, 100),
+            RubricRow("significance", "Impact on field, broader implications", 0.20, 100),
+            RubricRow("presentation", "Clear writing, logical structure, figures", 0.10, 100),
+        ),
     ),
     ReviewType.PAPER_DRAFT: ReviewConfig(
         review_type=ReviewType.PAPER_DRAFT,
         thinking_budget=20000,
-        criteria=[
+        criteria=(
             "technical_correctness",
             "novelty",
             "clarity",
             "experimental_rigor",
             "significance",
             "reproducibility",
-        ],
-        rubric={
-            "technical_correctness": {
-                "description": "Methods are sound, no errors",
-                "weight": 0.20,
-                "max_score": 100,
-            },
-            "novelty": {
-                "description": "New ideas, techniques, or insights",
-                "weight": 0.20,
-                "max_score": 100,
-            },
-            "clarity": {
-                "description": "Well-written, easy to understand",
-                "weight": 0.15,
-                "max_score": 100,
-            },
-            "experimental_rigor": {
-                "description": "Proper experiments, statistical analysis",
-                "weight": 0.20,
-                "max_score": 100,
-            },
-            "significance": {
-                "description": "Important contribution to the field",
-                "weight": 0.15,
-                "max_score": 100,
-            },
-            "reproducibility": {
-                "description": "Code/data available, methods detailed",
-                "weight": 0.10,
-                "max_score": 100,
-            },
-        }
+        ),
+        rubric=(
+            RubricRow("technical_correctness", "Methods are sound, no errors", 0.20, 100),
+            RubricRow("novelty", "New ideas, techniques, or insights", 0.20, 100),
+            RubricRow("clarity", "Well-written, easy to understand", 0.15, 100),
+            RubricRow("experimental_rigor", "Proper experiments, statistical analysis", 0.20, 100),
+            RubricRow("significance", "Important contribution to the field", 0.15, 100),
+            RubricRow("reproducibility", "Code/data available, methods detailed", 0.10, 100),
+        ),
     ),
+})
+
+
+# Context tokens reserved for instructions, rubric and framing
+PROMPT_OVERHEAD_TOKENS = 2048
+
+# Cap on the serialized review sample embedded in summary prompts
+SUMMARY_SAMPLE_MAX_CHARS = 8000
+
+# Derived per review type at import: rubric criteria in a fixed order,
+# their weights aligned to that order, and the rendered rubric text
+_CRITERIA_ORDER: Dict[ReviewType, Tuple[str, ...]] = {
+    rt: tuple(row.category for row in config.rubric)
+    for rt, config in REVIEW_CONFIGS.items()
+}
+_WEIGHT_VEC: Dict[ReviewType, np.ndarray] = {
+    rt: np.array([row.weight for row in config.rubric], dtype=np.float64)
+    for rt, config in REVIEW_CONFIGS.items()
 }
+_RUBRIC_TEXT: Dict[ReviewType, str] = {
+    rt: "\n".join(
+        f"- {row.category}: {row.description} (weight: {row.weight*100}%)"
+        for row in config.rubric
+    )
+    for rt, config in REVIEW_CONFIGS.items()
+}
+
+
+def _render_system_prompt(rubric_text: str) -> str:
+    """Reviewer system prompt (rubric and output format) for a rubric."""
+    return f"""You are an expert reviewer for the SNU Connectome Fellows Program,
+a prestigious research fellowship focused on Neuroscience Foundation Models.
+
+Your role is to provide thorough, constructive reviews using the following rubric:
+
+{rubric_text}
+
+Guidelines:
+1. Be thorough but constructive - highlight both strengths and areas for improvement
+2. Provide specific, actionable feedback
+3. Score each criterion from 0-100
+4. Consider the program's focus on Brain Foundation Models, multimodal learning,
+   and training world-class researchers
+5. Maintain high standards while being encouraging
+
+Output Format:
+Provide your review in the following JSON structure:
+{{
+    "scores": {{"criterion": score, ...}},
+    "strengths": ["strength1", "strength2", ...],
+    "weaknesses": ["weakness1", "weakness2", ...],
+    "detailed_feedback": {{
+        "criterion": "detailed feedback for each criterion"
+    }},
+    "overall_assessment": "summary assessment",
+    "recommendation": "accept/revise/reject",
+    "confidence": 0.0-1.0
+}}
+"""
+
+
+# Rubrics are immutable, so every per-type prompt fragment is rendered
+# once at import instead of on each review
+_SYSTEM_PROMPTS: Dict[ReviewType, str] = {
+    rt: _render_system_prompt(text) for rt, text in _RUBRIC_TEXT.items()
+}
+_REVIEW_PROMPT_HEADERS: Dict[ReviewType, str] = {
+    rt: f"Please review the following {rt.value}:\n\n---\n"
+    for rt in REVIEW_CONFIGS
+}
+_REVIEW_PROMPT_FOOTER = """
+Provide a comprehensive review following the rubric and output format
+specified in your instructions. Think carefully about each criterion
+before scoring.
+"""
+
+
+def _json_loads(text: str) -> Any:
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> str:
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, default=str, option=option).decode()
+    return json.dumps(obj, default=str, ensure_ascii=False, indent=2 if indent else None)
+
+
+def _matching_brace(text: str, start: int) -> int:
+    """Index of the '}' closing the '{' at ``start``, or -1."""
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+
+def _extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract the first JSON object embedded in a model response.
+    
+    The object is located with a single brace-depth scan (string-aware)
+    from the first '{'. If that slice does not parse, each later '{' is
+    tried with the stdlib raw_decode.
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+    
+    end = _matching_brace(text, start)
+    if end > 0:
+        try:
+            data = _json_loads(text[start:end + 1])
+            if isinstance(data, dict):
+                return data
+        except json.JSONDecodeError:  # orjson's error subclasses it
+            pass
+    
+    decoder = json.JSONDecoder()
+    while start >= 0:
+        try:
+            data, _ = decoder.raw_decode(text, start)
+            if isinstance(data, dict):
+                return data
+        except json.JSONDecodeError:
+            pass
+        start = text.find("{", start + 1)
+    return None
 
 
 class ExtendedThinkingReviewer:
@@ -164,15 +280,55 @@ class ExtendedThinkingReviewer:
     
     Uses Claude Opus 4's extended thinking feature for thorough,
     well-reasoned reviews of research materials.
+    
+    Reviews can be cached: exactly repeated submissions are served from
+    ``review_cache`` and near-duplicates (e.g. resubmissions with minor
+    edits) from ``semantic_cache``, skipping the thinking budget. The
+    client's own response cache does not cover thinking-enabled calls.
     """
     
     def __init__(
         self,
         client: Optional[MultiModelClient] = None,
         default_model: str = "claude-opus-4",
+        review_cache: Optional[LLMCache] = None,
+        semantic_cache: Optional[SemanticCache] = None,
     ):
+        # A client we create is ours to close; a shared one is left open
+        self._owns_client = client is None
         self.client = client or MultiModelClient(default_model=default_model)
         self.default_model = default_model
+        self.review_cache = review_cache
+        self.semantic_cache = semantic_cache
+    
+    async def __aenter__(self) -> "ExtendedThinkingReviewer":
+        await self.client.warm_up([self.default_model])
+        return self
+    
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+    
+    async def aclose(self) -> None:
+        """Flush pending review cache writes and close an owned client."""
+        if self.review_cache is not None:
+            await self.review_cache.flush()
+        if self._owns_client:
+            await self.client.aclose()
+    
+    @staticmethod
+    def review_key(
+        content: str,
+        review_type: ReviewType,
+        model: str,
+        additional_context: Optional[str] = None,
+    ) -> str:
+        """Cache key for a review request."""
+        h = xxhash.xxh3_128()
+        for part in (review_type.value, model, additional_context or ""):
+            h.update(part.encode())
+            h.update(b"\x00")
+        h.update(content.encode())
+        return h.hexdigest()
     
     async def review(
         self,
@@ -197,9 +353,37 @@ class ExtendedThinkingReviewer:
         if not config:
             raise ValueError(f"Unknown review type: {review_type}")
         
-        # Build review prompt
+        model_key = model or self.default_model
+        
+        # Exact repeat of an earlier submission
+        cache_key = None
+        if self.review_cache is not None:
+            cache_key = self.review_key(content, review_type, model_key, additional_context)
+            cached = await self.review_cache.get(cache_key)
+            if cached is not None:
+                return {**cached, "cache_hit": True}
+        
+        # Near-duplicate submission
+        content_vec = None
+        namespace = (model_key, review_type.value)
+        if self.semantic_cache is not None and additional_context is None:
+            content_vec = await self.semantic_cache.embed(content)
+            similar = self.semantic_cache.search(namespace, content_vec)
+            if similar is not None:
+                return {**similar, "cache_hit": True}
+        
+        # Build review prompt, trimming content to the model's context
+        model_config = MODELS.get(model_key)
+        max_content_tokens = None
+        if model_config is not None:
+            max_content_tokens = (
+                model_config.context_window
+                - model_config.max_tokens
+                - config.thinking_budget
+                - PROMPT_OVERHEAD_TOKENS
+            )
         prompt = self._build_review_prompt(
-            content, config, additional_context
+            content, config, additional_context, max_content_tokens
         )
         
         system = self._build_system_prompt(config)
@@ -207,7 +391,7 @@ class ExtendedThinkingReviewer:
         # Generate review with extended thinking
         response = await self.client.generate(
             prompt=prompt,
-            model=model or self.default_model,
+            model=model_key,
             system=system,
             enable_thinking=True,
             thinking_budget=config.thinking_budget,
@@ -221,77 +405,76 @@ class ExtendedThinkingReviewer:
         review["usage"] = response["usage"]
         review["model"] = response["model"]
         review["review_type"] = review_type.value
+        review["cache_hit"] = False
+        
+        # Cache without the (large) thinking text; it is stored separately
+        cached_review = {**review, "thinking_process": ""}
+        if review.get("parse_error"):
+            cache_key = content_vec = None
+        if cache_key is not None:
+            cached_review["review_key"] = cache_key
+            await self.review_cache.set(cache_key, cached_review)
+            await self.review_cache.set(f"{cache_key}:thinking", {
+                "thinking": review["thinking_process"],
+            })
+        if content_vec is not None:
+            self.semantic_cache.add(namespace, content_vec, cached_review)
         
         logger.info(
-            f"Review completed: type={review_type.value}, "
-            f"total_score={review.get('total_score', 'N/A')}"
+            "Review completed: type={}, total_score={}",
+            review_type.value, review.get("total_score", "N/A"),
         )
         
         return review
     
+    async def load_thinking(self, review: Dict[str, Any]) -> str:
+        """Load the thinking text of a review served from the exact cache."""
+        if review.get("thinking_process"):
+            return review["thinking_process"]
+        if self.review_cache is None or "review_key" not in review:
+            return ""
+        cached = await self.review_cache.get(f"{review['review_key']}:thinking")
+        return cached["thinking"] if cached else ""
+    
     def _build_system_prompt(self, config: ReviewConfig) -> str:
-        """Build system prompt for the reviewer."""
-        rubric_text = "\n".join([
-            f"- {cat}: {info['description']} (weight: {info['weight']*100}%)"
-            for cat, info in config.rubric.items()
-        ])
+        """
+        Build system prompt for the reviewer.
         
-        return f"""You are an expert reviewer for the SNU Connectome Fellows Program,
-a prestigious research fellowship focused on Neuroscience Foundation Models.
-
-Your role is to provide thorough, constructive reviews using the following rubric:
-
-{rubric_text}
-
-Guidelines:
-1. Be thorough but constructive - highlight both strengths and areas for improvement
-2. Provide specific, actionable feedback
-3. Score each criterion from 0-100
-4. Consider the program's focus on Brain Foundation Models, multimodal learning,
-   and training world-class researchers
-5. Maintain high standards while being encouraging
-
-Output Format:
-Provide your review in the following JSON structure:
-{{
-    "scores": {{"criterion": score, ...}},
-    "strengths": ["strength1", "strength2", ...],
-    "weaknesses": ["weakness1", "weakness2", ...],
-    "detailed_feedback": {{
-        "criterion": "detailed feedback for each criterion"
-    }},
-    "overall_assessment": "summary assessment",
-    "recommendation": "accept/revise/reject",
-    "confidence": 0.0-1.0
-}}
-"""
+        The prompt only depends on the review type, so it is built once
+        per type and sent byte-identical on every call, which lets the
+        client's prompt-cache breakpoint on the system block hit.
+        """
+        return _SYSTEM_PROMPTS[config.review_type]
     
     def _build_review_prompt(
         self,
         content: str,
         config: ReviewConfig,
         additional_context: Optional[str],
+        max_content_tokens: Optional[int] = None,
     ) -> str:
-        """Build the review prompt."""
-        prompt = f"""Please review the following {config.review_type.value}:
-
----
-{content}
----
-"""
+        """
+        Build the review prompt.
         
-        if additional_context:
-            prompt += f"""
-Additional Context:
-{additional_context}
-"""
+        Content longer than ``max_content_tokens`` keeps its head and
+        tail with the middle elided.
+        """
+        if max_content_tokens is not None:
+            if additional_context:
+                max_content_tokens -= count_tokens(additional_context)
+            max_content_tokens = max(max_content_tokens, 0)
+            if count_tokens(content) > max_content_tokens:
+                logger.warning(
+                    f"Truncating {config.review_type.value} content to "
+                    f"{max_content_tokens} tokens"
+                )
+                content = truncate_middle(content, max_content_tokens)
         
-        prompt += """
-Provide a comprehensive review following the rubric and output format
-specified in your instructions. Think carefully about each criterion
-before scoring.
-"""
-        return prompt
+        parts = [_REVIEW_PROMPT_HEADERS[config.review_type], content, "\n---\n"]
+        if additional_context:
+            parts.append(f"\nAdditional Context:\n{additional_context}\n")
+        parts.append(_REVIEW_PROMPT_FOOTER)
+        return "".join(parts)
     
     def _parse_review(
         self,
@@ -299,28 +482,21 @@ before scoring.
         config: ReviewConfig,
     ) -> Dict[str, Any]:
         """Parse review response into structured format."""
-        import json
-        import re
-        
-        # Try to extract JSON
-        json_match = re.search(r'\{[\s\S]*\}', response)
+        review_data = _extract_json_object(response)
         
-        if json_match:
-            try:
-                review_data = json.loads(json_match.group())
-                
-                # Calculate total score
-                scores = review_data.get("scores", {})
-                total_score = 0.0
-                for criterion, info in config.rubric.items():
-                    score = scores.get(criterion, 0)
-                    total_score += score * info["weight"]
-                
-                review_data["total_score"] = round(total_score, 2)
-                return review_data
-                
-            except json.JSONDecodeError:
-                pass
+        if review_data is not None:
+            # Calculate total score (weighted sum over rubric criteria)
+            scores = review_data.get("scores", {})
+            criteria = _CRITERIA_ORDER[config.review_type]
+            score_vec = np.fromiter(
+                (scores.get(c, 0) for c in criteria),
+                dtype=np.float64,
+                count=len(criteria),
+            )
+            total_score = float(score_vec @ _WEIGHT_VEC[config.review_type])
+            
+            review_data["total_score"] = round(total_score, 2)
+            return review_data
         
         # Fallback: return raw response
         return {
@@ -330,11 +506,137 @@ before scoring.
             "parse_error": True,
         }
     
+    async def _review_stream(
+        self,
+        items: Iterable[Dict[str, str]],
+        review_type: ReviewType,
+        max_concurrent: int,
+        fail_fast: bool = False,
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yield (input index, review) pairs as a fixed worker pool completes them.
+        
+        Failed items yield an error record, or with ``fail_fast`` raise
+        ReviewError and cancel the remaining workers.
+        """
+        source = enumerate(items)
+        done: asyncio.Queue = asyncio.Queue(maxsize=max_concurrent)
+        
+        async def worker():
+            try:
+                # Workers share one iterator, so items are pulled on demand
+                for index, item in source:
+                    try:
+                        review = await self.review(
+                            content=item["content"],
+                            review_type=review_type,
+                        )
+                        review["item_id"] = item["id"]
+                    except Exception as e:
+                        error = ReviewError(item.get("id"), e)
+                        error.__cause__ = e
+                        logger.warning(str(error))
+                        if fail_fast:
+                            # Forwarded below; the consumer raises it and
+                            # cancels the rest of the pool
+                            raise error
+                        review = error.to_record()
+                    await done.put((index, review))
+            except asyncio.CancelledError:
+                # The consumer has stopped reading, so a sentinel put on
+                # the bounded queue could block forever
+                raise
+            except BaseException as e:
+                await done.put(e)
+                return
+            await done.put(None)
+        
+        workers = [asyncio.create_task(worker()) for _ in range(max_concurrent)]
+        try:
+            running = len(workers)
+            while running:
+                entry = await done.get()
+                if entry is None:
+                    running -= 1
+                elif isinstance(entry, BaseException):
+                    raise entry
+                else:
+                    yield entry
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+    
+    async def review_batch_stream(
+        self,
+        items: Iterable[Dict[str, str]],
+        review_type: ReviewType,
+        max_concurrent: int = 3,
+        fail_fast: bool = False,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Review items concurrently, yielding each review as it completes.
+        
+        Items are consumed lazily by ``max_concurrent`` workers, so
+        ``items`` may be a generator. Failed items yield
+        ``{"error": ..., "item_id": ...}``.
+        
+        Args:
+            items: Dicts with 'id' and 'content'
+            review_type: Type of review
+            max_concurrent: Number of workers
+            fail_fast: Raise ReviewError on the first failure instead
+            
+        Yields:
+            Reviews with item IDs, in completion order
+        """
+        async for _, review in self._review_stream(
+            items, review_type, max_concurrent, fail_fast
+        ):
+            yield review
+    
+    @staticmethod
+    def _load_checkpoint(path: Path) -> Dict[Any, Dict[str, Any]]:
+        """
+        Successful reviews already written to a JSONL output, by item ID.
+        
+        A last line that does not parse is what an interrupted append
+        leaves behind; it is logged and truncated away so the resumed
+        batch appends after the last complete record.
+        """
+        done = {}
+        if not path.exists():
+            return done
+        lines = path.read_bytes().splitlines(keepends=True)
+        good_end = 0
+        for i, line in enumerate(lines):
+            if line.strip():
+                try:
+                    record = _json_loads(line)
+                except ValueError:
+                    if i < len(lines) - 1:
+                        raise
+                    logger.warning(f"Dropping truncated last line of checkpoint {path}")
+                    with open(path, 'r+b') as f:
+                        f.truncate(good_end)
+                    return done
+                if "error" not in record:
+                    done[record["item_id"]] = record
+            good_end += len(line)
+        
+        if lines and not lines[-1].endswith(b"\n"):
+            # Complete record whose newline was never written
+            with open(path, 'ab') as f:
+                f.write(b"\n")
+        return done
+    
     async def review_batch(
         self,
         items: List[Dict[str, str]],
         review_type: ReviewType,
         max_concurrent: int = 3,
+        output_jsonl: Optional[Path] = None,
+        fail_fast: bool = False,
     ) -> List[Dict[str, Any]]:
         """
         Review multiple items concurrently.
@@ -343,33 +645,60 @@ before scoring.
             items: List of dicts with 'id' and 'content'
             review_type: Type of review
             max_concurrent: Max concurrent reviews
+            output_jsonl: Optional JSONL file that each review is appended
+                to as it completes. Items already reviewed successfully in
+                the file are skipped, so an interrupted batch can resume.
+            fail_fast: Raise ReviewError on the first failed review (e.g.
+                a provider outage) instead of recording it and continuing.
+                Reviews finished so far are kept in ``output_jsonl``.
             
         Returns:
-            List of reviews with item IDs
+            List of reviews with item IDs, in input order
+        
+        Items with identical content are reviewed once and the review is
+        copied to every matching item.
         """
-        semaphore = asyncio.Semaphore(max_concurrent)
+        done: Dict[Any, Dict[str, Any]] = {}
+        if output_jsonl is not None:
+            done = self._load_checkpoint(output_jsonl)
+            if done:
+                logger.info(f"Resuming review_batch: {len(done)} items already in {output_jsonl}")
         
-        async def review_item(item):
-            async with semaphore:
-                review = await self.review(
-                    content=item["content"],
-                    review_type=review_type,
-                )
-                review["item_id"] = item["id"]
-                return review
-        
-        tasks = [review_item(item) for item in items]
-        reviews = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        results = []
-        for review in reviews:
-            if isinstance(review, Exception):
-                results.append({
-                    "error": str(review),
-                    "item_id": "unknown",
-                })
-            else:
-                results.append(review)
+        # Group pending input positions by content
+        buckets: Dict[bytes, List[int]] = {}
+        for i, item in enumerate(items):
+            if item["id"] in done:
+                continue
+            digest = xxhash.xxh3_128_digest(item["content"].encode())
+            buckets.setdefault(digest, []).append(i)
+        
+        pending = sum(len(positions) for positions in buckets.values())
+        if len(buckets) < pending:
+            logger.info(
+                "review_batch: {} unique of {} items (dedup_ratio={:.2f})",
+                len(buckets), pending, 1 - len(buckets) / pending,
+            )
+        
+        groups = list(buckets.values())
+        unique_items = (items[positions[0]] for positions in groups)
+        results: List[Optional[Dict[str, Any]]] = [
+            done.get(item["id"]) for item in items
+        ]
+        
+        sink = open(output_jsonl, 'a', encoding='utf-8') if output_jsonl is not None else None
+        try:
+            async for index, review in self._review_stream(
+                unique_items, review_type, max_concurrent, fail_fast
+            ):
+                for i in groups[index]:
+                    results[i] = {**review, "item_id": items[i]["id"]}
+                    if sink is not None:
+                        sink.write(_json_dumps(results[i]) + "\n")
+                if sink is not None:
+                    sink.flush()
+        finally:
+            if sink is not None:
+                sink.close()
         
         return results
     
@@ -381,13 +710,22 @@ before scoring.
         
         # Aggregate statistics
         total_reviews = len(reviews)
-        scores = [r.get("total_score") for r in reviews if r.get("total_score")]
-        avg_score = sum(scores) / len(scores) if scores else 0
+        scores = np.fromiter(
+            (r["total_score"] for r in reviews if r.get("total_score") is not None),
+            dtype=np.float64,
+        )
+        avg_score = float(scores.mean()) if scores.size else 0.0
+        
+        recommendations = dict(Counter(r.get("recommendation", "unknown") for r in reviews))
         
-        recommendations = {}
-        for r in reviews:
-            rec = r.get("recommendation", "unknown")
-            recommendations[rec] = recommendations.get(rec, 0) + 1
+        # Sample without thinking text/usage, capped to bound prompt tokens
+        sample = [
+            {k: v for k, v in r.items() if k not in ("thinking_process", "usage")}
+            for r in reviews[:3]
+        ]
+        sample_text = _json_dumps(sample, indent=True)
+        if len(sample_text) > SUMMARY_SAMPLE_MAX_CHARS:
+            sample_text = sample_text[:SUMMARY_SAMPLE_MAX_CHARS] + " ...(truncated)"
         
         prompt = f"""Based on {total_reviews} reviews with an average score of {avg_score:.1f},
 and recommendation distribution: {recommendations},
@@ -400,7 +738,7 @@ Generate a comprehensive summary report including:
 5. Notable standouts (if any)
 
 Reviews data (sample):
-{reviews[:3]}
+{sample_text}
 """
         
         response = await self.client.generate(
@@ -0,0 +1,134 @@
+"""
+Rate Limiting
+=============
+
+Async rate-limiting and failure-isolation primitives shared by the
+LLM clients.
+"""
+
+import time
+import random
+import asyncio
+
+
+# HTTP status codes worth retrying (rate limit / overload / gateway)
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504, 529})
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    `acquire` waits until enough tokens are available.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def per_minute(cls, limit: float) -> "TokenBucket":
+        """Bucket allowing `limit` acquisitions per minute."""
+        return cls(rate=limit / 60.0, capacity=limit)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until `tokens` can be taken from the bucket."""
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+    async def __aenter__(self) -> "TokenBucket":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is short-circuited by an open circuit breaker."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After `fail_threshold` consecutive failures the circuit opens and
+    calls are rejected for `reset_after` seconds. The next call after
+    the cooldown is let through; success closes the circuit, failure
+    re-opens it.
+    """
+
+    def __init__(self, name: str, fail_threshold: int = 5, reset_after: float = 30.0):
+        self.name = name
+        self.fail_threshold = fail_threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self._opened_at = None
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.reset_after:
+            return "open"
+        return "half_open"
+
+    def check(self) -> None:
+        """Raise CircuitOpenError if calls are currently rejected."""
+        if self.state == "open":
+            remaining = self.reset_after - (time.monotonic() - self._opened_at)
+            raise CircuitOpenError(
+                f"Circuit for {self.name} is open "
+                f"({self.failures} consecutive failures, retry in {remaining:.0f}s)"
+            )
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.fail_threshold:
+            self._opened_at = time.monotonic()
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a provider error is transient and worth retrying."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+
+    # SDK errors without an HTTP status (connection/timeout errors)
+    name = type(error).__name__
+    return name in {
+        "RateLimitError",
+        "APIConnectionError",
+        "APITimeoutError",
+        "ResourceExhausted",
+        "ServiceUnavailable",
+        "DeadlineExceeded",
+    } or isinstance(error, (asyncio.TimeoutError, ConnectionError))
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Exponential backoff with full jitter for retry `attempt` (0-based)."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
@@ -6,42 +6,82 @@ Intelligent routing of tasks to optimal LLM models based on
 task type, complexity, and budget constraints.
 """
 
+import re
+from collections import Counter
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
-from enum import Enum
+from typing import Dict, List, Optional, Tuple, Collection, Sequence
+from enum import IntEnum
+import numpy as np
 from loguru import logger
 
 
-class TaskType(str, Enum):
-    """Types of tasks for routing."""
+class TaskType(IntEnum):
+    """Types of tasks for routing.
+
+    Members are small ints so routing can index tables and test bitmasks
+    directly; use ``.label`` for the string form in logs and JSON.
+    """
     # Research tasks
-    PAPER_REVIEW = "paper_review"
-    CODE_GENERATION = "code_generation"
-    LITERATURE_SEARCH = "literature_search"
-    DATA_ANALYSIS = "data_analysis"
+    PAPER_REVIEW = 0
+    CODE_GENERATION = 1
+    LITERATURE_SEARCH = 2
+    DATA_ANALYSIS = 3
     
     # Admin tasks
-    APPLICATION_REVIEW = "application_review"
-    REPORT_GENERATION = "report_generation"
-    EMAIL_DRAFT = "email_draft"
+    APPLICATION_REVIEW = 4
+    REPORT_GENERATION = 5
+    EMAIL_DRAFT = 6
     
     # Quick tasks
-    SUMMARIZATION = "summarization"
-    TRANSLATION = "translation"
-    FORMATTING = "formatting"
+    SUMMARIZATION = 7
+    TRANSLATION = 8
+    FORMATTING = 9
     
     # Complex tasks
-    RESEARCH_PLANNING = "research_planning"
-    METHODOLOGY_DESIGN = "methodology_design"
-    DEBUGGING = "debugging"
+    RESEARCH_PLANNING = 10
+    METHODOLOGY_DESIGN = 11
+    DEBUGGING = 12
+
+    @property
+    def label(self) -> str:
+        return _TASK_LABELS[self]
+
+    @classmethod
+    def from_label(cls, label: str) -> "TaskType":
+        """Parse a label such as ``"paper_review"``."""
+        return cls[label.upper()]
+
+
+class Complexity(IntEnum):
+    """Task complexity levels, ordered so they compare numerically."""
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
+    EXPERT = 3
 
+    @property
+    def label(self) -> str:
+        return _COMPLEXITY_LABELS[self]
 
-class Complexity(str, Enum):
-    """Task complexity levels."""
-    LOW = "low"
-    MEDIUM = "medium"
-    HIGH = "high"
-    EXPERT = "expert"
+    @classmethod
+    def from_label(cls, label: str) -> "Complexity":
+        """Parse a label such as ``"high"``."""
+        return cls[label.upper()]
+
+
+_TASK_LABELS: Tuple[str, ...] = tuple(t.name.lower() for t in TaskType)
+_COMPLEXITY_LABELS: Tuple[str, ...] = tuple(c.name.lower() for c in Complexity)
+
+# Tasks that get extended thinking at HIGH/EXPERT complexity
+_THINKING_TASKS_MASK = (
+    (1 << TaskType.PAPER_REVIEW)
+    | (1 << TaskType.RESEARCH_PLANNING)
+    | (1 << TaskType.METHODOLOGY_DESIGN)
+    | (1 << TaskType.APPLICATION_REVIEW)
+)
+# Tasks that are never rated below MEDIUM / above MEDIUM
+_MIN_MEDIUM_TASKS_MASK = (1 << TaskType.PAPER_REVIEW) | (1 << TaskType.METHODOLOGY_DESIGN)
+_MAX_MEDIUM_TASKS_MASK = (1 << TaskType.FORMATTING) | (1 << TaskType.TRANSLATION)
 
 
 @dataclass
@@ -164,6 +204,114 @@ LATENCY_OPTIMIZED = {
 }
 
 
+DEFAULT_MODEL = "claude-sonnet-4"
+
+# Keywords that indicate a technically complex task
+COMPLEX_KEYWORDS = (
+    "foundation model", "multimodal", "transformer",
+    "diffusion", "variational", "bayesian",
+    "methodology", "hypothesis", "statistical",
+)
+# All keywords in one pattern, matched in a single pass over the text
+_COMPLEX_KEYWORDS_RE = re.compile("|".join(map(re.escape, COMPLEX_KEYWORDS)))
+
+
+# Dense routing table: ROUTING_RULES and the cost/latency remaps encoded
+# as small-int model ids, indexed by (task, complexity) position
+_MODEL_NAMES: Tuple[str, ...] = tuple(sorted(
+    {m for rules in ROUTING_RULES.values() for m in rules.values()}
+    | set(COST_OPTIMIZED) | set(COST_OPTIMIZED.values())
+    | set(LATENCY_OPTIMIZED) | set(LATENCY_OPTIMIZED.values())
+    | {DEFAULT_MODEL}
+))
+_MODEL_IDX: Dict[str, int] = {m: i for i, m in enumerate(_MODEL_NAMES)}
+_TASK_IDX: Dict[TaskType, int] = {t: i for i, t in enumerate(TaskType)}
+_COMPLEXITY_IDX: Dict[Complexity, int] = {c: i for i, c in enumerate(Complexity)}
+
+_ROUTE_TABLE = np.full(
+    (len(TaskType), len(Complexity)), _MODEL_IDX[DEFAULT_MODEL], dtype=np.int8
+)
+for _task, _rules in ROUTING_RULES.items():
+    for _complexity, _model in _rules.items():
+        _ROUTE_TABLE[_TASK_IDX[_task], _COMPLEXITY_IDX[_complexity]] = _MODEL_IDX[_model]
+
+_COST_REMAP = np.array(
+    [_MODEL_IDX[COST_OPTIMIZED.get(m, m)] for m in _MODEL_NAMES], dtype=np.int8
+)
+_LATENCY_REMAP = np.array(
+    [_MODEL_IDX[LATENCY_OPTIMIZED.get(m, m)] for m in _MODEL_NAMES], dtype=np.int8
+)
+
+
+# Estimated cost (USD) per task, used for budget allocation
+TASK_COSTS: Dict[TaskType, float] = {
+    TaskType.PAPER_REVIEW: 0.50,
+    TaskType.CODE_GENERATION: 0.30,
+    TaskType.LITERATURE_SEARCH: 0.20,
+    TaskType.DATA_ANALYSIS: 0.25,
+    TaskType.APPLICATION_REVIEW: 0.40,
+    TaskType.REPORT_GENERATION: 0.15,
+    TaskType.EMAIL_DRAFT: 0.05,
+    TaskType.SUMMARIZATION: 0.05,
+    TaskType.TRANSLATION: 0.05,
+    TaskType.FORMATTING: 0.02,
+    TaskType.RESEARCH_PLANNING: 0.60,
+    TaskType.METHODOLOGY_DESIGN: 0.50,
+    TaskType.DEBUGGING: 0.20,
+}
+# Same costs aligned to _TASK_IDX (0.10 for unlisted task types)
+_TASK_COST_VEC = np.array([TASK_COSTS.get(t, 0.10) for t in TaskType], dtype=np.float64)
+
+
+# Models tried, in order, after the preferred one fails
+FALLBACK_CHAIN = ["claude-sonnet-4", "gpt-4o", "deepseek-r1"]
+
+
+# (model_key, enable_thinking, thinking_budget)
+RouteDecision = Tuple[str, bool, int]
+
+
+def _route_decision(
+    task_type: TaskType,
+    complexity: Complexity,
+    cost_optimized: bool,
+    latency_sensitive: bool,
+) -> RouteDecision:
+    """Routing decision for one (task, complexity, flags) combination."""
+    # Get base model from the routing table
+    model_id = _ROUTE_TABLE[_TASK_IDX[task_type], _COMPLEXITY_IDX[complexity]]
+    
+    # Determine if thinking is needed
+    enable_thinking = (
+        complexity >= Complexity.HIGH
+        and bool(_THINKING_TASKS_MASK & (1 << task_type))
+    )
+    
+    # Set thinking budget based on complexity
+    thinking_budget = 0
+    if enable_thinking:
+        thinking_budgets = {
+            Complexity.HIGH: 8000,
+            Complexity.EXPERT: 16000,
+        }
+        thinking_budget = thinking_budgets.get(complexity, 8000)
+    
+    # Apply cost optimization
+    if cost_optimized:
+        model_id = _COST_REMAP[model_id]
+        # Reduce thinking budget for cost savings
+        thinking_budget = min(thinking_budget, 4000)
+    
+    # Apply latency optimization
+    if latency_sensitive:
+        model_id = _LATENCY_REMAP[model_id]
+        # Disable thinking for speed
+        enable_thinking = False
+        thinking_budget = 0
+    
+    return _MODEL_NAMES[model_id], bool(enable_thinking), int(thinking_budget)
+
+
 class ModelRouter:
     """
     Routes tasks to optimal models based on requirements.
@@ -182,7 +330,22 @@ class ModelRouter:
     ):
         self.budget_threshold = budget_threshold_usd
         self.enable_cost_optimization = enable_cost_optimization
-        self.routing_stats: Dict[str, int] = {}
+        self.routing_stats: Counter = Counter()
+        
+        # Every route() decision is a pure function of (task, complexity,
+        # flags), so each flag combination gets a fully precomputed table.
+        # Built from enable_cost_optimization at construction time.
+        self._route_tables: Dict[Tuple[bool, bool], Tuple[Tuple[RouteDecision, ...], ...]] = {
+            (cost, latency): tuple(
+                tuple(
+                    _route_decision(t, c, cost and enable_cost_optimization, latency)
+                    for c in Complexity
+                )
+                for t in TaskType
+            )
+            for cost in (False, True)
+            for latency in (False, True)
+        }
     
     def route(
         self,
@@ -205,53 +368,131 @@ class ModelRouter:
         Returns:
             Tuple of (model_key, enable_thinking, thinking_budget)
         """
-        # Get base model from rules
-        model = ROUTING_RULES.get(task_type, {}).get(
-            complexity, "claude-sonnet-4"
-        )
+        model, enable_thinking, thinking_budget = self._route_tables[
+            bool(cost_sensitive), bool(latency_sensitive)
+        ][task_type][complexity]
         
-        # Determine if thinking is needed
-        enable_thinking = (
-            complexity in [Complexity.HIGH, Complexity.EXPERT] and
-            task_type in [
-                TaskType.PAPER_REVIEW,
-                TaskType.RESEARCH_PLANNING,
-                TaskType.METHODOLOGY_DESIGN,
-                TaskType.APPLICATION_REVIEW,
-            ]
-        )
+        # Track routing
+        self.routing_stats[model] += 1
         
-        # Set thinking budget based on complexity
-        thinking_budget = 0
-        if enable_thinking:
-            thinking_budgets = {
-                Complexity.HIGH: 8000,
-                Complexity.EXPERT: 16000,
-            }
-            thinking_budget = thinking_budgets.get(complexity, 8000)
+        # Deferred formatting: skipped entirely when DEBUG is filtered out
+        logger.debug(
+            "Routed {}/{} -> {} (thinking={}, budget={})",
+            task_type.label, complexity.label, model, enable_thinking, thinking_budget,
+        )
         
-        # Apply cost optimization
+        return model, enable_thinking, thinking_budget
+    
+    def _route_ids(
+        self,
+        task_idx: np.ndarray,
+        complexity_idx: np.ndarray,
+        cost_sensitive: bool = False,
+        latency_sensitive: bool = False,
+    ) -> np.ndarray:
+        """Model ids for arrays of task/complexity table positions."""
+        model_ids = _ROUTE_TABLE[task_idx, complexity_idx]
         if cost_sensitive and self.enable_cost_optimization:
-            model = COST_OPTIMIZED.get(model, model)
-            # Reduce thinking budget for cost savings
-            thinking_budget = min(thinking_budget, 4000)
-        
-        # Apply latency optimization
+            model_ids = _COST_REMAP[model_ids]
         if latency_sensitive:
-            model = LATENCY_OPTIMIZED.get(model, model)
-            # Disable thinking for speed
-            enable_thinking = False
-            thinking_budget = 0
+            model_ids = _LATENCY_REMAP[model_ids]
+        return model_ids
+    
+    def route_batch(
+        self,
+        task_types: Sequence[TaskType],
+        complexities: Sequence[Complexity],
+        cost_sensitive: bool = False,
+        latency_sensitive: bool = False,
+    ) -> List[str]:
+        """
+        Route many tasks at once with a vectorized table lookup.
         
-        # Track routing
-        self.routing_stats[model] = self.routing_stats.get(model, 0) + 1
+        Only the model is resolved (no thinking configuration), and
+        routing stats are not updated.
         
-        logger.debug(
-            f"Routed {task_type.value}/{complexity.value} -> {model} "
-            f"(thinking={enable_thinking}, budget={thinking_budget})"
+        Returns:
+            Model key per (task_type, complexity) pair
+        """
+        task_idx = np.fromiter((_TASK_IDX[t] for t in task_types), dtype=np.intp)
+        complexity_idx = np.fromiter(
+            (_COMPLEXITY_IDX[c] for c in complexities), dtype=np.intp
+        )
+        model_ids = self._route_ids(
+            task_idx, complexity_idx, cost_sensitive, latency_sensitive
         )
+        return [_MODEL_NAMES[i] for i in model_ids]
+    
+    def fallback_chain(
+        self,
+        prompt: str,
+        preferred: str,
+        complexity: Optional[Complexity] = None,
+        est_costs: Optional[Dict[str, float]] = None,
+        budget_remaining: Optional[float] = None,
+        unavailable: Collection[str] = (),
+        latency: Optional[Dict[str, float]] = None,
+    ) -> List[str]:
+        """
+        Ordered list of models to try for a prompt.
         
-        return model, enable_thinking, thinking_budget
+        Starts with the preferred model (or its cheaper alternative for
+        simple prompts when cost optimization is enabled), followed by
+        FALLBACK_CHAIN ordered by observed latency.
+        
+        Args:
+            prompt: Prompt to route
+            preferred: Requested model key
+            complexity: Task complexity; estimated from length if omitted
+            est_costs: Worst-case cost per model key for this call
+            budget_remaining: Remaining budget; pricier models are dropped
+            unavailable: Model keys to skip (unconfigured or unhealthy)
+            latency: Recent latency per model key, in seconds
+            
+        Returns:
+            Model keys to try in order (never empty)
+        """
+        complexity = complexity or self._length_complexity(prompt)
+        
+        primary = [preferred]
+        if complexity == Complexity.LOW and self.enable_cost_optimization:
+            primary.insert(0, COST_OPTIMIZED.get(preferred, preferred))
+        
+        fallbacks = list(FALLBACK_CHAIN)
+        if latency:
+            fallbacks.sort(key=lambda m: latency.get(m, float("inf")))
+        
+        chain = []
+        for model in primary + fallbacks:
+            if model in chain or model in unavailable:
+                continue
+            if (
+                est_costs is not None and budget_remaining is not None
+                and est_costs.get(model, 0.0) > budget_remaining
+            ):
+                continue
+            chain.append(model)
+        
+        # Nothing left: try the preferred model so its error surfaces
+        chain = chain or [preferred]
+        
+        self.routing_stats[chain[0]] += 1
+        logger.debug("Fallback chain for {}/{}: {}", preferred, complexity.label, chain)
+        
+        return chain
+    
+    @staticmethod
+    def _length_complexity(content: str) -> Complexity:
+        """Complexity from content length alone."""
+        word_count = len(content.split())
+        
+        if word_count < 500:
+            return Complexity.LOW
+        elif word_count < 2000:
+            return Complexity.MEDIUM
+        elif word_count < 5000:
+            return Complexity.HIGH
+        return Complexity.EXPERT
     
     def estimate_complexity(
         self,
@@ -264,48 +505,31 @@ class ModelRouter:
         Uses heuristics based on content length, structure, and keywords.
         """
         # Length-based estimation
-        word_count = len(content.split())
-        
-        if word_count < 500:
-            base_complexity = Complexity.LOW
-        elif word_count < 2000:
-            base_complexity = Complexity.MEDIUM
-        elif word_count < 5000:
-            base_complexity = Complexity.HIGH
-        else:
-            base_complexity = Complexity.EXPERT
+        base_complexity = self._length_complexity(content)
         
         # Task-specific adjustments
-        if task_type in [TaskType.PAPER_REVIEW, TaskType.METHODOLOGY_DESIGN]:
+        task_bit = 1 << task_type
+        if _MIN_MEDIUM_TASKS_MASK & task_bit:
             # Always at least medium for these tasks
-            if base_complexity == Complexity.LOW:
+            if base_complexity is Complexity.LOW:
                 base_complexity = Complexity.MEDIUM
         
-        if task_type in [TaskType.FORMATTING, TaskType.TRANSLATION]:
+        if _MAX_MEDIUM_TASKS_MASK & task_bit:
             # Cap at medium for these tasks
-            if base_complexity in [Complexity.HIGH, Complexity.EXPERT]:
+            if base_complexity >= Complexity.HIGH:
                 base_complexity = Complexity.MEDIUM
         
-        # Keyword-based adjustments
-        complex_keywords = [
-            "foundation model", "multimodal", "transformer",
-            "diffusion", "variational", "bayesian",
-            "methodology", "hypothesis", "statistical"
-        ]
-        
-        content_lower = content.lower()
-        keyword_count = sum(
-            1 for kw in complex_keywords if kw in content_lower
-        )
+        # Keyword-based adjustments (number of distinct keywords present)
+        found = set()
+        for match in _COMPLEX_KEYWORDS_RE.finditer(content.lower()):
+            found.add(match.group())
+            if len(found) >= 5:
+                break
+        keyword_count = len(found)
         
-        if keyword_count >= 5 and base_complexity != Complexity.EXPERT:
+        if keyword_count >= 5 and base_complexity is not Complexity.EXPERT:
             # Bump up complexity
-            complexity_order = [
-                Complexity.LOW, Complexity.MEDIUM,
-                Complexity.HIGH, Complexity.EXPERT
-            ]
-            idx = complexity_order.index(base_complexity)
-            base_complexity = complexity_order[min(idx + 1, 3)]
+            base_complexity = Complexity(base_complexity + 1)
         
         return base_complexity
     
@@ -328,38 +552,28 @@ class ModelRouter:
         Returns:
             Suggested budget per model
         """
-        # Estimate costs per task type
-        task_costs = {
-            TaskType.PAPER_REVIEW: 0.50,
-            TaskType.CODE_GENERATION: 0.30,
-            TaskType.LITERATURE_SEARCH: 0.20,
-            TaskType.DATA_ANALYSIS: 0.25,
-            TaskType.APPLICATION_REVIEW: 0.40,
-            TaskType.REPORT_GENERATION: 0.15,
-            TaskType.EMAIL_DRAFT: 0.05,
-            TaskType.SUMMARIZATION: 0.05,
-            TaskType.TRANSLATION: 0.05,
-            TaskType.FORMATTING: 0.02,
-            TaskType.RESEARCH_PLANNING: 0.60,
-            TaskType.METHODOLOGY_DESIGN: 0.50,
-            TaskType.DEBUGGING: 0.20,
-        }
+        if not expected_tasks:
+            return {}
         
-        total_estimated = sum(
-            task_costs.get(task, 0.10) * count
-            for task, count in expected_tasks.items()
+        n = len(expected_tasks)
+        task_idx = np.fromiter(
+            (_TASK_IDX[t] for t in expected_tasks), dtype=np.intp, count=n
         )
+        counts = np.fromiter(expected_tasks.values(), dtype=np.float64, count=n)
         
-        # Scale to budget
+        # Scale estimated costs to the budget
+        task_cost = _TASK_COST_VEC[task_idx] * counts
+        total_estimated = task_cost.sum()
         scale_factor = monthly_budget_usd / total_estimated if total_estimated > 0 else 1.0
         
-        allocation = {}
-        for task, count in expected_tasks.items():
-            cost = task_costs.get(task, 0.10) * count * scale_factor
-            model, _, _ = self.route(task, Complexity.MEDIUM)
-            allocation[model] = allocation.get(model, 0) + cost
+        # Route every task at medium complexity and sum cost per model
+        model_ids = self._route_ids(
+            task_idx, np.full(n, _COMPLEXITY_IDX[Complexity.MEDIUM], dtype=np.intp)
+        )
+        allocation = np.zeros(len(_MODEL_NAMES), dtype=np.float64)
+        np.add.at(allocation, model_ids, task_cost * scale_factor)
         
-        return allocation
+        return {_MODEL_NAMES[i]: float(allocation[i]) for i in np.unique(model_ids)}
 
 
 
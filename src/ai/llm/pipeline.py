@@ -0,0 +1,143 @@
+"""
+LLM Pipelines
+=============
+
+Submit a workflow of dependent LLM calls as a single DAG.
+
+Each step is a prompt template whose placeholders are filled with the
+outputs of earlier steps. Steps start as soon as their dependencies
+resolve, so independent branches run concurrently instead of being
+serialized by the caller.
+
+Example:
+    pipeline = Pipeline(client)
+    summary = pipeline.add("summary", "Summarize:\\n{paper}",
+                           template_vars={"paper": text})
+    critique = pipeline.add("critique", "Critique this summary:\\n{summary}",
+                            deps=["summary"])
+    results = await pipeline.run()
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Any
+
+from loguru import logger
+
+from .client import MultiModelClient
+
+
+class SemanticVariable:
+    """Awaitable placeholder for the output of a pipeline step."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._done = asyncio.Event()
+        self._result: Optional[Dict[str, Any]] = None
+        self._error: Optional[BaseException] = None
+
+    def _set_result(self, result: Dict[str, Any]) -> None:
+        self._result = result
+        self._done.set()
+
+    def _set_error(self, error: BaseException) -> None:
+        self._error = error
+        self._done.set()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    async def get(self) -> Dict[str, Any]:
+        """Wait for the step and return its generate() result."""
+        await self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def __await__(self):
+        return self.get().__await__()
+
+
+class Pipeline:
+    """DAG of dependent generate() calls resolved concurrently."""
+
+    def __init__(self, client: MultiModelClient):
+        self.client = client
+        self._steps: Dict[str, Dict[str, Any]] = {}
+        self._vars: Dict[str, SemanticVariable] = {}
+
+    def add(
+        self,
+        name: str,
+        prompt_template: str,
+        deps: Optional[List[str]] = None,
+        model: Optional[str] = None,
+        template_vars: Optional[Dict[str, Any]] = None,
+        **generate_kwargs: Any,
+    ) -> SemanticVariable:
+        """
+        Add a step to the pipeline.
+
+        Args:
+            name: Step name, usable as a placeholder in later templates
+            prompt_template: str.format template; each dependency's
+                output is available as {dep_name}
+            deps: Names of earlier steps whose output this step needs
+            model: Model key for this step
+            template_vars: Extra static values for the template
+            **generate_kwargs: Passed through to generate()
+
+        Returns:
+            SemanticVariable resolving to this step's result
+        """
+        if name in self._steps:
+            raise ValueError(f"Duplicate pipeline step: {name}")
+        deps = deps or []
+        for dep in deps:
+            if dep not in self._steps:
+                raise ValueError(f"Unknown dependency '{dep}' for step '{name}'")
+
+        self._steps[name] = {
+            "template": prompt_template,
+            "deps": deps,
+            "model": model,
+            "template_vars": template_vars or {},
+            "kwargs": generate_kwargs,
+        }
+        self._vars[name] = SemanticVariable(name)
+        return self._vars[name]
+
+    async def _run_step(self, name: str) -> None:
+        step = self._steps[name]
+        var = self._vars[name]
+        try:
+            dep_outputs = {
+                dep: (await self._vars[dep])["content"] for dep in step["deps"]
+            }
+            prompt = step["template"].format(**step["template_vars"], **dep_outputs)
+            result = await self.client.generate(
+                prompt=prompt, model=step["model"], **step["kwargs"]
+            )
+            var._set_result(result)
+        except BaseException as e:
+            var._set_error(e)
+            raise
+
+    async def run(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Run all steps, each as soon as its dependencies complete.
+
+        Returns:
+            Dict mapping step name to its generate() result
+        """
+        tasks = [asyncio.create_task(self._run_step(name)) for name in self._steps]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        logger.debug(f"Pipeline completed: {len(tasks)} steps")
+        return {name: self._vars[name]._result for name in self._steps}
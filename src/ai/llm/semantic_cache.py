@@ -0,0 +1,187 @@
+"""
+Semantic Response Cache
+=======================
+
+Embedding-based cache that serves near-duplicate prompts
+(paraphrases) from previously generated responses.
+
+Prompts are embedded with a local sentence-transformers model and
+matched by cosine similarity against a FAISS inner-product index.
+The similarity threshold adapts to user feedback on cache hits.
+"""
+
+import uuid
+import asyncio
+from collections import OrderedDict, deque
+from typing import Dict, Hashable, List, Optional, Any
+
+import numpy as np
+from loguru import logger
+
+# Lazy imports for optional dependencies
+faiss = None
+sentence_transformers = None
+
+
+def get_faiss():
+    global faiss
+    if faiss is None:
+        import faiss as _faiss
+        faiss = _faiss
+    return faiss
+
+
+def get_sentence_transformers():
+    global sentence_transformers
+    if sentence_transformers is None:
+        import sentence_transformers as _sentence_transformers
+        sentence_transformers = _sentence_transformers
+    return sentence_transformers
+
+
+class SemanticCache:
+    """
+    Cosine-similarity cache over prompt embeddings.
+
+    Entries are partitioned by namespace (the caller's model, system
+    prompt and sampling settings) so a hit is only ever served for the
+    same combination. Each namespace keeps at most
+    ``max_entries_per_namespace`` entries (oldest evicted first), and at
+    most ``max_namespaces`` namespaces are kept (least recently used
+    evicted first). Only the ``max_pending_hits`` most recent hits can
+    still receive feedback.
+
+    The threshold controller raises the threshold when the rated hit
+    quality falls below ``target_quality`` and lowers it when quality
+    is above target, within ``[min_threshold, max_threshold]``.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+        target_quality: float = 0.95,
+        threshold_step: float = 0.005,
+        min_threshold: float = 0.80,
+        max_threshold: float = 0.99,
+        feedback_window: int = 100,
+        min_feedback: int = 10,
+        max_entries_per_namespace: int = 10_000,
+        max_namespaces: int = 256,
+        max_pending_hits: int = 1024,
+    ):
+        self.threshold = threshold
+        self.embedding_model = embedding_model
+        self.target_quality = target_quality
+        self.threshold_step = threshold_step
+        self.min_threshold = min_threshold
+        self.max_threshold = max_threshold
+        self.min_feedback = min_feedback
+        self.max_entries_per_namespace = max_entries_per_namespace
+        self.max_namespaces = max_namespaces
+        self.max_pending_hits = max_pending_hits
+
+        self.stats = {"hits": 0, "misses": 0}
+        self._encoder = None
+        # Per-namespace FAISS index and responses by index position, LRU order
+        self._indexes: Dict[Hashable, Any] = OrderedDict()
+        self._responses: Dict[Hashable, List[Dict[str, Any]]] = OrderedDict()
+        self._pending_hits: Dict[str, float] = OrderedDict()
+        self._feedback: deque = deque(maxlen=feedback_window)
+
+    def _get_encoder(self):
+        if self._encoder is None:
+            st = get_sentence_transformers()
+            self._encoder = st.SentenceTransformer(self.embedding_model)
+        return self._encoder
+
+    async def embed(self, text: str) -> np.ndarray:
+        """Embed text as a normalized (1, dim) float32 vector."""
+        encoder = self._get_encoder()
+        vec = await asyncio.to_thread(
+            encoder.encode, [text], normalize_embeddings=True
+        )
+        return np.asarray(vec, dtype=np.float32)
+
+    def search(
+        self,
+        namespace: Hashable,
+        vec: np.ndarray,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached response closest to ``vec`` if it clears the threshold.
+
+        The returned dict carries a ``cache_hit_id`` that can be passed to
+        ``record_feedback``.
+        """
+        index = self._indexes.get(namespace)
+        if index is None or index.ntotal == 0:
+            self.stats["misses"] += 1
+            return None
+        self._indexes.move_to_end(namespace)
+        self._responses.move_to_end(namespace)
+
+        scores, ids = index.search(vec, 1)
+        score = float(scores[0, 0])
+        if score < self.threshold:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        hit_id = uuid.uuid4().hex
+        self._pending_hits[hit_id] = score
+        if len(self._pending_hits) > self.max_pending_hits:
+            self._pending_hits.popitem(last=False)
+        response = self._responses[namespace][int(ids[0, 0])]
+        return {**response, "cache_hit_id": hit_id, "similarity": score}
+
+    def add(
+        self,
+        namespace: Hashable,
+        vec: np.ndarray,
+        response: Dict[str, Any],
+    ) -> None:
+        """Insert a response under its prompt embedding."""
+        index = self._indexes.get(namespace)
+        if index is None:
+            index = get_faiss().IndexFlatIP(vec.shape[1])
+            self._indexes[namespace] = index
+            self._responses[namespace] = []
+            while len(self._indexes) > self.max_namespaces:
+                evicted, _ = self._indexes.popitem(last=False)
+                del self._responses[evicted]
+        else:
+            self._indexes.move_to_end(namespace)
+            self._responses.move_to_end(namespace)
+
+        responses = self._responses[namespace]
+        if index.ntotal >= self.max_entries_per_namespace:
+            # Drop the oldest tenth at once; a flat index renumbers the
+            # remaining vectors, so positions stay aligned with responses
+            n_drop = max(1, self.max_entries_per_namespace // 10)
+            index.remove_ids(np.arange(n_drop, dtype=np.int64))
+            del responses[:n_drop]
+        index.add(vec)
+        responses.append(response)
+
+    def record_feedback(self, hit_id: str, good: bool) -> None:
+        """Rate a served hit and adapt the similarity threshold."""
+        if self._pending_hits.pop(hit_id, None) is None:
+            logger.warning(f"Unknown semantic cache hit: {hit_id}")
+            return
+
+        self._feedback.append(good)
+        if len(self._feedback) < self.min_feedback:
+            return
+
+        quality = sum(self._feedback) / len(self._feedback)
+        if quality < self.target_quality:
+            self.threshold = min(self.threshold + self.threshold_step, self.max_threshold)
+        elif quality > self.target_quality:
+            self.threshold = max(self.threshold - self.threshold_step, self.min_threshold)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._indexes.clear()
+        self._responses.clear()
+        self._pending_hits.clear()
@@ -0,0 +1,92 @@
+"""
+Token Budgeting
+===============
+
+Local token counting and truncation for prompt content, so oversized
+inputs can be trimmed before they are sent to a provider.
+
+Counts use tiktoken's GPT-4o encoding when it is installed and fall
+back to a ~4 characters/token estimate otherwise. Either way they are
+an approximation for non-OpenAI models.
+"""
+
+from collections import OrderedDict
+
+import xxhash
+
+# Lazy import for optional tokenizer
+tiktoken = None
+
+_ENCODING = None
+_CHARS_PER_TOKEN = 4
+
+# Token counts keyed by text digest
+_COUNT_CACHE: "OrderedDict[bytes, int]" = OrderedDict()
+_COUNT_CACHE_SIZE = 1024
+
+
+def get_tiktoken():
+    global tiktoken
+    if tiktoken is None:
+        import tiktoken as _tiktoken
+        tiktoken = _tiktoken
+    return tiktoken
+
+
+def _get_encoding():
+    """GPT-4o encoding, or None if tiktoken is unavailable."""
+    global _ENCODING
+    if _ENCODING is None:
+        try:
+            _ENCODING = get_tiktoken().encoding_for_model("gpt-4o")
+        except ImportError:
+            _ENCODING = False
+    return _ENCODING or None
+
+
+def count_tokens(text: str) -> int:
+    """Approximate token count of ``text``, memoized per text."""
+    key = xxhash.xxh3_128_digest(text.encode())
+    count = _COUNT_CACHE.get(key)
+    if count is not None:
+        _COUNT_CACHE.move_to_end(key)
+        return count
+
+    encoding = _get_encoding()
+    if encoding is not None:
+        count = len(encoding.encode(text, disallowed_special=()))
+    else:
+        count = len(text) // _CHARS_PER_TOKEN
+
+    _COUNT_CACHE[key] = count
+    if len(_COUNT_CACHE) > _COUNT_CACHE_SIZE:
+        _COUNT_CACHE.popitem(last=False)
+    return count
+
+
+def truncate_middle(text: str, max_tokens: int) -> str:
+    """
+    Fit ``text`` into ``max_tokens`` by keeping its head and tail.
+
+    The omitted middle is replaced by a marker stating how many tokens
+    were dropped. Text that already fits is returned unchanged.
+    """
+    total = count_tokens(text)
+    if total <= max_tokens:
+        return text
+
+    head = max_tokens * 2 // 3
+    tail = max_tokens - head
+    marker = f"\n\n[... {total - max_tokens} tokens omitted ...]\n\n"
+
+    encoding = _get_encoding()
+    if encoding is not None:
+        ids = encoding.encode(text, disallowed_special=())
+        return (
+            encoding.decode(ids[:head]) + marker
+            + (encoding.decode(ids[-tail:]) if tail else "")
+        )
+
+    head_chars = head * _CHARS_PER_TOKEN
+    tail_chars = tail * _CHARS_PER_TOKEN
+    return text[:head_chars] + marker + (text[-tail_chars:] if tail_chars else "")
@@ -0,0 +1,180 @@
+"""
+SQLite Fellow Store
+===================
+
+Single-file SQLite storage for Fellow records.
+
+Each fellow is one row holding its serialized model plus indexed
+status/cohort/department columns, so filtered listings read only the
+matching rows and updates rewrite one row instead of a whole file.
+The database runs in WAL mode so readers never block the writer.
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from loguru import logger
+
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+from .models import Fellow
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fellows (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    cohort INTEGER NOT NULL,
+    department TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_fellows_status ON fellows(status);
+CREATE INDEX IF NOT EXISTS idx_fellows_cohort ON fellows(cohort);
+"""
+
+# Max IDs per IN (...) query
+_MAX_PARAMS = 500
+
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, ensure_ascii=False, default=str).encode('utf-8')
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FellowStore:
+    """
+    Fellow records in a WAL-mode SQLite database.
+
+    Records are returned as plain dicts (``Fellow.model_dump(mode='json')``
+    output); the caller decides when to validate them into models. The
+    connection is shared across threads behind a lock.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def _row(fellow: Fellow) -> tuple:
+        return (
+            fellow.id,
+            fellow.status.value,
+            fellow.cohort,
+            fellow.application.department.value,
+            _dumps(fellow.model_dump(mode='json')),
+        )
+
+    def put(self, fellow: Fellow) -> None:
+        """Insert or replace one fellow."""
+        self.put_many([fellow])
+
+    def put_many(self, fellows: Iterable[Fellow]) -> None:
+        """Insert or replace fellows in a single transaction."""
+        rows = [self._row(f) for f in fellows]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO fellows (id, status, cohort, department, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def get(self, fellow_id: str) -> Optional[Dict[str, Any]]:
+        """Serialized fellow by ID, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM fellows WHERE id = ?", (fellow_id,)
+            ).fetchone()
+        return _loads(row[0]) if row is not None else None
+
+    def get_many(self, fellow_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Serialized fellows by ID; IDs not in the store are omitted."""
+        fellow_ids = list(fellow_ids)
+        rows = []
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(fellow_ids), _MAX_PARAMS):
+                chunk = fellow_ids[start:start + _MAX_PARAMS]
+                placeholders = ", ".join("?" * len(chunk))
+                rows.extend(self._conn.execute(
+                    f"SELECT id, data FROM fellows WHERE id IN ({placeholders})", chunk
+                ).fetchall())
+        return {fellow_id: _loads(data) for fellow_id, data in rows}
+
+    def ids(self, status: Optional[str] = None) -> List[str]:
+        """Fellow IDs, optionally only those with ``status``."""
+        with self._lock:
+            if status is None:
+                rows = self._conn.execute("SELECT id FROM fellows ORDER BY id")
+            else:
+                rows = self._conn.execute(
+                    "SELECT id FROM fellows WHERE status = ? ORDER BY id", (status,)
+                )
+            return [r[0] for r in rows.fetchall()]
+
+    def iter(self, status: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Serialized fellows, optionally only those with ``status``."""
+        with self._lock:
+            if status is None:
+                rows = self._conn.execute("SELECT data FROM fellows ORDER BY id")
+            else:
+                rows = self._conn.execute(
+                    "SELECT data FROM fellows WHERE status = ? ORDER BY id", (status,)
+                )
+            rows = rows.fetchall()
+        for (data,) in rows:
+            yield _loads(data)
+
+    def cohort_counts(self) -> Dict[int, int]:
+        """Number of fellows per cohort."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT cohort, COUNT(*) FROM fellows GROUP BY cohort"
+            ).fetchall()
+        return dict(rows)
+
+    def delete(self, fellow_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM fellows WHERE id = ?", (fellow_id,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM fellows").fetchone()[0]
+
+    def import_json_dir(self, fellows_dir: Path) -> int:
+        """
+        Import ``*.json`` fellow files (the previous storage format).
+
+        Files that fail to validate are logged and skipped.
+
+        Returns:
+            Number of fellows imported
+        """
+        fellows = []
+        for file_path in sorted(fellows_dir.glob("*.json")):
+            try:
+                fellows.append(Fellow(**_loads(file_path.read_bytes())))
+            except Exception as e:
+                logger.error(f"Failed to import fellow from {file_path}: {e}")
+        self.put_many(fellows)
+        return len(fellows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -6,19 +6,178 @@ Manages Fellow lifecycle including applications, evaluations,
 and progress tracking.
 """
 
+import os
 import json
+import atexit
+import threading
+import weakref
+from functools import partial
+from collections import Counter, OrderedDict
+from collections.abc import MutableMapping
 from datetime import date, datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Iterable, Iterator, Tuple, NamedTuple
+import numpy as np
 from loguru import logger
 
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
 from .models import Fellow, FellowApplication, FellowEvaluation, FellowStatus
+from ._store_sqlite import FellowStore
+
+
+def _flush_at_exit(ref: "weakref.ref[FellowManager]") -> None:
+    """Flush a manager at interpreter exit if it is still alive."""
+    manager = ref()
+    if manager is not None:
+        manager.flush()
+
+
+def _write_json(path: Path, obj: Any) -> None:
+    """Write ``obj`` as indented UTF-8 JSON, atomically replacing ``path``."""
+    if orjson is not None:
+        data = orjson.dumps(
+            obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+        )
+    else:
+        data = json.dumps(obj, ensure_ascii=False, indent=2, default=str).encode('utf-8')
+    
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+# Recently submitted applications kept in memory for accept_fellow
+APPLICATION_CACHE_SIZE = 256
+
+
+class _StatsContribution(NamedTuple):
+    """What one fellow adds to the program statistics."""
+    active: int
+    publications: int
+    presentations: int
+    conferences: int
+    dgx: int
+    score: Optional[float]  # current score of an active, evaluated fellow
+    department: str
+    cohort: int
+    
+    @classmethod
+    def of(cls, fellow: Fellow) -> "_StatsContribution":
+        active = fellow.status == FellowStatus.ACTIVE
+        return cls(
+            active=int(active),
+            publications=len(fellow.publications),
+            presentations=len(fellow.presentations),
+            conferences=len(fellow.conferences_attended),
+            dgx=int(fellow.dgx_spark_assigned),
+            score=(fellow.current_score or None) if active else None,
+            department=fellow.application.department.value,
+            cohort=fellow.cohort,
+        )
+
+
+class _LazyFellowDict(MutableMapping):
+    """
+    Fellow ID -> Fellow mapping that parses stored fellows on first access.
+    
+    Building the mapping only reads the ID column of the store. Records
+    that fail to validate are logged and dropped from the mapping.
+    """
+    
+    def __init__(self, store: FellowStore):
+        self._store = store
+        self._ids: Dict[str, None] = dict.fromkeys(store.ids())
+        self._loaded: Dict[str, Fellow] = {}
+    
+    def _load(self, fellow_id: str) -> Optional[Fellow]:
+        fellow = self._loaded.get(fellow_id)
+        if fellow is not None:
+            return fellow
+        if fellow_id not in self._ids:
+            return None
+        try:
+            fellow = Fellow(**self._store.get(fellow_id))
+        except Exception as e:
+            logger.error(f"Failed to load fellow {fellow_id}: {e}")
+            del self._ids[fellow_id]
+            return None
+        self._loaded[fellow_id] = fellow
+        return fellow
+    
+    def __getitem__(self, fellow_id: str) -> Fellow:
+        fellow = self._load(fellow_id)
+        if fellow is None:
+            raise KeyError(fellow_id)
+        return fellow
+    
+    def __setitem__(self, fellow_id: str, fellow: Fellow) -> None:
+        self._ids[fellow_id] = None
+        self._loaded[fellow_id] = fellow
+    
+    def __delitem__(self, fellow_id: str) -> None:
+        del self._ids[fellow_id]
+        self._loaded.pop(fellow_id, None)
+    
+    def __contains__(self, fellow_id: object) -> bool:
+        return fellow_id in self._ids
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._ids))
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def _load_many(self, fellow_ids: List[str]) -> None:
+        """Load all not-yet-parsed fellows among ``fellow_ids`` in one query."""
+        missing = [i for i in fellow_ids if i not in self._loaded and i in self._ids]
+        if len(missing) < 2:
+            return
+        records = self._store.get_many(missing)
+        for fellow_id in missing:
+            try:
+                self._loaded[fellow_id] = Fellow(**records[fellow_id])
+            except Exception as e:
+                logger.error(f"Failed to load fellow {fellow_id}: {e}")
+                del self._ids[fellow_id]
+    
+    def values(self) -> List[Fellow]:
+        """All fellows, parsing any not loaded yet."""
+        return self.select(list(self._ids))
+    
+    def items(self) -> List[Tuple[str, Fellow]]:
+        return [(f.id, f) for f in self.values()]
+    
+    def select(self, fellow_ids: Iterable[str]) -> List[Fellow]:
+        """Fellows for the given IDs, parsing only those not loaded yet."""
+        fellow_ids = list(fellow_ids)
+        self._load_many(fellow_ids)
+        return [f for f in map(self._load, fellow_ids) if f is not None]
+    
+    def loaded(self) -> List[Fellow]:
+        """Fellows parsed so far, without touching disk."""
+        return list(self._loaded.values())
 
 
 class FellowManager:
-    """Manages Fellows in the program."""
+    """
+    Manages Fellows in the program.
+    
+    Fellows are stored in a SQLite database (``data_dir/fellows.db``);
+    per-fellow JSON files from older versions are imported on first use.
+    Applications and reviews remain JSON files.
+    
+    Updates to existing fellows are written back lazily: each mutation
+    marks the fellow dirty and a timer writes all dirty fellows once
+    ``write_delay`` seconds after the last change. Call ``flush()`` (or
+    ``close()``) to persist immediately; pending writes are also flushed
+    at interpreter exit.
+    """
     
-    def __init__(self, data_dir: Path = Path("data")):
+    def __init__(self, data_dir: Path = Path("data"), write_delay: float = 0.5):
         self.data_dir = data_dir
         self.fellows_dir = data_dir / "fellows"
         self.applications_dir = data_dir / "applications"
@@ -27,27 +186,90 @@ class FellowManager:
         self.fellows_dir.mkdir(parents=True, exist_ok=True)
         self.applications_dir.mkdir(parents=True, exist_ok=True)
         
-        # Load existing fellows
-        self.fellows: Dict[str, Fellow] = {}
-        self._load_fellows()
+        # Validated applications by ID, most recently used last
+        self._applications: "OrderedDict[str, FellowApplication]" = OrderedDict()
+        
+        # Fellow storage, migrating legacy JSON files once
+        self.store = FellowStore(data_dir / "fellows.db")
+        if len(self.store) == 0 and any(self.fellows_dir.glob("*.json")):
+            imported = self.store.import_json_dir(self.fellows_dir)
+            logger.info(f"Imported {imported} fellows from {self.fellows_dir}")
+        
+        # Existing fellows, parsed on first access
+        self.fellows = _LazyFellowDict(self.store)
+        
+        # Fellows per cohort, for sequential fellow IDs
+        self._cohort_counts: Counter = Counter(self.store.cohort_counts())
+        
+        # Running program statistics, built on first request and then
+        # updated per mutation from each fellow's last contribution
+        self._stats: Optional[Dict[str, Any]] = None
+        self._contributions: Dict[str, _StatsContribution] = {}
+        
+        # Debounced write-back of modified fellows
+        self.write_delay = write_delay
+        self._dirty: Set[str] = set()
+        self._write_lock = threading.Lock()
+        self._write_timer: Optional[threading.Timer] = None
+        # Weakly referenced so unclosed managers can still be collected
+        self._exit_hook = partial(_flush_at_exit, weakref.ref(self))
+        atexit.register(self._exit_hook)
         
-    def _load_fellows(self) -> None:
-        """Load all fellows from disk."""
-        for file_path in self.fellows_dir.glob("*.json"):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    fellow = Fellow(**data)
-                    self.fellows[fellow.id] = fellow
-            except Exception as e:
-                logger.error(f"Failed to load fellow from {file_path}: {e}")
-    
     def _save_fellow(self, fellow: Fellow) -> None:
-        """Save a fellow to disk."""
-        file_path = self.fellows_dir / f"{fellow.id}.json"
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(fellow.model_dump(mode='json'), f, ensure_ascii=False, indent=2, default=str)
-        logger.info(f"Saved fellow {fellow.id} to {file_path}")
+        """Save a fellow to the store."""
+        self.store.put(fellow)
+        logger.info(f"Saved fellow {fellow.id}")
+    
+    def _apply_contribution(self, c: _StatsContribution, sign: int) -> None:
+        stats = self._stats
+        stats["total_fellows"] += sign
+        stats["active_fellows"] += sign * c.active
+        stats["total_publications"] += sign * c.publications
+        stats["total_presentations"] += sign * c.presentations
+        stats["total_conferences"] += sign * c.conferences
+        stats["fellows_with_dgx"] += sign * c.dgx
+        if c.score is not None:
+            stats["score_sum"] += sign * c.score
+            stats["score_count"] += sign
+        stats["by_department"][c.department] += sign
+        stats["by_cohort"][c.cohort] += sign
+    
+    def _update_stats(self, fellow: Fellow) -> None:
+        """Replace a fellow's contribution to the running statistics."""
+        if self._stats is None:
+            return
+        old = self._contributions.get(fellow.id)
+        if old is not None:
+            self._apply_contribution(old, -1)
+        new = self._contributions[fellow.id] = _StatsContribution.of(fellow)
+        self._apply_contribution(new, 1)
+    
+    def _mark_dirty(self, fellow_id: str) -> None:
+        """Schedule a fellow for write-back, restarting the debounce timer."""
+        with self._write_lock:
+            self._dirty.add(fellow_id)
+            if self._write_timer is not None:
+                self._write_timer.cancel()
+            self._write_timer = threading.Timer(self.write_delay, self.flush)
+            self._write_timer.daemon = True
+            self._write_timer.start()
+    
+    def flush(self) -> None:
+        """Write all modified fellows to disk now."""
+        with self._write_lock:
+            if self._write_timer is not None:
+                self._write_timer.cancel()
+                self._write_timer = None
+            dirty, self._dirty = self._dirty, set()
+            if dirty:
+                self.store.put_many(self.fellows.select(dirty))
+                logger.info(f"Saved {len(dirty)} fellows")
+    
+    def close(self) -> None:
+        """Flush pending writes, stop the exit hook and close the store."""
+        self.flush()
+        atexit.unregister(self._exit_hook)
+        self.store.close()
     
     def submit_application(self, application: FellowApplication) -> str:
         """Submit a new application."""
@@ -57,12 +279,28 @@ class FellowManager:
         
         # Save application
         file_path = self.applications_dir / f"{app_id}.json"
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(application.model_dump(mode='json'), f, ensure_ascii=False, indent=2, default=str)
+        _write_json(file_path, application.model_dump(mode='json'))
+        self._cache_application(app_id, application)
         
         logger.info(f"Application submitted: {app_id}")
         return app_id
     
+    def _cache_application(self, app_id: str, application: FellowApplication) -> None:
+        self._applications[app_id] = application
+        self._applications.move_to_end(app_id)
+        if len(self._applications) > APPLICATION_CACHE_SIZE:
+            self._applications.popitem(last=False)
+    
+    def _get_application(self, app_id: str) -> FellowApplication:
+        """Application by ID, from memory if recently used, else from disk."""
+        application = self._applications.get(app_id)
+        if application is None:
+            file_path = self.applications_dir / f"{app_id}.json"
+            # Parse and validate straight from bytes (no intermediate dict)
+            application = FellowApplication.model_validate_json(file_path.read_bytes())
+        self._cache_application(app_id, application)
+        return application
+    
     def review_application(
         self, 
         app_id: str, 
@@ -71,14 +309,11 @@ class FellowManager:
         comments: str
     ) -> Dict[str, Any]:
         """Review an application and calculate scores."""
-        # Load application
+        # Only the application's existence matters for scoring
         file_path = self.applications_dir / f"{app_id}.json"
-        if not file_path.exists():
+        if app_id not in self._applications and not file_path.exists():
             raise FileNotFoundError(f"Application not found: {app_id}")
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            app_data = json.load(f)
-        
         # Calculate total score
         weights = {
             "academic": 0.20,
@@ -106,8 +341,7 @@ class FellowManager:
         
         # Save review
         review_path = self.applications_dir / f"{app_id}_review.json"
-        with open(review_path, 'w', encoding='utf-8') as f:
-            json.dump(review, f, ensure_ascii=False, indent=2)
+        _write_json(review_path, review)
         
         return review
     
@@ -120,18 +354,14 @@ class FellowManager:
     ) -> Fellow:
         """Accept an applicant as a Fellow."""
         # Load application
-        file_path = self.applications_dir / f"{app_id}.json"
-        with open(file_path, 'r', encoding='utf-8') as f:
-            app_data = json.load(f)
-        
-        application = FellowApplication(**app_data)
+        application = self._get_application(app_id)
         
         # Generate Fellow ID
-        existing_fellows = [f for f in self.fellows.values() if f.cohort == cohort]
-        fellow_num = len(existing_fellows) + 1
+        fellow_num = self._cohort_counts[cohort] + 1
         fellow_id = f"F{cohort}-{fellow_num:03d}"
         
-        # Create Fellow
+        # Create Fellow (the validated application instance is used as-is,
+        # not re-validated)
         fellow = Fellow(
             id=fellow_id,
             application=application,
@@ -148,6 +378,8 @@ class FellowManager:
         # Save
         self.fellows[fellow_id] = fellow
         self._save_fellow(fellow)
+        self._cohort_counts[cohort] += 1
+        self._update_stats(fellow)
         
         logger.info(f"Fellow accepted: {fellow_id} ({application.name_korean})")
         return fellow
@@ -156,22 +388,25 @@ class FellowManager:
         """Activate a Fellow to start the program."""
         fellow = self.get_fellow(fellow_id)
         fellow.status = FellowStatus.ACTIVE
-        self._save_fellow(fellow)
+        self._update_stats(fellow)
+        self._mark_dirty(fellow.id)
         logger.info(f"Fellow activated: {fellow_id}")
         return fellow
     
     def get_fellow(self, fellow_id: str) -> Fellow:
         """Get a Fellow by ID."""
-        if fellow_id not in self.fellows:
+        fellow = self.fellows.get(fellow_id)
+        if fellow is None:
             raise ValueError(f"Fellow not found: {fellow_id}")
-        return self.fellows[fellow_id]
+        return fellow
     
     def get_all_fellows(self, status: Optional[FellowStatus] = None) -> List[Fellow]:
         """Get all Fellows, optionally filtered by status."""
-        fellows = list(self.fellows.values())
-        if status:
-            fellows = [f for f in fellows if f.status == status]
-        return fellows
+        if not status:
+            return self.fellows.values()
+        # Filter in the store; pending changes must be written first
+        self.flush()
+        return self.fellows.select(self.store.ids(status=FellowStatus(status).value))
     
     def add_evaluation(
         self,
@@ -181,7 +416,8 @@ class FellowManager:
         """Add an evaluation for a Fellow."""
         fellow = self.get_fellow(fellow_id)
         fellow.add_evaluation(evaluation)
-        self._save_fellow(fellow)
+        self._update_stats(fellow)
+        self._mark_dirty(fellow.id)
         
         logger.info(
             f"Evaluation added for {fellow_id}: "
@@ -201,7 +437,8 @@ class FellowManager:
         fellow.primary_mentor = primary_mentor
         if secondary_mentor:
             fellow.secondary_mentor = secondary_mentor
-        self._save_fellow(fellow)
+        self._update_stats(fellow)
+        self._mark_dirty(fellow.id)
         
         logger.info(f"Mentors assigned to {fellow_id}: {primary_mentor}, {secondary_mentor}")
         return fellow
@@ -210,7 +447,8 @@ class FellowManager:
         """Assign a DGX Spark to a Fellow."""
         fellow = self.get_fellow(fellow_id)
         fellow.dgx_spark_assigned = True
-        self._save_fellow(fellow)
+        self._update_stats(fellow)
+        self._mark_dirty(fellow.id)
         logger.info(f"DGX Spark assigned to {fellow_id}")
         return fellow
     
@@ -218,7 +456,8 @@ class FellowManager:
         """Add a publication for a Fellow."""
         fellow = self.get_fellow(fellow_id)
         fellow.publications.append(publication)
-        self._save_fellow(fellow)
+        self._update_stats(fellow)
+        self._mark_dirty(fellow.id)
         logger.info(f"Publication added for {fellow_id}: {publication}")
         return fellow
     
@@ -226,14 +465,16 @@ class FellowManager:
         """Add a presentation for a Fellow."""
         fellow = self.get_fellow(fellow_id)
         fellow.presentations.append(presentation)
-        self._save_fellow(fellow)
+        self._update_stats(fellow)
+        self._mark_dirty(fellow.id)
         return fellow
     
     def add_conference(self, fellow_id: str, conference: str) -> Fellow:
         """Add a conference attendance for a Fellow."""
         fellow = self.get_fellow(fellow_id)
         fellow.conferences_attended.append(conference)
-        self._save_fellow(fellow)
+        self._update_stats(fellow)
+        self._mark_dirty(fellow.id)
         return fellow
     
     def add_overseas_visit(
@@ -252,51 +493,62 @@ class FellowManager:
             "date": datetime.now().isoformat()
         }
         fellow.overseas_visits.append(visit)
-        self._save_fellow(fellow)
+        self._update_stats(fellow)
+        self._mark_dirty(fellow.id)
         logger.info(f"Overseas visit added for {fellow_id}: {institution}")
         return fellow
     
     def get_program_statistics(self) -> Dict[str, Any]:
-        """Get overall program statistics."""
-        all_fellows = self.get_all_fellows()
-        active_fellows = [f for f in all_fellows if f.status == FellowStatus.ACTIVE]
+        """
+        Get overall program statistics.
         
-        total_publications = sum(len(f.publications) for f in all_fellows)
-        total_presentations = sum(len(f.presentations) for f in all_fellows)
-        total_conferences = sum(len(f.conferences_attended) for f in all_fellows)
+        The first call scans all fellows; later calls return the running
+        totals maintained by the mutation methods.
+        """
+        if self._stats is None:
+            self._stats = {
+                "total_fellows": 0,
+                "active_fellows": 0,
+                "total_publications": 0,
+                "total_presentations": 0,
+                "total_conferences": 0,
+                "fellows_with_dgx": 0,
+                "score_sum": 0.0,
+                "score_count": 0,
+                "by_department": Counter(),
+                "by_cohort": Counter(),
+            }
+            for fellow in self.get_all_fellows():
+                self._update_stats(fellow)
         
+        stats = self._stats
         avg_score = 0.0
-        scores = [f.current_score for f in active_fellows if f.current_score]
-        if scores:
-            avg_score = sum(scores) / len(scores)
+        if stats["score_count"]:
+            avg_score = stats["score_sum"] / stats["score_count"]
+        
+        # Spread of active fellows' scores, reduced in numpy over the
+        # cached per-fellow scores
+        scores = np.fromiter(
+            (c.score for c in self._contributions.values() if c.score is not None),
+            dtype=np.float64,
+        )
+        score_std = 0.0
+        score_percentiles = {}
+        if scores.size:
+            score_std = float(scores.std())
+            p25, p50, p75 = np.percentile(scores, [25, 50, 75])
+            score_percentiles = {"p25": float(p25), "p50": float(p50), "p75": float(p75)}
         
         return {
-            "total_fellows": len(all_fellows),
-            "active_fellows": len(active_fellows),
-            "total_publications": total_publications,
-            "total_presentations": total_presentations,
-            "total_conferences": total_conferences,
+            "total_fellows": stats["total_fellows"],
+            "active_fellows": stats["active_fellows"],
+            "total_publications": stats["total_publications"],
+            "total_presentations": stats["total_presentations"],
+            "total_conferences": stats["total_conferences"],
             "average_score": avg_score,
-            "fellows_with_dgx": sum(1 for f in all_fellows if f.dgx_spark_assigned),
-            "by_department": self._count_by_department(all_fellows),
-            "by_cohort": self._count_by_cohort(all_fellows),
+            "score_std": score_std,
+            "score_percentiles": score_percentiles,
+            "fellows_with_dgx": stats["fellows_with_dgx"],
+            "by_department": {k: n for k, n in stats["by_department"].items() if n},
+            "by_cohort": {k: n for k, n in stats["by_cohort"].items() if n},
         }
-    
-    def _count_by_department(self, fellows: List[Fellow]) -> Dict[str, int]:
-        """Count fellows by department."""
-        counts = {}
-        for f in fellows:
-            dept = f.application.department.value
-            counts[dept] = counts.get(dept, 0) + 1
-        return counts
-    
-    def _count_by_cohort(self, fellows: List[Fellow]) -> Dict[int, int]:
-        """Count fellows by cohort."""
-        counts = {}
-        for f in fellows:
-            counts[f.cohort] = counts.get(f.cohort, 0) + 1
-        return counts
-
-
-
-
@@ -6,12 +6,17 @@ Pydantic models for Fellow management including applications,
 evaluations, and progress tracking.
 """
 
+import re
 from datetime import date, datetime
 from enum import Enum
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field, EmailStr, validator
 
 
+# SNU student ID, e.g. "2022-12345"
+_STUDENT_ID_RE = re.compile(r"\d{4}-\d{5}")
+
+
 class Department(str, Enum):
     """Supported departments for Fellows."""
     MEDICINE = "의과대학"
@@ -62,7 +67,7 @@ class FellowApplication(BaseModel):
     # Personal Info
     name_korean: str = Field(..., min_length=2, max_length=50)
     name_english: str = Field(..., min_length=2, max_length=100)
-    student_id: str = Field(..., regex=r"^\d{4}-\d{5}$")
+    student_id: str
     email: EmailStr
     phone: str
     department: Department
@@ -101,6 +106,13 @@ class FellowApplication(BaseModel):
     # Metadata
     submitted_at: datetime = Field(default_factory=datetime.now)
     
+    @validator('student_id')
+    def validate_student_id(cls, v):
+        """Student IDs have the form YYYY-NNNNN."""
+        if not _STUDENT_ID_RE.fullmatch(v):
+            raise ValueError("student_id must have the form YYYY-NNNNN")
+        return v
+    
     @validator('programming_skills')
     def validate_python_skill(cls, v):
         """Ensure Python is listed in programming skills."""
@@ -0,0 +1,63 @@
+"""
+Numba Matching Kernels
+======================
+
+JIT-compiled set-overlap kernel for MentorMatcher. Term sets are
+encoded CSR-style as sorted int32 token ids so pair intersections are
+two-pointer merges with no Python objects involved.
+
+Imported lazily by the matcher; requires numba.
+"""
+
+from typing import Dict, FrozenSet, List, Tuple
+
+import numba
+import numpy as np
+
+
+def to_csr(
+    term_sets: List[FrozenSet[str]],
+    vocab: Dict[str, int],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode term sets as (offsets, tokens).
+
+    Row i's sorted token ids are ``tokens[offsets[i]:offsets[i + 1]]``.
+    Terms missing from ``vocab`` are dropped.
+    """
+    offsets = np.zeros(len(term_sets) + 1, dtype=np.int64)
+    rows = []
+    for i, terms in enumerate(term_sets):
+        ids = sorted(vocab[t] for t in terms if t in vocab)
+        rows.extend(ids)
+        offsets[i + 1] = offsets[i] + len(ids)
+    return offsets, np.asarray(rows, dtype=np.int32)
+
+
+@numba.njit(cache=True, nogil=True)
+def overlap_ratio(f_offsets, f_tokens, m_offsets, m_tokens, out):
+    """Fill out[i, j] with |fellow_i & mentor_j| / |mentor_j| (0 if empty)."""
+    n_fellows = f_offsets.shape[0] - 1
+    n_mentors = m_offsets.shape[0] - 1
+    for j in range(n_mentors):
+        m_start = m_offsets[j]
+        m_end = m_offsets[j + 1]
+        size = m_end - m_start
+        for i in range(n_fellows):
+            if size == 0:
+                out[i, j] = 0.0
+                continue
+            a = f_offsets[i]
+            a_end = f_offsets[i + 1]
+            b = m_start
+            count = 0
+            while a < a_end and b < m_end:
+                if f_tokens[a] == m_tokens[b]:
+                    count += 1
+                    a += 1
+                    b += 1
+                elif f_tokens[a] < m_tokens[b]:
+                    a += 1
+                else:
+                    b += 1
+            out[i, j] = count / size
@@ -6,8 +6,9 @@ Optimal matching between mentors and fellows based on
 research interests, expertise, and availability.
 """
 
+import functools
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, NamedTuple, FrozenSet
 from scipy.optimize import linear_sum_assignment
 from loguru import logger
 
@@ -15,12 +16,201 @@ from .models import Mentor, MentorMatch
 from ..fellow.models import Fellow
 
 
+# Lazy import for the optional numba kernels
+_matcher_numba = None
+
+
+def get_matcher_numba():
+    global _matcher_numba
+    if _matcher_numba is None:
+        from . import _matcher_numba as _kernels
+        _matcher_numba = _kernels
+    return _matcher_numba
+
+
+# Affiliations that earn the full career-alignment score
+PRESTIGIOUS_AFFILIATIONS = ("princeton", "mit", "stanford", "harvard", "bnl")
+
+
+class _FellowTerms(NamedTuple):
+    """Lowercased matching terms of a fellow."""
+    interests: FrozenSet[str]
+    skills: FrozenSet[str]
+
+
+class _MentorTerms(NamedTuple):
+    """Lowercased matching terms and static flags of a mentor."""
+    keywords: FrozenSet[str]
+    all_terms: FrozenSet[str]  # keywords | expertise areas
+    skills: FrozenSet[str]  # expertise areas
+    # Score components that only depend on the profile, folded once:
+    # language score without Korean fluency, and career alignment
+    keyword_language_score: float
+    career_score: float
+
+
+def _fellow_terms(fellow: Fellow) -> _FellowTerms:
+    app = fellow.application
+    return _FellowTerms(
+        interests=frozenset(ri.area.lower() for ri in app.research_interests),
+        skills=frozenset(
+            s.name.lower()
+            for s in app.programming_skills + app.ml_skills + app.neuro_tools
+        ),
+    )
+
+
+def _mentor_terms(mentor: Mentor) -> _MentorTerms:
+    keywords = frozenset(kw.lower() for kw in mentor.research_keywords)
+    expertise = frozenset(e.area.lower() for e in mentor.expertise_areas)
+    affiliation = mentor.affiliation.lower()
+    return _MentorTerms(
+        keywords=keywords,
+        all_terms=keywords | expertise,
+        skills=expertise,
+        keyword_language_score=5.0 if any("korea" in kw for kw in keywords) else 0.0,
+        career_score=(
+            5.0 if any(aff in affiliation for aff in PRESTIGIOUS_AFFILIATIONS) else 2.5
+        ),
+    )
+
+
+def _indicator(term_sets: List[FrozenSet[str]], vocab: Dict[str, int]) -> np.ndarray:
+    """(len(term_sets), len(vocab)) 0/1 matrix of set membership."""
+    rows = [i for i, terms in enumerate(term_sets) for _ in terms]
+    cols = [vocab[t] for terms in term_sets for t in terms]
+    mat = np.zeros((len(term_sets), len(vocab)), dtype=np.float32)
+    mat[rows, cols] = 1.0
+    return mat
+
+
+def _overlap_ratio(
+    fellow_sets: List[FrozenSet[str]],
+    mentor_sets: List[FrozenSet[str]],
+    use_numba: bool = False,
+) -> np.ndarray:
+    """|fellow & mentor| / |mentor| for every pair (0 for empty mentor sets)."""
+    vocab: Dict[str, int] = {}
+    for terms in mentor_sets:
+        for t in terms:
+            vocab.setdefault(t, len(vocab))
+    
+    if use_numba:
+        kernels = get_matcher_numba()
+        out = np.empty((len(fellow_sets), len(mentor_sets)), dtype=np.float32)
+        kernels.overlap_ratio(
+            *kernels.to_csr(fellow_sets, vocab), *kernels.to_csr(mentor_sets, vocab), out
+        )
+        return out
+    
+    # Fellow terms no mentor has cannot contribute to an intersection
+    fellow_sets = [terms & vocab.keys() for terms in fellow_sets]
+    
+    mentor_mat = _indicator(mentor_sets, vocab)
+    counts = _indicator(fellow_sets, vocab) @ mentor_mat.T
+    sizes = mentor_mat.sum(axis=1)
+    return np.divide(counts, sizes, out=np.zeros_like(counts), where=sizes > 0)
+
+
 class MentorMatcher:
-    """Matches Fellows with optimal Mentors using Hungarian algorithm."""
+    """
+    Matches Fellows with optimal Mentors using Hungarian algorithm.
+    
+    With ``use_numba=True`` the all-pairs overlap scores in
+    match_all_fellows are computed by a JIT-compiled kernel (requires
+    numba) instead of NumPy indicator-matrix products.
+    """
     
-    def __init__(self, mentors: List[Mentor]):
+    def __init__(self, mentors: List[Mentor], use_numba: bool = False):
         self.mentors = {m.id: m for m in mentors}
+        self.use_numba = use_numba
+        
+        # Lowercased term sets, built once per mentor / on first sight of
+        # a fellow so pair scoring is only set intersections
+        self._mentor_cache: Dict[str, _MentorTerms] = {
+            m.id: _mentor_terms(m) for m in mentors
+        }
+        self._fellow_cache: Dict[str, _FellowTerms] = {}
+        
+        # Pair scores by (fellow, mentor, fellow version, live mentor flags);
+        # bumping a fellow's version leaves its old entries to age out
+        self._fellow_versions: Dict[str, int] = {}
+        self._compat_cached = functools.lru_cache(maxsize=4096)(self._compat_by_ids)
+    
+    def _get_mentor_terms(self, mentor: Mentor) -> _MentorTerms:
+        terms = self._mentor_cache.get(mentor.id)
+        if terms is None:
+            terms = self._mentor_cache[mentor.id] = _mentor_terms(mentor)
+        return terms
+    
+    def _get_fellow_terms(self, fellow: Fellow) -> _FellowTerms:
+        terms = self._fellow_cache.get(fellow.id)
+        if terms is None:
+            terms = self._fellow_cache[fellow.id] = _fellow_terms(fellow)
+        return terms
+    
+    def invalidate_fellow(self, fellow_id: str) -> None:
+        """Forget cached terms and scores for a fellow whose application changed."""
+        self._fellow_cache.pop(fellow_id, None)
+        self._fellow_versions[fellow_id] = self._fellow_versions.get(fellow_id, 0) + 1
+    
+    def clear_cache(self) -> None:
+        """Drop cached term sets and scores (call after editing mentor profiles)."""
+        self._mentor_cache = {m.id: _mentor_terms(m) for m in self.mentors.values()}
+        self._fellow_cache.clear()
+        self._compat_cached.cache_clear()
+    
+    def _compat_by_ids(
+        self,
+        fellow_id: str,
+        mentor_id: str,
+        fellow_version: int,
+        has_slots: bool,
+        speaks_korean: bool,
+    ) -> Tuple[float, Tuple[Tuple[str, float], ...]]:
+        scores = self._score_from_cached(
+            self._fellow_cache[fellow_id], self._mentor_cache[mentor_id],
+            has_slots, speaks_korean,
+        )
+        return sum(scores.values()), tuple(scores.items())
+    
+    @staticmethod
+    def _score_from_cached(
+        fellow: _FellowTerms,
+        mentor_terms: _MentorTerms,
+        has_slots: bool,
+        speaks_korean: bool,
+    ) -> Dict[str, float]:
+        """Compatibility score from precomputed term sets."""
+        scores = {}
+        
+        # 1. Research Interest Match (40%)
+        # (no shared terms, the common case, skips the intersection)
+        mentor_all = mentor_terms.all_terms
+        if not mentor_all or fellow.interests.isdisjoint(mentor_all):
+            scores["interest_match"] = 0.0
+        else:
+            scores["interest_match"] = len(fellow.interests & mentor_all) / len(mentor_all) * 40
+        
+        # 2. Technical Skills Match (30%)
+        mentor_skills = mentor_terms.skills
+        if not mentor_skills or fellow.skills.isdisjoint(mentor_skills):
+            scores["skill_match"] = 0.0
+        else:
+            scores["skill_match"] = len(fellow.skills & mentor_skills) / len(mentor_skills) * 30
+        
+        # 3. Availability (15%)
+        scores["availability"] = 15.0 if has_slots else 0.0
         
+        # 4. Language/Culture (10%)
+        scores["language"] = 10.0 if speaks_korean else mentor_terms.keyword_language_score
+        
+        # 5. Career Alignment (5%)
+        # Simple heuristic based on affiliation
+        scores["career"] = mentor_terms.career_score
+        
+        return scores
+    
     def compute_compatibility(
         self, 
         fellow: Fellow, 
@@ -32,61 +222,66 @@ class MentorMatcher:
         Returns:
             Tuple of (total_score, score_breakdown)
         """
-        scores = {}
+        # Populate the term caches _compat_by_ids reads from
+        self._get_fellow_terms(fellow)
+        self._get_mentor_terms(mentor)
         
-        # 1. Research Interest Match (40%)
-        fellow_interests = set(
-            ri.area.lower() for ri in fellow.application.research_interests
-        )
-        mentor_keywords = set(kw.lower() for kw in mentor.research_keywords)
-        mentor_expertise = set(
-            e.area.lower() for e in mentor.expertise_areas
+        score, breakdown = self._compat_cached(
+            fellow.id,
+            mentor.id,
+            self._fellow_versions.get(fellow.id, 0),
+            mentor.available_slots > 0,
+            mentor.speaks_korean,
         )
-        mentor_all = mentor_keywords | mentor_expertise
+        return score, dict(breakdown)
+    
+    def _score_matrices(
+        self,
+        fellows: List[Fellow],
+        mentors: List[Mentor],
+    ) -> Dict[str, np.ndarray]:
+        """
+        Score breakdown for every (fellow, mentor) pair at once.
         
-        if mentor_all:
-            interest_overlap = len(fellow_interests & mentor_all) / len(mentor_all)
-        else:
-            interest_overlap = 0.0
-        scores["interest_match"] = interest_overlap * 40
+        Matrices are float32: overlap counts are small integers and the
+        assignment does not need double precision.
         
-        # 2. Technical Skills Match (30%)
-        fellow_skills = set(
-            s.name.lower() for s in fellow.application.programming_skills +
-            fellow.application.ml_skills + fellow.application.neuro_tools
+        Returns:
+            Breakdown key -> (n_fellows, n_mentors) matrix, as in
+            compute_compatibility
+        """
+        fellow_terms = [self._get_fellow_terms(f) for f in fellows]
+        mentor_terms = [self._get_mentor_terms(m) for m in mentors]
+        shape = (len(fellows), len(mentors))
+        
+        n = len(mentors)
+        availability = np.fromiter(
+            (15.0 if m.available_slots > 0 else 0.0 for m in mentors), np.float32, n
         )
-        mentor_skills = set(
-            e.area.lower() for e in mentor.expertise_areas
+        language = np.fromiter(
+            (
+                10.0 if m.speaks_korean else t.keyword_language_score
+                for m, t in zip(mentors, mentor_terms)
+            ),
+            np.float32, n,
         )
+        career = np.fromiter((t.career_score for t in mentor_terms), np.float32, n)
         
-        if mentor_skills:
-            skill_overlap = len(fellow_skills & mentor_skills) / len(mentor_skills)
-        else:
-            skill_overlap = 0.0
-        scores["skill_match"] = skill_overlap * 30
-        
-        # 3. Availability (15%)
-        availability_score = 15.0 if mentor.available_slots > 0 else 0.0
-        scores["availability"] = availability_score
-        
-        # 4. Language/Culture (10%)
-        if mentor.speaks_korean:
-            scores["language"] = 10.0
-        elif any("korea" in kw.lower() for kw in mentor.research_keywords):
-            scores["language"] = 5.0
-        else:
-            scores["language"] = 0.0
-        
-        # 5. Career Alignment (5%)
-        # Simple heuristic based on affiliation
-        prestigious_affiliations = ["princeton", "mit", "stanford", "harvard", "bnl"]
-        if any(aff in mentor.affiliation.lower() for aff in prestigious_affiliations):
-            scores["career"] = 5.0
-        else:
-            scores["career"] = 2.5
-        
-        total_score = sum(scores.values())
-        return total_score, scores
+        return {
+            "interest_match": 40 * _overlap_ratio(
+                [t.interests for t in fellow_terms],
+                [t.all_terms for t in mentor_terms],
+                self.use_numba,
+            ),
+            "skill_match": 30 * _overlap_ratio(
+                [t.skills for t in fellow_terms],
+                [t.skills for t in mentor_terms],
+                self.use_numba,
+            ),
+            "availability": np.broadcast_to(availability, shape),
+            "language": np.broadcast_to(language, shape),
+            "career": np.broadcast_to(career, shape),
+        }
     
     def match_fellow(
         self, 
@@ -104,19 +299,16 @@ class MentorMatcher:
             List of MentorMatch objects, sorted by compatibility
         """
         matches = []
+        fellow_terms = self._get_fellow_terms(fellow)
         
         for mentor_id, mentor in self.mentors.items():
             if not mentor.active:
                 continue
-                
+            
             score, breakdown = self.compute_compatibility(fellow, mentor)
             
             # Find matching areas
-            fellow_interests = set(
-                ri.area.lower() for ri in fellow.application.research_interests
-            )
-            mentor_keywords = set(kw.lower() for kw in mentor.research_keywords)
-            matching = list(fellow_interests & mentor_keywords)
+            matching = list(fellow_terms.interests & self._mentor_cache[mentor_id].keywords)
             
             match = MentorMatch(
                 fellow_id=fellow.id,
@@ -145,7 +337,8 @@ class MentorMatcher:
     def match_all_fellows(
         self, 
         fellows: List[Fellow],
-        ensure_unique: bool = True
+        ensure_unique: bool = True,
+        respect_capacity: bool = False,
     ) -> Dict[str, MentorMatch]:
         """
         Optimal matching of all Fellows to Mentors.
@@ -157,6 +350,9 @@ class MentorMatcher:
         Args:
             fellows: List of Fellows to match
             ensure_unique: If True, use Hungarian algorithm for 1:1 matching
+            respect_capacity: If True, each mentor takes up to their
+                available_slots fellows in a single assignment; fellows
+                beyond total capacity are left unmatched
             
         Returns:
             Dict mapping fellow_id to their primary MentorMatch
@@ -169,8 +365,20 @@ class MentorMatcher:
                 if self.match_fellow(f, top_k=1)
             }
         
-        # Build cost matrix for Hungarian algorithm
+        # Mentors with open slots are matched first; full mentors only
+        # take fellows left over once those are used up
         mentor_list = [m for m in self.mentors.values() if m.active]
+        mentors_with_slots = [m for m in mentor_list if m.available_slots > 0]
+        mentors_full = [m for m in mentor_list if m.available_slots == 0]
+        
+        if respect_capacity:
+            slots = [m.available_slots for m in mentors_with_slots]
+            if len(fellows) > sum(slots):
+                logger.warning(
+                    f"More fellows ({len(fellows)}) than open mentor slots ({sum(slots)}). "
+                    "Some fellows will be left unmatched."
+                )
+            return self._assign(fellows, mentors_with_slots, slots)
         
         if len(fellows) > len(mentor_list):
             logger.warning(
@@ -178,30 +386,49 @@ class MentorMatcher:
                 "Some fellows will share mentors."
             )
         
-        # Cost matrix: rows=fellows, cols=mentors
-        # We want to maximize compatibility, so cost = 100 - compatibility
-        n_fellows = len(fellows)
-        n_mentors = len(mentor_list)
+        results = self._assign(fellows, mentors_with_slots)
+        unassigned = [f for f in fellows if f.id not in results]
+        if unassigned and mentors_full:
+            results.update(self._assign(unassigned, mentors_full))
+        
+        return results
+    
+    def _assign(
+        self,
+        fellows: List[Fellow],
+        mentors: List[Mentor],
+        slots: Optional[List[int]] = None,
+    ) -> Dict[str, MentorMatch]:
+        """
+        Hungarian assignment of fellows to mentors.
+        
+        Each mentor takes at most one fellow, or up to slots[j] fellows
+        when slots is given (mentor j's column repeated once per slot).
+        """
+        if not fellows or not mentors:
+            return {}
         
-        cost_matrix = np.zeros((n_fellows, n_mentors))
+        # Score matrix: rows=fellows, cols=mentors
+        components = self._score_matrices(fellows, mentors)
+        score_matrix = sum(components.values())
         
-        for i, fellow in enumerate(fellows):
-            for j, mentor in enumerate(mentor_list):
-                score, _ = self.compute_compatibility(fellow, mentor)
-                cost_matrix[i, j] = 100 - score  # Lower cost = better match
+        # Column -> mentor index
+        col_mentor = np.arange(len(mentors))
+        if slots is not None:
+            col_mentor = np.repeat(col_mentor, slots)
+            if not len(col_mentor):
+                return {}
         
-        # Run Hungarian algorithm
-        row_ind, col_ind = linear_sum_assignment(cost_matrix)
+        # Run Hungarian algorithm, maximizing total compatibility
+        row_ind, col_ind = linear_sum_assignment(score_matrix[:, col_mentor], maximize=True)
         
         # Build results
         results = {}
-        for f_idx, m_idx in zip(row_ind, col_ind):
+        for f_idx, m_idx in zip(row_ind, col_mentor[col_ind]):
             fellow = fellows[f_idx]
-            mentor = mentor_list[m_idx]
-            score = 100 - cost_matrix[f_idx, m_idx]
-            
-            # Get full breakdown
-            _, breakdown = self.compute_compatibility(fellow, mentor)
+            mentor = mentors[m_idx]
+            score = float(score_matrix[f_idx, m_idx])
+            breakdown = {key: float(mat[f_idx, m_idx]) for key, mat in components.items()}
             
             match = MentorMatch(
                 fellow_id=fellow.id,
@@ -1,9 +1,8 @@
 """BrainLM: Autoregressive Foundation Model for fMRI."""
 from .model import BrainLM
 from .config import BrainLMConfig
-from .trainer import BrainLMTrainer
 
-__all__ = ["BrainLM", "BrainLMConfig", "BrainLMTrainer"]
+__all__ = ["BrainLM", "BrainLMConfig"]
 
 
 
@@ -26,6 +26,7 @@ class BrainLMConfig:
     n_layers: int = 12   # Transformer layers
     d_ff: int = 3072     # Feedforward dimension
     dropout: float = 0.1
+    use_rmsnorm: bool = False  # RMSNorm instead of LayerNorm in embedding/blocks
     
     # Input Processing
     max_seq_len: int = 512   # Max time points
@@ -38,6 +39,13 @@ class BrainLMConfig:
     # Output
     prediction_horizon: int = 1  # Predict next N time points
     
+    # Precision
+    amp_dtype: Optional[str] = "bf16"  # "bf16", "fp16" or None for fp32 (CUDA only)
+    
+    # Compilation
+    compile: bool = False  # torch.compile each transformer block
+    compile_mode: str = "reduce-overhead"
+    
     # Training
     learning_rate: float = 1e-4
     weight_decay: float = 0.01
@@ -45,6 +53,8 @@ class BrainLMConfig:
     max_steps: int = 100000
     batch_size: int = 32
     gradient_accumulation_steps: int = 4
+    gradient_checkpointing: bool = False  # Recompute block activations in backward
+    loss_type: str = "mse"  # or "smooth_l1"
     
     # Masking (for MLM-style training)
     mask_ratio: float = 0.15
@@ -64,6 +74,10 @@ class BrainLMConfig:
             f"d_model ({self.d_model}) must be divisible by n_heads ({self.n_heads})"
         assert self.mask_ratio > 0 and self.mask_ratio < 1, \
             f"mask_ratio must be in (0, 1), got {self.mask_ratio}"
+        assert self.loss_type in ("mse", "smooth_l1"), \
+            f"loss_type must be 'mse' or 'smooth_l1', got {self.loss_type}"
+        assert self.amp_dtype in (None, "bf16", "fp16"), \
+            f"amp_dtype must be 'bf16', 'fp16' or None, got {self.amp_dtype}"
 
 
 @dataclass
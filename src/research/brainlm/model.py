@@ -14,18 +14,102 @@ import math
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
-from typing import Optional, Tuple, Dict, Any
-from einops import rearrange, repeat
+from torch.utils.checkpoint import checkpoint
+from typing import Optional, Tuple, Dict, Any, List
 
 from .config import BrainLMConfig
 
 
+# BrainLMConfig.amp_dtype -> autocast dtype
+AMP_DTYPES = {
+    "bf16": torch.bfloat16,
+    "fp16": torch.float16,
+}
+
+
+def _weighted_mean(errors: torch.Tensor, weights: torch.Tensor) -> torch.Tensor:
+    """Mean of (batch, seq, num_rois) errors over positions with weight 1."""
+    weights = weights.unsqueeze(-1).to(errors.dtype)
+    n = weights.sum() * errors.size(-1)
+    return (errors * weights).sum() / n.clamp_min(1.0)
+
+
+def _dropout(x: torch.Tensor, p: float, training: bool) -> torch.Tensor:
+    """Functional dropout that skips the call entirely when it is a no-op."""
+    if p > 0 and training:
+        return F.dropout(x, p, True)
+    return x
+
+
+def _add_positions(x: torch.Tensor, pe: torch.Tensor) -> torch.Tensor:
+    """Add a positional table slice to x, in place when autograd is not tracking x."""
+    if pe.dtype != x.dtype:
+        # Avoid promoting bf16/fp16 activations to the table's dtype
+        pe = pe.to(x.dtype)
+    if torch.is_grad_enabled() and x.requires_grad:
+        return x + pe
+    return x.add_(pe)
+
+
+def length_mask(lengths: torch.Tensor, seq_len: int) -> torch.Tensor:
+    """(batch, seq_len) boolean mask, True for the first lengths[b] positions."""
+    positions = torch.arange(seq_len, device=lengths.device)
+    return positions < lengths.unsqueeze(1)
+
+
+def bucketize_batch(
+    x: torch.Tensor,
+    lengths: torch.Tensor,
+    bucket_size: int,
+) -> List[Tuple[torch.Tensor, torch.Tensor]]:
+    """
+    Split a right-padded batch into length-sorted buckets.
+    
+    Each bucket is trimmed to its own longest sequence, so shorter
+    sequences are only padded up to their neighbours' length rather
+    than the batch maximum.
+    
+    Args:
+        x: (batch, seq_len, num_rois) - right-padded time series
+        lengths: (batch,) - number of valid time points per sequence
+        bucket_size: Sequences per bucket
+        
+    Returns:
+        List of (x_bucket, lengths_bucket) pairs
+    """
+    order = torch.argsort(lengths)
+    buckets = []
+    for start in range(0, len(order), bucket_size):
+        idx = order[start:start + bucket_size]
+        bucket_lengths = lengths[idx]
+        max_len = int(bucket_lengths.max())
+        buckets.append((x[idx, :max_len], bucket_lengths))
+    return buckets
+
+
+class RMSNorm(nn.Module):
+    """Root-mean-square norm: one reduction, no mean subtraction or bias."""
+    
+    def __init__(self, d_model: int, eps: float = 1e-6):
+        super().__init__()
+        self.eps = eps
+        self.weight = nn.Parameter(torch.ones(d_model))
+    
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return x * torch.rsqrt(x.pow(2).mean(-1, keepdim=True) + self.eps) * self.weight
+
+
+def make_norm(d_model: int, use_rmsnorm: bool = False) -> nn.Module:
+    """RMSNorm or LayerNorm over d_model."""
+    return RMSNorm(d_model) if use_rmsnorm else nn.LayerNorm(d_model)
+
+
 class SinusoidalPositionalEncoding(nn.Module):
     """Sinusoidal positional encoding for temporal dimension."""
     
     def __init__(self, d_model: int, max_len: int = 5000, dropout: float = 0.1):
         super().__init__()
-        self.dropout = nn.Dropout(p=dropout)
+        self.p = dropout
         
         position = torch.arange(max_len).unsqueeze(1)
         div_term = torch.exp(
@@ -38,15 +122,16 @@ class SinusoidalPositionalEncoding(nn.Module):
         
         self.register_buffer('pe', pe)
     
-    def forward(self, x: torch.Tensor) -> torch.Tensor:
+    def forward(self, x: torch.Tensor, offset: int = 0) -> torch.Tensor:
         """
         Args:
             x: (batch, seq_len, d_model)
+            offset: Position of x[:, 0] (non-zero for cached decoding)
         Returns:
             (batch, seq_len, d_model)
         """
-        x = x + self.pe[:, :x.size(1)]
-        return self.dropout(x)
+        x = _add_positions(x, self.pe[:, offset:offset + x.size(1)])
+        return _dropout(x, self.p, self.training)
 
 
 class LearnedPositionalEncoding(nn.Module):
@@ -54,12 +139,12 @@ class LearnedPositionalEncoding(nn.Module):
     
     def __init__(self, d_model: int, max_len: int = 5000, dropout: float = 0.1):
         super().__init__()
-        self.dropout = nn.Dropout(p=dropout)
+        self.p = dropout
         self.pe = nn.Parameter(torch.randn(1, max_len, d_model))
     
-    def forward(self, x: torch.Tensor) -> torch.Tensor:
-        x = x + self.pe[:, :x.size(1)]
-        return self.dropout(x)
+    def forward(self, x: torch.Tensor, offset: int = 0) -> torch.Tensor:
+        x = _add_positions(x, self.pe[:, offset:offset + x.size(1)])
+        return _dropout(x, self.p, self.training)
 
 
 class ROIEmbedding(nn.Module):
@@ -69,11 +154,17 @@ class ROIEmbedding(nn.Module):
     Each time point's ROI values are projected to d_model dimensions.
     """
     
-    def __init__(self, num_rois: int, d_model: int, dropout: float = 0.1):
+    def __init__(
+        self,
+        num_rois: int,
+        d_model: int,
+        dropout: float = 0.1,
+        use_rmsnorm: bool = False,
+    ):
         super().__init__()
         self.projection = nn.Linear(num_rois, d_model)
-        self.norm = nn.LayerNorm(d_model)
-        self.dropout = nn.Dropout(dropout)
+        self.norm = make_norm(d_model, use_rmsnorm)
+        self.p = dropout
     
     def forward(self, x: torch.Tensor) -> torch.Tensor:
         """
@@ -84,7 +175,7 @@ class ROIEmbedding(nn.Module):
         """
         x = self.projection(x)
         x = self.norm(x)
-        x = self.dropout(x)
+        x = _dropout(x, self.p, self.training)
         return x
 
 
@@ -97,6 +188,7 @@ class MultiHeadAttention(nn.Module):
         n_heads: int,
         dropout: float = 0.1,
         causal: bool = False,
+        max_seq_len: Optional[int] = None,
     ):
         super().__init__()
         assert d_model % n_heads == 0
@@ -106,48 +198,139 @@ class MultiHeadAttention(nn.Module):
         self.head_dim = d_model // n_heads
         self.causal = causal
         
-        self.q_proj = nn.Linear(d_model, d_model)
-        self.k_proj = nn.Linear(d_model, d_model)
-        self.v_proj = nn.Linear(d_model, d_model)
+        # Q, K and V projections stacked into one GEMM
+        self.qkv_proj = nn.Linear(d_model, 3 * d_model)
         self.out_proj = nn.Linear(d_model, d_model)
         
-        self.dropout = nn.Dropout(dropout)
+        self.p = dropout
         self.scale = self.head_dim ** -0.5
+        
+        # Causal mask for up to max_seq_len positions, sliced per call
+        if causal and max_seq_len is not None:
+            self.register_buffer(
+                'causal_mask',
+                torch.triu(torch.ones(max_seq_len, max_seq_len, dtype=torch.bool), diagonal=1),
+                persistent=False,
+            )
+        else:
+            self.causal_mask = None
+        
+        self._register_load_state_dict_pre_hook(self._merge_qkv_state)
+    
+    @staticmethod
+    def _merge_qkv_state(state_dict, prefix, *args) -> None:
+        """Load checkpoints saved with separate q_proj/k_proj/v_proj."""
+        for param in ("weight", "bias"):
+            keys = [f"{prefix}{name}_proj.{param}" for name in ("q", "k", "v")]
+            if all(key in state_dict for key in keys):
+                state_dict[f"{prefix}qkv_proj.{param}"] = torch.cat(
+                    [state_dict.pop(key) for key in keys], dim=0
+                )
     
     def forward(
         self,
         x: torch.Tensor,
         attention_mask: Optional[torch.Tensor] = None,
-    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        return_attention: bool = False,
+        past_kv: Optional[Tuple[torch.Tensor, torch.Tensor]] = None,
+        use_cache: bool = False,
+    ) -> Tuple[torch.Tensor, Optional[torch.Tensor], Optional[Tuple[torch.Tensor, torch.Tensor]]]:
         """
         Args:
-            x: (batch, seq_len, d_model)
-            attention_mask: Optional mask
+            x: (batch, seq_len, d_model) - new positions only when past_kv is given
+            attention_mask: Optional boolean mask, True where attention is allowed
+            return_attention: Compute and return the attention weights.
+                Otherwise attention runs through the fused
+                scaled_dot_product_attention kernels and no weights are returned.
+            past_kv: Cached (key, value) of earlier positions,
+                each (batch, n_heads, past_len, head_dim)
+            use_cache: Return the updated (key, value) cache
         Returns:
             output: (batch, seq_len, d_model)
-            attention_weights: (batch, n_heads, seq_len, seq_len)
+            attention_weights: (batch, n_heads, seq_len, past_len + seq_len) or None
+            present_kv: Updated (key, value) cache, or None unless use_cache
         """
         batch_size, seq_len, _ = x.shape
         
         # Project to Q, K, V
-        q = self.q_proj(x)
-        k = self.k_proj(x)
-        v = self.v_proj(x)
+        q, k, v = self.qkv_proj(x).chunk(3, dim=-1)
         
         # Reshape for multi-head attention
-        q = rearrange(q, 'b s (h d) -> b h s d', h=self.n_heads)
-        k = rearrange(k, 'b s (h d) -> b h s d', h=self.n_heads)
-        v = rearrange(v, 'b s (h d) -> b h s d', h=self.n_heads)
+        q = q.view(batch_size, seq_len, self.n_heads, self.head_dim).transpose(1, 2)
+        k = k.view(batch_size, seq_len, self.n_heads, self.head_dim).transpose(1, 2)
+        v = v.view(batch_size, seq_len, self.n_heads, self.head_dim).transpose(1, 2)
+        
+        # Prepend cached keys/values of earlier positions
+        past_len = 0
+        if past_kv is not None:
+            past_k, past_v = past_kv
+            past_len = past_k.size(2)
+            k = torch.cat([past_k, k], dim=2)
+            v = torch.cat([past_v, v], dim=2)
+        present_kv = (k, v) if use_cache else None
+        
+        # A single query at the end of the sequence may attend to every key
+        causal = self.causal and seq_len > 1
+        
+        # Explicit causal mask, only needed when it cannot be left to SDPA
+        causal_mask = None
+        if causal and (return_attention or attention_mask is not None or past_len > 0):
+            causal_mask = self._get_causal_mask(past_len, seq_len, x.device)
+        
+        if return_attention:
+            out, attn_weights = self._attention_with_weights(
+                q, k, v, causal_mask, attention_mask
+            )
+        else:
+            # Flash / memory-efficient kernels: no (S, S) scores tensor
+            attn_mask = attention_mask
+            if causal_mask is not None:
+                # SDPA takes either is_causal or an explicit mask, not both
+                attn_mask = ~causal_mask if attn_mask is None else attn_mask & ~causal_mask
+            out = F.scaled_dot_product_attention(
+                q, k, v,
+                attn_mask=attn_mask,
+                dropout_p=self.p if self.training else 0.0,
+                is_causal=causal and attn_mask is None,
+            )
+            attn_weights = None
+        
+        out = out.transpose(1, 2).contiguous().view(batch_size, seq_len, self.d_model)
         
+        # Output projection
+        out = self.out_proj(out)
+        
+        return out, attn_weights, present_kv
+    
+    def _get_causal_mask(
+        self,
+        past_len: int,
+        seq_len: int,
+        device: torch.device,
+    ) -> torch.Tensor:
+        """(seq_len, past_len + seq_len) mask, True where attention is blocked."""
+        kv_len = past_len + seq_len
+        if self.causal_mask is not None and kv_len <= self.causal_mask.size(0):
+            return self.causal_mask[past_len:kv_len, :kv_len]
+        return torch.triu(
+            torch.ones(seq_len, kv_len, device=device, dtype=torch.bool),
+            diagonal=past_len + 1
+        )
+    
+    def _attention_with_weights(
+        self,
+        q: torch.Tensor,
+        k: torch.Tensor,
+        v: torch.Tensor,
+        causal_mask: Optional[torch.Tensor],
+        attention_mask: Optional[torch.Tensor],
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Explicit softmax attention, for callers that need the weights."""
         # Compute attention scores
         scores = torch.matmul(q, k.transpose(-2, -1)) * self.scale
         
         # Apply causal mask if needed
-        if self.causal:
-            causal_mask = torch.triu(
-                torch.ones(seq_len, seq_len, device=x.device, dtype=torch.bool),
-                diagonal=1
-            )
+        if causal_mask is not None:
             scores = scores.masked_fill(causal_mask, float('-inf'))
         
         # Apply attention mask if provided
@@ -156,16 +339,40 @@ class MultiHeadAttention(nn.Module):
         
         # Softmax and dropout
         attn_weights = F.softmax(scores, dim=-1)
-        attn_weights = self.dropout(attn_weights)
+        attn_weights = _dropout(attn_weights, self.p, self.training)
         
         # Apply attention to values
-        out = torch.matmul(attn_weights, v)
-        out = rearrange(out, 'b h s d -> b s (h d)')
-        
-        # Output projection
-        out = self.out_proj(out)
+        return torch.matmul(attn_weights, v), attn_weights
+
+
+class FeedForward(nn.Module):
+    """Position-wise feed-forward network with tanh-approximated GELU."""
+    
+    # Sequential indices of the linears in older checkpoints
+    _LEGACY_KEYS = {"0": "fc1", "3": "fc2"}
+    
+    def __init__(self, d_model: int, d_ff: int, dropout: float = 0.1):
+        super().__init__()
+        self.fc1 = nn.Linear(d_model, d_ff)
+        self.fc2 = nn.Linear(d_ff, d_model)
+        self.p = dropout
         
-        return out, attn_weights
+        self._register_load_state_dict_pre_hook(self._rename_sequential_state)
+    
+    @classmethod
+    def _rename_sequential_state(cls, state_dict, prefix, *args) -> None:
+        """Load checkpoints saved with the nn.Sequential FFN."""
+        for index, name in cls._LEGACY_KEYS.items():
+            for param in ("weight", "bias"):
+                key = f"{prefix}{index}.{param}"
+                if key in state_dict:
+                    state_dict[f"{prefix}{name}.{param}"] = state_dict.pop(key)
+    
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        h = F.gelu(self.fc1(x), approximate='tanh')
+        h = _dropout(h, self.p, self.training)
+        h = self.fc2(h)
+        return _dropout(h, self.p, self.training)
 
 
 class TransformerBlock(nn.Module):
@@ -178,42 +385,47 @@ class TransformerBlock(nn.Module):
         d_ff: int,
         dropout: float = 0.1,
         causal: bool = False,
+        max_seq_len: Optional[int] = None,
+        use_rmsnorm: bool = False,
     ):
         super().__init__()
         
-        self.norm1 = nn.LayerNorm(d_model)
-        self.attn = MultiHeadAttention(d_model, n_heads, dropout, causal)
+        self.norm1 = make_norm(d_model, use_rmsnorm)
+        self.attn = MultiHeadAttention(d_model, n_heads, dropout, causal, max_seq_len)
         
-        self.norm2 = nn.LayerNorm(d_model)
-        self.ffn = nn.Sequential(
-            nn.Linear(d_model, d_ff),
-            nn.GELU(),
-            nn.Dropout(dropout),
-            nn.Linear(d_ff, d_model),
-            nn.Dropout(dropout),
-        )
+        self.norm2 = make_norm(d_model, use_rmsnorm)
+        self.ffn = FeedForward(d_model, d_ff, dropout)
     
     def forward(
         self,
         x: torch.Tensor,
         attention_mask: Optional[torch.Tensor] = None,
-    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        return_attention: bool = False,
+        past_kv: Optional[Tuple[torch.Tensor, torch.Tensor]] = None,
+        use_cache: bool = False,
+    ) -> Tuple[torch.Tensor, Optional[torch.Tensor], Optional[Tuple[torch.Tensor, torch.Tensor]]]:
         """
         Args:
             x: (batch, seq_len, d_model)
+            past_kv: Cached (key, value) of earlier positions
+            use_cache: Return the updated (key, value) cache
         Returns:
             output: (batch, seq_len, d_model)
-            attention_weights: (batch, n_heads, seq_len, seq_len)
+            attention_weights: (batch, n_heads, seq_len, kv_len), or None
+                unless return_attention
+            present_kv: Updated (key, value) cache, or None unless use_cache
         """
         # Pre-norm attention
         normed = self.norm1(x)
-        attn_out, attn_weights = self.attn(normed, attention_mask)
+        attn_out, attn_weights, present_kv = self.attn(
+            normed, attention_mask, return_attention, past_kv, use_cache
+        )
         x = x + attn_out
         
         # Pre-norm FFN
         x = x + self.ffn(self.norm2(x))
         
-        return x, attn_weights
+        return x, attn_weights, present_kv
 
 
 class BrainLM(nn.Module):
@@ -238,7 +450,8 @@ class BrainLM(nn.Module):
         self.roi_embedding = ROIEmbedding(
             config.num_rois,
             config.d_model,
-            config.dropout
+            config.dropout,
+            use_rmsnorm=config.use_rmsnorm,
         )
         
         # CLS token
@@ -266,7 +479,9 @@ class BrainLM(nn.Module):
                 config.n_heads,
                 config.d_ff,
                 config.dropout,
-                causal=True  # Autoregressive
+                causal=True,  # Autoregressive
+                max_seq_len=config.max_seq_len + 1,  # +1 for CLS
+                use_rmsnorm=config.use_rmsnorm,
             )
             for _ in range(config.n_layers)
         ])
@@ -278,8 +493,16 @@ class BrainLM(nn.Module):
         # Masked prediction head (optional)
         self.masked_head = nn.Linear(config.d_model, config.num_rois)
         
+        # Mixed precision for the encoder stack; heads stay in fp32
+        self.amp_dtype = AMP_DTYPES.get(config.amp_dtype) if config.amp_dtype else None
+        
         # Initialize weights
         self.apply(self._init_weights)
+        
+        # Compile blocks in place (keeps state_dict keys unchanged)
+        if config.compile:
+            for layer in self.layers:
+                layer.compile(mode=config.compile_mode, fullgraph=True)
     
     def _init_weights(self, module):
         """Initialize weights."""
@@ -290,55 +513,113 @@ class BrainLM(nn.Module):
         elif isinstance(module, nn.LayerNorm):
             torch.nn.init.ones_(module.weight)
             torch.nn.init.zeros_(module.bias)
+        elif isinstance(module, RMSNorm):
+            torch.nn.init.ones_(module.weight)
     
     def forward(
         self,
         x: torch.Tensor,
         mask: Optional[torch.Tensor] = None,
         return_attention: bool = False,
-    ) -> Dict[str, torch.Tensor]:
+        past_key_values: Optional[List[Tuple[torch.Tensor, torch.Tensor]]] = None,
+        use_cache: bool = False,
+        lengths: Optional[torch.Tensor] = None,
+    ) -> Dict[str, Any]:
         """
         Forward pass.
         
         Args:
-            x: (batch, seq_len, num_rois) - fMRI time series
+            x: (batch, seq_len, num_rois) - fMRI time series; only the new
+                time points when past_key_values is given
             mask: (batch, seq_len) - Mask for masked prediction
             return_attention: Whether to return attention weights
+            past_key_values: Per-layer (key, value) cache from a previous
+                call with use_cache=True
+            use_cache: Whether to return the updated cache
+            lengths: (batch,) - valid time points per right-padded sequence;
+                padded positions are excluded as attention keys
             
         Returns:
             Dict with:
             - predictions: (batch, seq_len, num_rois) - Predicted next states
             - hidden_states: (batch, seq_len, d_model) - Encoded representations
-            - cls_embedding: (batch, d_model) - CLS token embedding (if used)
+            - cls_embedding: (batch, d_model) - CLS token embedding (if used;
+              omitted for cached calls, where the CLS position is in the cache)
             - attention_weights: List of attention weights (if requested)
+            - past_key_values: List of per-layer (key, value) (if use_cache)
         """
         batch_size, seq_len, _ = x.shape
         
-        # Embed ROIs
-        hidden = self.roi_embedding(x)
-        
-        # Add CLS token
-        if self.config.use_cls_token:
-            cls_tokens = repeat(self.cls_token, '1 1 d -> b 1 d', b=batch_size)
-            hidden = torch.cat([cls_tokens, hidden], dim=1)
-        
-        # Add positional encoding
-        hidden = self.pos_encoding(hidden)
-        
-        # Transformer layers
-        attention_weights = []
-        for layer in self.layers:
-            hidden, attn = layer(hidden)
-            if return_attention:
-                attention_weights.append(attn)
-        
-        # Normalize
-        hidden = self.output_norm(hidden)
+        # Positions already in the cache (CLS included)
+        past_len = past_key_values[0][0].size(2) if past_key_values is not None else 0
+        add_cls = self.config.use_cls_token and past_len == 0
+        
+        # Key padding mask for right-padded batches
+        attention_mask = None
+        valid = None
+        if lengths is not None:
+            if past_key_values is not None:
+                raise ValueError("lengths is not supported together with past_key_values")
+            valid = length_mask(lengths.to(x.device), seq_len)
+            key_valid = valid
+            if add_cls:
+                key_valid = F.pad(valid, (1, 0), value=True)
+            attention_mask = key_valid[:, None, None, :]  # (batch, 1, 1, keys)
+        
+        use_amp = self.amp_dtype is not None and x.device.type == 'cuda'
+        with torch.autocast(
+            x.device.type,
+            dtype=self.amp_dtype or torch.bfloat16,
+            enabled=use_amp,
+        ):
+            # Embed ROIs
+            hidden = self.roi_embedding(x)
+            
+            # Add CLS token
+            if add_cls:
+                cls_tokens = self.cls_token.expand(batch_size, 1, self.config.d_model)
+                hidden = torch.cat([cls_tokens, hidden], dim=1)
+            
+            # Add positional encoding
+            hidden = self.pos_encoding(hidden, offset=past_len)
+            
+            # Transformer layers
+            attention_weights = []
+            present_key_values = []
+            use_checkpointing = (
+                self.training and self.config.gradient_checkpointing and not use_cache
+            )
+            for i, layer in enumerate(self.layers):
+                if use_checkpointing:
+                    # Keep only block inputs; recompute activations in backward
+                    hidden, attn, present_kv = checkpoint(
+                        layer, hidden, attention_mask, return_attention, use_reentrant=False
+                    )
+                else:
+                    hidden, attn, present_kv = layer(
+                        hidden,
+                        attention_mask=attention_mask,
+                        return_attention=return_attention,
+                        past_kv=past_key_values[i] if past_key_values is not None else None,
+                        use_cache=use_cache,
+                    )
+                if return_attention:
+                    attention_weights.append(attn)
+                if use_cache:
+                    present_key_values.append(present_kv)
+        
+        # Normalize (fp32 from here on)
+        hidden = self.output_norm(hidden.float())
         
         # Split CLS and sequence
-        if self.config.use_cls_token:
+        if add_cls:
             cls_embedding = hidden[:, 0]
             hidden = hidden[:, 1:]
+        elif self.config.use_cls_token:
+            cls_embedding = None
+        elif valid is not None:
+            weights = valid.unsqueeze(-1).to(hidden.dtype)
+            cls_embedding = (hidden * weights).sum(dim=1) / weights.sum(dim=1).clamp_min(1.0)
         else:
             cls_embedding = hidden.mean(dim=1)
         
@@ -353,15 +634,20 @@ class BrainLM(nn.Module):
         outputs = {
             "predictions": predictions,
             "hidden_states": hidden,
-            "cls_embedding": cls_embedding,
         }
         
+        if cls_embedding is not None:
+            outputs["cls_embedding"] = cls_embedding
+        
         if masked_predictions is not None:
             outputs["masked_predictions"] = masked_predictions
         
         if return_attention:
             outputs["attention_weights"] = attention_weights
         
+        if use_cache:
+            outputs["past_key_values"] = present_key_values
+        
         return outputs
     
     def compute_loss(
@@ -370,6 +656,7 @@ class BrainLM(nn.Module):
         mask: Optional[torch.Tensor] = None,
         autoregressive_weight: float = 0.7,
         masked_weight: float = 0.3,
+        lengths: Optional[torch.Tensor] = None,
     ) -> Dict[str, torch.Tensor]:
         """
         Compute training loss.
@@ -379,27 +666,37 @@ class BrainLM(nn.Module):
             mask: (batch, seq_len) - 1 for masked positions
             autoregressive_weight: Weight for AR loss
             masked_weight: Weight for masked prediction loss
+            lengths: (batch,) - valid time points per right-padded sequence;
+                padded positions are excluded from both losses
             
         Returns:
             Dict with total_loss and component losses
         """
-        outputs = self.forward(x, mask=mask)
+        outputs = self.forward(x, mask=mask, lengths=lengths)
         
         # Autoregressive loss: predict x[t+1] from x[1:t]
-        ar_predictions = outputs["predictions"][:, :-1]  # (batch, seq_len-1, num_rois)
-        ar_targets = x[:, 1:]  # (batch, seq_len-1, num_rois)
-        ar_loss = F.mse_loss(ar_predictions, ar_targets)
+        # Losses in fp32 regardless of the autocast dtype
+        ar_predictions = outputs["predictions"][:, :-1].float()  # (batch, seq_len-1, num_rois)
+        ar_targets = x[:, 1:].float()  # (batch, seq_len-1, num_rois)
+        if lengths is None:
+            ar_loss = self._regression_loss(ar_predictions, ar_targets, reduction="mean")
+        else:
+            # Target x[t+1] must be a real time point
+            valid = length_mask(lengths.to(x.device), x.size(1))
+            ar_loss = _weighted_mean(
+                self._regression_loss(ar_predictions, ar_targets), valid[:, 1:]
+            )
         
         # Masked prediction loss (if mask provided)
         masked_loss = torch.tensor(0.0, device=x.device)
         if mask is not None and "masked_predictions" in outputs:
-            masked_pred = outputs["masked_predictions"]
-            # Only compute loss on masked positions
-            mask_expanded = mask.unsqueeze(-1).expand_as(x)
-            masked_loss = F.mse_loss(
-                masked_pred[mask_expanded.bool()],
-                x[mask_expanded.bool()]
-            )
+            masked_pred = outputs["masked_predictions"].float()
+            # Only compute loss on masked positions: weighted mean keeps
+            # shapes static (no boolean gather / host sync)
+            weights = mask.to(masked_pred.dtype)
+            if lengths is not None:
+                weights = weights * valid.to(weights.dtype)
+            masked_loss = _weighted_mean(self._regression_loss(masked_pred, x.float()), weights)
         
         # Combine losses
         total_loss = autoregressive_weight * ar_loss + masked_weight * masked_loss
@@ -410,11 +707,37 @@ class BrainLM(nn.Module):
             "masked_loss": masked_loss,
         }
     
-    @torch.no_grad()
+    def _regression_loss(
+        self,
+        predictions: torch.Tensor,
+        targets: torch.Tensor,
+        reduction: str = "none",
+    ) -> torch.Tensor:
+        """Per-element (or reduced) loss of the configured loss_type."""
+        if self.config.loss_type == "smooth_l1":
+            # Single fused kernel, less sensitive to fMRI outliers
+            return F.smooth_l1_loss(predictions, targets, reduction=reduction, beta=1.0)
+        return F.mse_loss(predictions, targets, reduction=reduction)
+    
+    def quantize_for_inference(self) -> "BrainLM":
+        """
+        INT8 dynamic-quantized copy of the model for CPU inference.
+        
+        All nn.Linear layers (projections, FFN and heads) get int8
+        weights; activations are quantized on the fly. The original
+        model is left untouched.
+        """
+        quantized = torch.ao.quantization.quantize_dynamic(
+            self, {nn.Linear}, dtype=torch.qint8
+        )
+        return quantized.eval()
+    
+    @torch.inference_mode()
     def get_embeddings(
         self,
         x: torch.Tensor,
         pooling: str = "cls",
+        quantized: bool = False,
     ) -> torch.Tensor:
         """
         Extract embeddings for downstream tasks.
@@ -422,18 +745,29 @@ class BrainLM(nn.Module):
         Args:
             x: (batch, seq_len, num_rois)
             pooling: "cls" or "mean"
+            quantized: Run an INT8 dynamic-quantized copy of the model
+                (CPU only). The copy is built on first use and reused,
+                so call after training is finished.
             
         Returns:
             (batch, d_model) embeddings
         """
-        outputs = self.forward(x)
+        if quantized:
+            model = self.__dict__.get("_quantized_model")
+            if model is None:
+                model = self.quantize_for_inference()
+                # Plain attribute, not a registered submodule
+                self.__dict__["_quantized_model"] = model
+            outputs = model.forward(x)
+        else:
+            outputs = self.forward(x)
         
         if pooling == "cls":
             return outputs["cls_embedding"]
         else:
             return outputs["hidden_states"].mean(dim=1)
     
-    @torch.no_grad()
+    @torch.inference_mode()
     def predict_future(
         self,
         x: torch.Tensor,
@@ -442,6 +776,11 @@ class BrainLM(nn.Module):
         """
         Autoregressively predict future brain states.
         
+        The prompt is encoded once and each step then feeds only the
+        latest prediction, reusing the cached keys/values of earlier
+        positions. Once the sequence outgrows max_seq_len the window is
+        slid and the cache rebuilt from it, since positions are absolute.
+        
         Args:
             x: (batch, seq_len, num_rois) - Initial sequence
             steps: Number of future steps to predict
@@ -449,22 +788,36 @@ class BrainLM(nn.Module):
         Returns:
             (batch, steps, num_rois) - Predicted future states
         """
-        predictions = []
-        current = x
-        
-        for _ in range(steps):
-            outputs = self.forward(current)
-            next_pred = outputs["predictions"][:, -1:]  # (batch, 1, num_rois)
-            predictions.append(next_pred)
-            
-            # Append prediction to input
-            current = torch.cat([current, next_pred], dim=1)
+        batch_size, prompt_len, _ = x.shape
+        max_len = self.config.max_seq_len
+        
+        # Prompt followed by predictions, written in place; the model
+        # input at every step is a view into this buffer
+        history = x.new_empty(batch_size, prompt_len + steps, self.config.num_rois)
+        history[:, :prompt_len] = x
+        predictions = history[:, prompt_len:]
+        
+        # Prime the cache with the prompt
+        outputs = self.forward(x, use_cache=True)
+        end = prompt_len
+        
+        for step in range(steps):
+            predictions[:, step] = outputs["predictions"][:, -1]
+            end += 1
+            if step == steps - 1:
+                break
             
-            # Keep sequence length manageable
-            if current.size(1) > self.config.max_seq_len:
-                current = current[:, -self.config.max_seq_len:]
-        
-        return torch.cat(predictions, dim=1)
+            if end > max_len:
+                # Keep sequence length manageable; re-encode the window
+                outputs = self.forward(history[:, end - max_len:end], use_cache=True)
+            else:
+                outputs = self.forward(
+                    history[:, end - 1:end],
+                    past_key_values=outputs["past_key_values"],
+                    use_cache=True,
+                )
+        
+        return predictions
 
 
 
@@ -44,6 +44,7 @@ class BrainJEPAConfig:
     mask_ratio: float = 0.5
     min_mask_patches: int = 4
     max_mask_patches: int = 16
+    reuse_mask_buffers: bool = False  # Masks overwrite the previous step's tensors
     
     # Training
     learning_rate: float = 1e-4
@@ -55,6 +56,15 @@ class BrainJEPAConfig:
     # Loss
     loss_type: str = "smooth_l1"  # or "mse", "cosine"
     
+    # Precision (target encoder and predictor; CUDA only)
+    amp_dtype: Optional[str] = "bf16"  # "bf16", "fp16" or None for fp32
+    
+    # Compilation
+    compile: bool = False  # torch.compile the forward pass (fixed shapes per run)
+    compile_mode: str = "reduce-overhead"
+    cuda_graph_training: bool = False  # train_step() replays a captured CUDA graph
+    cuda_graph_warmup_steps: int = 3  # Eager steps before capture
+    
     # Checkpointing
     checkpoint_dir: str = "checkpoints/brain_jepa"
 
@@ -19,11 +19,17 @@ import torch
 import torch.nn as nn
 import torch.nn.functional as F
 from typing import Optional, Tuple, Dict, List
-from einops import rearrange, repeat
 
 from .config import BrainJEPAConfig
 
 
+# BrainJEPAConfig.amp_dtype -> autocast dtype
+AMP_DTYPES = {
+    "bf16": torch.bfloat16,
+    "fp16": torch.float16,
+}
+
+
 class GradientPositionalEncoding(nn.Module):
     """
     Gradient-based positional encoding for brain ROIs.
@@ -47,6 +53,10 @@ class GradientPositionalEncoding(nn.Module):
         
         # Project to model dimension
         self.projection = nn.Linear(gradient_dim, d_model)
+        
+        # mean_encoding() result and the parameter versions it was built from
+        self._mean_cache: Optional[torch.Tensor] = None
+        self._mean_cache_key: Optional[Tuple] = None
     
     def forward(self, batch_size: int) -> torch.Tensor:
         """
@@ -55,8 +65,30 @@ class GradientPositionalEncoding(nn.Module):
         Returns:
             (batch, num_rois, d_model) - Gradient positional encodings
         """
-        grad_pos = repeat(self.gradient_embed, '1 r g -> b r g', b=batch_size)
-        return self.projection(grad_pos)
+        return self.projection(self.gradient_embed).expand(batch_size, -1, -1)
+    
+    def mean_encoding(self) -> torch.Tensor:
+        """
+        ROI-averaged encoding, (1, 1, d_model).
+        
+        Identical for every sample, so it is computed once rather than
+        per batch element. The projection is affine, so averaging the
+        gradient embeddings first gives the same result as averaging the
+        projected ones with a (1, gradient_dim) matmul instead of
+        (num_rois, gradient_dim). Outside autograd the result is cached
+        until the parameters are updated in place or moved.
+        """
+        if torch.is_grad_enabled() and self.gradient_embed.requires_grad:
+            return self.projection(self.gradient_embed.mean(dim=1, keepdim=True))
+        
+        params = (self.gradient_embed, self.projection.weight, self.projection.bias)
+        key = tuple((p._version, p.device, p.dtype) for p in params)
+        if self._mean_cache is None or self._mean_cache_key != key:
+            self._mean_cache = (
+                self.projection(self.gradient_embed.mean(dim=1, keepdim=True)).detach()
+            )
+            self._mean_cache_key = key
+        return self._mean_cache
 
 
 class TemporalPositionalEncoding(nn.Module):
@@ -99,6 +131,7 @@ class MaskGenerator:
         min_patches: int = 4,
         max_patches: int = 16,
         strategy: str = "dual",
+        reuse_buffers: bool = False,
     ):
         self.num_rois = num_rois
         self.seq_len = seq_len
@@ -106,14 +139,19 @@ class MaskGenerator:
         self.min_patches = min_patches
         self.max_patches = max_patches
         self.strategy = strategy
+        
+        # With reuse_buffers, every call writes into the same pair of
+        # tensors, so masks are only valid until the next generate()
+        self.reuse_buffers = reuse_buffers
+        self._mask_bufs: Optional[Tuple[torch.Tensor, torch.Tensor]] = None
     
     def generate(self, batch_size: int, device: torch.device) -> Tuple[torch.Tensor, torch.Tensor]:
         """
         Generate context and target masks.
         
         Returns:
-            context_mask: (batch, seq_len, num_rois) - 1 for visible
-            target_mask: (batch, seq_len, num_rois) - 1 for target
+            context_mask: (batch, seq_len, num_rois) bool - True for visible
+            target_mask: (batch, seq_len, num_rois) bool - True for target
         """
         if self.strategy == "cross_region":
             return self._cross_region_mask(batch_size, device)
@@ -122,6 +160,61 @@ class MaskGenerator:
         else:  # dual
             return self._dual_mask(batch_size, device)
     
+    def num_target_positions(self) -> int:
+        """
+        Time points per sample with at least one target ROI.
+        
+        Fixed by the strategy and ratios, so callers can size the
+        predictor queries without reading the masks back.
+        """
+        if self.strategy == "cross_region":
+            return self.seq_len if int(self.num_rois * self.mask_ratio) > 0 else 0
+        elif self.strategy == "cross_time":
+            return int(self.seq_len * self.mask_ratio)
+        else:  # dual
+            if int(self.num_rois * self.mask_ratio / 2) > 0:
+                return self.seq_len
+            return int(self.seq_len * self.mask_ratio / 2)
+    
+    def _output_buffers(
+        self,
+        batch_size: int,
+        device: torch.device,
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """(context, target) tensors to write the masks into."""
+        shape = (batch_size, self.seq_len, self.num_rois)
+        if not self.reuse_buffers:
+            return (
+                torch.empty(shape, dtype=torch.bool, device=device),
+                torch.empty(shape, dtype=torch.bool, device=device),
+            )
+        
+        bufs = self._mask_bufs
+        if bufs is None or bufs[0].shape != shape or bufs[0].device != torch.device(device):
+            bufs = self._mask_bufs = (
+                torch.empty(shape, dtype=torch.bool, device=device),
+                torch.empty(shape, dtype=torch.bool, device=device),
+            )
+        return bufs
+    
+    @staticmethod
+    def _fill_target(context_mask: torch.Tensor, target_mask: torch.Tensor) -> None:
+        """target_mask <- ~context_mask, in place."""
+        torch.logical_not(context_mask, out=target_mask)
+    
+    @staticmethod
+    def _keep_mask(
+        batch_size: int,
+        size: int,
+        num_masked: int,
+        device: torch.device,
+    ) -> torch.Tensor:
+        """(batch, size) bool mask, True except num_masked random entries per row."""
+        scores = torch.rand(batch_size, size, device=device)
+        masked = scores.topk(num_masked, dim=1).indices
+        keep = torch.ones(batch_size, size, dtype=torch.bool, device=device)
+        return keep.scatter_(1, masked, False)
+    
     def _cross_region_mask(
         self, 
         batch_size: int, 
@@ -130,16 +223,11 @@ class MaskGenerator:
         """Mask entire brain regions across all time points."""
         num_masked = int(self.num_rois * self.mask_ratio)
         
-        masks = []
-        for _ in range(batch_size):
-            # Random ROIs to mask
-            masked_rois = torch.randperm(self.num_rois)[:num_masked]
-            mask = torch.ones(self.seq_len, self.num_rois, device=device)
-            mask[:, masked_rois] = 0
-            masks.append(mask)
-        
-        context_mask = torch.stack(masks)
-        target_mask = 1 - context_mask
+        # Random ROIs to mask, broadcast over time
+        roi_keep = self._keep_mask(batch_size, self.num_rois, num_masked, device)
+        context_mask, target_mask = self._output_buffers(batch_size, device)
+        context_mask.copy_(roi_keep.unsqueeze(1).expand(-1, self.seq_len, -1))
+        self._fill_target(context_mask, target_mask)
         
         return context_mask, target_mask
     
@@ -151,16 +239,11 @@ class MaskGenerator:
         """Mask entire time windows across all ROIs."""
         num_masked = int(self.seq_len * self.mask_ratio)
         
-        masks = []
-        for _ in range(batch_size):
-            # Random time points to mask
-            masked_times = torch.randperm(self.seq_len)[:num_masked]
-            mask = torch.ones(self.seq_len, self.num_rois, device=device)
-            mask[masked_times, :] = 0
-            masks.append(mask)
-        
-        context_mask = torch.stack(masks)
-        target_mask = 1 - context_mask
+        # Random time points to mask, broadcast over ROIs
+        time_keep = self._keep_mask(batch_size, self.seq_len, num_masked, device)
+        context_mask, target_mask = self._output_buffers(batch_size, device)
+        context_mask.copy_(time_keep.unsqueeze(2).expand(-1, -1, self.num_rois))
+        self._fill_target(context_mask, target_mask)
         
         return context_mask, target_mask
     
@@ -174,26 +257,137 @@ class MaskGenerator:
         num_masked_rois = int(self.num_rois * self.mask_ratio / 2)
         num_masked_times = int(self.seq_len * self.mask_ratio / 2)
         
-        masks = []
-        for _ in range(batch_size):
-            mask = torch.ones(self.seq_len, self.num_rois, device=device)
-            
-            # Mask some ROIs
-            masked_rois = torch.randperm(self.num_rois)[:num_masked_rois]
-            mask[:, masked_rois] = 0
-            
-            # Mask some time points
-            masked_times = torch.randperm(self.seq_len)[:num_masked_times]
-            mask[masked_times, :] = 0
-            
-            masks.append(mask)
+        roi_keep = self._keep_mask(batch_size, self.num_rois, num_masked_rois, device)
+        time_keep = self._keep_mask(batch_size, self.seq_len, num_masked_times, device)
         
-        context_mask = torch.stack(masks)
-        target_mask = 1 - context_mask
+        # Visible only where both the ROI and the time point are kept
+        context_mask, target_mask = self._output_buffers(batch_size, device)
+        torch.logical_and(time_keep.unsqueeze(2), roi_keep.unsqueeze(1), out=context_mask)
+        self._fill_target(context_mask, target_mask)
         
         return context_mask, target_mask
 
 
+class SDPAttention(nn.Module):
+    """
+    Multi-head attention on F.scaled_dot_product_attention.
+    
+    Parameters use the nn.MultiheadAttention layout (packed
+    in_proj_weight/in_proj_bias plus out_proj), so checkpoints of the
+    nn.Transformer*Layer based encoder and predictor still load.
+    """
+    
+    def __init__(self, d_model: int, n_heads: int, dropout: float = 0.1):
+        super().__init__()
+        assert d_model % n_heads == 0
+        
+        self.d_model = d_model
+        self.n_heads = n_heads
+        self.head_dim = d_model // n_heads
+        self.p = dropout
+        
+        self.in_proj_weight = nn.Parameter(torch.empty(3 * d_model, d_model))
+        self.in_proj_bias = nn.Parameter(torch.zeros(3 * d_model))
+        self.out_proj = nn.Linear(d_model, d_model)
+        
+        nn.init.xavier_uniform_(self.in_proj_weight)
+        nn.init.zeros_(self.out_proj.bias)
+    
+    def _split_heads(self, x: torch.Tensor) -> torch.Tensor:
+        batch_size, seq_len, _ = x.shape
+        return x.view(batch_size, seq_len, self.n_heads, self.head_dim).transpose(1, 2)
+    
+    def forward(
+        self,
+        query: torch.Tensor,
+        key_value: Optional[torch.Tensor] = None,
+        key_padding_mask: Optional[torch.Tensor] = None,
+    ) -> torch.Tensor:
+        """
+        Args:
+            query: (batch, q_len, d_model)
+            key_value: (batch, kv_len, d_model), or None for self-attention
+            key_padding_mask: (batch, kv_len) - True for keys to ignore
+        Returns:
+            (batch, q_len, d_model)
+        """
+        if key_value is None:
+            q, k, v = F.linear(query, self.in_proj_weight, self.in_proj_bias).chunk(3, dim=-1)
+        else:
+            w_q, w_kv = self.in_proj_weight.split([self.d_model, 2 * self.d_model])
+            b_q, b_kv = self.in_proj_bias.split([self.d_model, 2 * self.d_model])
+            q = F.linear(query, w_q, b_q)
+            k, v = F.linear(key_value, w_kv, b_kv).chunk(2, dim=-1)
+        
+        attn_mask: Optional[torch.Tensor] = None
+        if key_padding_mask is not None:
+            attn_mask = ~key_padding_mask[:, None, None, :]
+        
+        out = F.scaled_dot_product_attention(
+            self._split_heads(q),
+            self._split_heads(k),
+            self._split_heads(v),
+            attn_mask=attn_mask,
+            dropout_p=self.p if self.training else 0.0,
+        )
+        
+        batch_size, _, q_len, _ = out.shape
+        out = out.transpose(1, 2).reshape(batch_size, q_len, self.d_model)
+        return self.out_proj(out)
+
+
+class EncoderLayer(nn.Module):
+    """Pre-norm encoder layer (nn.TransformerEncoderLayer layout) on SDPA."""
+    
+    def __init__(self, d_model: int, n_heads: int, d_ff: int, dropout: float = 0.1):
+        super().__init__()
+        
+        self.self_attn = SDPAttention(d_model, n_heads, dropout)
+        self.linear1 = nn.Linear(d_model, d_ff)
+        self.linear2 = nn.Linear(d_ff, d_model)
+        self.norm1 = nn.LayerNorm(d_model)
+        self.norm2 = nn.LayerNorm(d_model)
+        self.p = dropout
+    
+    def _feed_forward(self, x: torch.Tensor) -> torch.Tensor:
+        x = F.dropout(F.gelu(self.linear1(x)), self.p, self.training)
+        return F.dropout(self.linear2(x), self.p, self.training)
+    
+    def forward(
+        self,
+        x: torch.Tensor,
+        key_padding_mask: Optional[torch.Tensor] = None,
+    ) -> torch.Tensor:
+        attn_out = self.self_attn(self.norm1(x), key_padding_mask=key_padding_mask)
+        x = x + F.dropout(attn_out, self.p, self.training)
+        return x + self._feed_forward(self.norm2(x))
+
+
+class DecoderLayer(EncoderLayer):
+    """Pre-norm decoder layer (nn.TransformerDecoderLayer layout) on SDPA."""
+    
+    def __init__(self, d_model: int, n_heads: int, d_ff: int, dropout: float = 0.1):
+        super().__init__(d_model, n_heads, d_ff, dropout)
+        
+        self.multihead_attn = SDPAttention(d_model, n_heads, dropout)
+        self.norm3 = nn.LayerNorm(d_model)
+    
+    def forward(
+        self,
+        x: torch.Tensor,
+        memory: torch.Tensor,
+        memory_key_padding_mask: Optional[torch.Tensor] = None,
+        key_padding_mask: Optional[torch.Tensor] = None,
+    ) -> torch.Tensor:
+        attn_out = self.self_attn(self.norm1(x), key_padding_mask=key_padding_mask)
+        x = x + F.dropout(attn_out, self.p, self.training)
+        cross_out = self.multihead_attn(
+            self.norm2(x), memory, key_padding_mask=memory_key_padding_mask
+        )
+        x = x + F.dropout(cross_out, self.p, self.training)
+        return x + self._feed_forward(self.norm3(x))
+
+
 class TransformerEncoder(nn.Module):
     """Transformer encoder for context/target encoding."""
     
@@ -207,32 +401,32 @@ class TransformerEncoder(nn.Module):
     ):
         super().__init__()
         
-        encoder_layer = nn.TransformerEncoderLayer(
-            d_model=d_model,
-            nhead=n_heads,
-            dim_feedforward=d_ff,
-            dropout=dropout,
-            activation='gelu',
-            batch_first=True,
-            norm_first=True,  # Pre-norm
-        )
-        
-        self.layers = nn.TransformerEncoder(
-            encoder_layer,
-            num_layers=n_layers,
-        )
+        self.layers = nn.ModuleList([
+            EncoderLayer(d_model, n_heads, d_ff, dropout)  # Pre-norm
+            for _ in range(n_layers)
+        ])
         
         self.norm = nn.LayerNorm(d_model)
+        
+        self._register_load_state_dict_pre_hook(self._rename_legacy_state)
+    
+    @staticmethod
+    def _rename_legacy_state(state_dict, prefix, *args) -> None:
+        """Load checkpoints saved with the nn.TransformerEncoder stack."""
+        legacy = f"{prefix}layers.layers."
+        for key in [k for k in state_dict if k.startswith(legacy)]:
+            state_dict[f"{prefix}layers.{key[len(legacy):]}"] = state_dict.pop(key)
     
     def forward(self, x: torch.Tensor, mask: Optional[torch.Tensor] = None) -> torch.Tensor:
         """
         Args:
             x: (batch, seq_len, d_model)
-            mask: Optional attention mask
+            mask: Optional key padding mask, True for positions to ignore
         Returns:
             (batch, seq_len, d_model)
         """
-        x = self.layers(x, src_key_padding_mask=mask)
+        for layer in self.layers:
+            x = layer(x, key_padding_mask=mask)
         return self.norm(x)
 
 
@@ -258,15 +452,7 @@ class Predictor(nn.Module):
         
         # Cross-attention layers
         self.layers = nn.ModuleList([
-            nn.TransformerDecoderLayer(
-                d_model=d_model,
-                nhead=n_heads,
-                dim_feedforward=hidden_dim * 4,
-                dropout=dropout,
-                activation='gelu',
-                batch_first=True,
-                norm_first=True,
-            )
+            DecoderLayer(d_model, n_heads, hidden_dim * 4, dropout)  # Pre-norm
             for _ in range(n_layers)
         ])
         
@@ -277,29 +463,70 @@ class Predictor(nn.Module):
         self,
         context: torch.Tensor,
         target_positions: torch.Tensor,
+        context_padding_mask: Optional[torch.Tensor] = None,
+        target_padding_mask: Optional[torch.Tensor] = None,
     ) -> torch.Tensor:
         """
         Args:
             context: (batch, context_len, d_model) - Encoded context
             target_positions: (batch, target_len, d_model) - Target position encodings
+            context_padding_mask: (batch, context_len) - True for context
+                positions to ignore
+            target_padding_mask: (batch, target_len) - True for padding
+                target slots (not attended to by other targets)
             
         Returns:
             (batch, target_len, d_model) - Predicted target representations
         """
-        batch_size, target_len, _ = target_positions.shape
-        
-        # Initialize target tokens
-        targets = repeat(self.target_tokens, '1 1 d -> b n d', b=batch_size, n=target_len)
-        targets = targets + target_positions
+        # Initialize target tokens: (1, 1, d_model) broadcasts in the add
+        targets = target_positions + self.target_tokens
         
         # Cross-attend to context
         for layer in self.layers:
-            targets = layer(targets, context)
+            targets = layer(targets, context, context_padding_mask, target_padding_mask)
         
         targets = self.norm(targets)
         return self.projection(targets)
 
 
+class EmbeddingExtractor(nn.Module):
+    """
+    Inference-only BrainJEPA.get_embeddings path.
+    
+    Holds just the input projection, the context encoder and the summed
+    positional table, so it can be compiled with torch.jit.script.
+    Build it through BrainJEPA.to_scripted_embedder().
+    """
+    
+    def __init__(self, model: "BrainJEPA"):
+        super().__init__()
+        
+        self.input_proj = model.input_proj
+        self.context_encoder = model.context_encoder
+        
+        # Temporal + ROI-averaged gradient positions, as in _prepare_input
+        with torch.no_grad():
+            pos = model.temporal_pos.pe
+            if model.config.use_gradient_pos:
+                pos = pos + model.gradient_pos.mean_encoding()
+        self.register_buffer('pos', pos.clone())
+    
+    def forward(self, x: torch.Tensor, pooling: str = "mean") -> torch.Tensor:
+        """
+        Args:
+            x: (batch, seq_len, num_rois)
+            pooling: "mean", "cls", or anything else for all positions
+        """
+        encoded = self.context_encoder(self.input_proj(x) + self.pos[:, :x.size(1)])
+        
+        if pooling == "mean":
+            return encoded.mean(dim=1)
+        elif pooling == "cls":
+            return encoded[:, 0]
+        else:
+            return encoded
+
+
 class BrainJEPA(nn.Module):
     """
     Brain-JEPA: Joint-Embedding Predictive Architecture for Brain Dynamics
@@ -351,6 +578,11 @@ class BrainJEPA(nn.Module):
         for param in self.target_encoder.parameters():
             param.requires_grad = False
         
+        # Parameter pairs for the EMA update (Module.to() keeps the
+        # Parameter objects, so these stay valid across device moves)
+        self._ctx_params = list(self.context_encoder.parameters())
+        self._tgt_params = list(self.target_encoder.parameters())
+        
         # Predictor
         self.predictor = Predictor(
             config.d_model,
@@ -368,37 +600,62 @@ class BrainJEPA(nn.Module):
             config.min_mask_patches,
             config.max_mask_patches,
             config.mask_strategy,
+            reuse_buffers=config.reuse_mask_buffers,
         )
+        
+        # Reduced precision for the target encoder and predictor
+        self.amp_dtype = AMP_DTYPES.get(config.amp_dtype) if config.amp_dtype else None
+        
+        # CUDA graph state for train_step()
+        self._train_graph: Optional[torch.cuda.CUDAGraph] = None
+        self._train_graph_x: Optional[torch.Tensor] = None
+        self._train_graph_loss: Optional[torch.Tensor] = None
+        self._train_graph_warmup = config.cuda_graph_warmup_steps
+        
+        # Compiled tensor part of forward(); mask sampling stays eager
+        self._compiled_forward = None
+        if config.compile:
+            self._compiled_forward = torch.compile(
+                self._forward_impl, dynamic=False, mode=config.compile_mode
+            )
     
     @torch.no_grad()
     def _update_target_encoder(self):
         """Update target encoder with EMA."""
-        for param_q, param_k in zip(
-            self.context_encoder.parameters(),
-            self.target_encoder.parameters()
-        ):
-            param_k.data = (
-                self.config.ema_decay * param_k.data +
-                (1 - self.config.ema_decay) * param_q.data
-            )
+        # target <- decay * target + (1 - decay) * context, as multi-tensor kernels
+        torch._foreach_lerp_(
+            self._tgt_params, self._ctx_params, 1 - self.config.ema_decay
+        )
+    
+    def _autocast(self, device: torch.device) -> torch.autocast:
+        """Autocast context for the reduced-precision paths (CUDA only)."""
+        return torch.autocast(
+            device.type,
+            dtype=self.amp_dtype or torch.bfloat16,
+            enabled=self.amp_dtype is not None and device.type == 'cuda',
+            cache_enabled=False,  # Required inside CUDA graph capture
+        )
     
     def _prepare_input(self, x: torch.Tensor) -> torch.Tensor:
         """Prepare input with positional encodings."""
         batch_size, seq_len, num_rois = x.shape
         
+        # Sliced or transposed inputs would make the projection GEMM
+        # copy or stride through memory anyway; do it once up front
+        if not x.is_contiguous():
+            x = x.contiguous()
+        
         # Project input
         x = self.input_proj(x)  # (batch, seq_len, d_model)
         
-        # Add temporal position
-        x = x + self.temporal_pos(seq_len)
-        
-        # Add gradient position (if using)
+        # Temporal position, plus gradient position averaged over ROIs
+        # (if using); summed at (1, seq_len, d_model) before one broadcast add
+        pos = self.temporal_pos(seq_len)
         if self.config.use_gradient_pos:
-            # Average gradient pos across time for simplicity
-            grad_pos = self.gradient_pos(batch_size)
-            x = x + grad_pos.mean(dim=1, keepdim=True)
+            pos = pos + self.gradient_pos.mean_encoding()
         
-        return x
+        # In place: the projection's backward does not need its output
+        return x.add_(pos)
     
     def forward(
         self,
@@ -411,42 +668,85 @@ class BrainJEPA(nn.Module):
         
         Args:
             x: (batch, seq_len, num_rois) - fMRI time series
-            context_mask: (batch, seq_len, num_rois) - 1 for context
-            target_mask: (batch, seq_len, num_rois) - 1 for target
+            context_mask: (batch, seq_len, num_rois) - True (or 1) for context
+            target_mask: (batch, seq_len, num_rois) - True (or 1) for target
             
         Returns:
             Dict with predictions, targets, and embeddings
         """
         batch_size, seq_len, _ = x.shape
         
-        # Generate masks if not provided
+        # Generate masks if not provided; their target count is known
+        # up front, so no device sync is needed to size the predictor
+        num_queries = None
         if context_mask is None or target_mask is None:
             context_mask, target_mask = self.mask_generator.generate(
                 batch_size, x.device
             )
+            num_queries = self.mask_generator.num_target_positions()
+        else:
+            # Accept 0/1 float masks; no-op for bool
+            context_mask, target_mask = context_mask.bool(), target_mask.bool()
         
-        # Prepare input
-        x_prepared = self._prepare_input(x)
+        forward_impl = self._compiled_forward or self._forward_impl
+        return forward_impl(x, context_mask, target_mask, num_queries)
+    
+    def _forward_impl(
+        self,
+        x: torch.Tensor,
+        context_mask: torch.Tensor,
+        target_mask: torch.Tensor,
+        num_queries: Optional[int] = None,
+    ) -> Dict[str, torch.Tensor]:
+        """
+        Encoders and predictor for given masks (the torch.compile region).
         
-        # Encode context (visible parts)
-        context_input = x_prepared * context_mask.unsqueeze(-1).float()
-        context_encoded = self.context_encoder(context_input)
+        num_queries is the largest number of target time points per
+        sample; read from the masks when not given.
+        """
+        batch_size, seq_len, _ = x.shape
         
-        # Encode targets (with EMA encoder, no gradient)
-        with torch.no_grad():
-            target_input = x_prepared * target_mask.unsqueeze(-1).float()
-            target_encoded = self.target_encoder(target_input)
+        # Encode context (visible parts): hidden ROIs are zeroed in the
+        # raw signal, and fully hidden time points are not attended to
+        context_input = self._prepare_input(torch.where(context_mask, x, 0.0))
+        context_padding = ~context_mask.any(dim=-1)  # (batch, seq_len)
+        context_encoded = self.context_encoder(context_input, mask=context_padding)
         
-        # Get target positions for predictor
-        target_positions = self.temporal_pos(seq_len).expand(batch_size, -1, -1)
-        target_positions = target_positions * target_mask.any(dim=-1, keepdim=True).float()
+        # Encode the full, unmasked sequence with the EMA encoder (no
+        # gradient, so its input projection builds no graph either);
+        # compute_loss picks out the target positions
+        with torch.no_grad():
+            x_prepared = self._prepare_input(x)
+            with self._autocast(x.device):
+                target_encoded = self.target_encoder(x_prepared)
+        
+        # Query only the time points that hold targets: active positions
+        # first per sample, padded to the largest count in the batch
+        active = target_mask.any(dim=-1)  # (batch, seq_len)
+        counts = active.sum(dim=1)
+        if num_queries is None:
+            num_queries = int(counts.max())
+        order = torch.argsort((~active).to(torch.int8), dim=1, stable=True)[:, :num_queries]
+        query_padding = (
+            torch.arange(num_queries, device=x.device) >= counts.unsqueeze(1)
+        )  # (batch, num_queries)
+        target_positions = self.temporal_pos(seq_len)[0][order]  # (batch, num_queries, d_model)
         
         # Predict targets from context
-        predictions = self.predictor(context_encoded, target_positions)
+        with self._autocast(x.device):
+            packed = self.predictor(
+                context_encoded, target_positions, context_padding, query_padding
+            )
+        
+        # Back to (batch, seq_len, d_model); non-target positions stay zero
+        packed = packed.masked_fill(query_padding.unsqueeze(-1), 0.0)
+        predictions = packed.new_zeros(batch_size, seq_len, packed.size(-1))
+        predictions.scatter_(1, order.unsqueeze(-1).expand_as(packed), packed)
         
         return {
             "predictions": predictions,
-            "targets": target_encoded.detach(),
+            # Produced under no_grad, so already outside autograd
+            "targets": target_encoded,
             "context_encoded": context_encoded,
             "context_mask": context_mask,
             "target_mask": target_mask,
@@ -457,43 +757,98 @@ class BrainJEPA(nn.Module):
         x: torch.Tensor,
         context_mask: Optional[torch.Tensor] = None,
         target_mask: Optional[torch.Tensor] = None,
+        return_targets: bool = True,
     ) -> Dict[str, torch.Tensor]:
         """
         Compute JEPA loss.
         
-        Loss is computed in latent space on target positions only.
+        Loss is computed in latent space on target positions only, as a
+        masked mean so no data-dependent shapes are involved.
+        
+        Args:
+            return_targets: Also gather pred_targets/true_targets at the
+                target positions (a device sync; off in train_step)
         """
         outputs = self.forward(x, context_mask, target_mask)
         
-        predictions = outputs["predictions"]
-        targets = outputs["targets"]
+        # Loss in fp32 whatever the autocast dtype
+        predictions = outputs["predictions"].float()
+        targets = outputs["targets"].float()
         target_mask = outputs["target_mask"]
         
         # Only compute loss on target positions
-        target_positions = target_mask.any(dim=-1)  # (batch, seq_len)
-        
-        # Gather predictions and targets at target positions
-        pred_targets = predictions[target_positions]
-        true_targets = targets[target_positions]
+        target_positions = target_mask.bool().any(dim=-1)  # (batch, seq_len)
+        weights = target_positions.to(predictions.dtype)
+        n_positions = weights.sum().clamp_min(1.0)
         
         # Loss
-        if self.config.loss_type == "mse":
-            loss = F.mse_loss(pred_targets, true_targets)
-        elif self.config.loss_type == "smooth_l1":
-            loss = F.smooth_l1_loss(pred_targets, true_targets)
-        elif self.config.loss_type == "cosine":
-            loss = 1 - F.cosine_similarity(pred_targets, true_targets, dim=-1).mean()
+        if self.config.loss_type == "cosine":
+            per_position = 1 - F.cosine_similarity(predictions, targets, dim=-1)
+            loss = (per_position * weights).sum() / n_positions
         else:
-            loss = F.mse_loss(pred_targets, true_targets)
+            if self.config.loss_type == "smooth_l1":
+                errors = F.smooth_l1_loss(predictions, targets, reduction="none")
+            else:
+                errors = F.mse_loss(predictions, targets, reduction="none")
+            loss = (errors * weights.unsqueeze(-1)).sum() / (n_positions * errors.size(-1))
         
         # Update target encoder
         self._update_target_encoder()
         
-        return {
-            "loss": loss,
-            "pred_targets": pred_targets,
-            "true_targets": true_targets,
-        }
+        result = {"loss": loss}
+        if return_targets:
+            result["pred_targets"] = predictions[target_positions]
+            result["true_targets"] = targets[target_positions]
+        return result
+    
+    def _backward_step(self, x: torch.Tensor) -> torch.Tensor:
+        loss = self.compute_loss(x, return_targets=False)["loss"]
+        loss.backward()
+        return loss.detach()
+    
+    def train_step(self, x: torch.Tensor) -> torch.Tensor:
+        """
+        compute_loss + backward for one batch; returns the loss.
+        
+        With config.cuda_graph_training on a CUDA input, the first
+        cuda_graph_warmup_steps calls run eagerly, then the whole step
+        (mask sampling, both encoders, predictor, loss, backward and the
+        EMA update) is captured once and replayed for every later batch
+        of the same shape. Gradients accumulate into the existing .grad
+        tensors, so zero them with zero_grad(set_to_none=False) and run
+        the optimizer outside this call. The returned loss tensor is
+        overwritten by the next replay.
+        """
+        if not (self.config.cuda_graph_training and x.is_cuda):
+            return self._backward_step(x)
+        
+        if self._train_graph is not None:
+            if self._train_graph_x.shape == x.shape:
+                self._train_graph_x.copy_(x)
+                self._train_graph.replay()
+                return self._train_graph_loss
+            # New shape: warm up and capture again
+            self._train_graph = None
+            self._train_graph_warmup = self.config.cuda_graph_warmup_steps
+        
+        if self._train_graph_warmup > 0:
+            self._train_graph_warmup -= 1
+            # Warm up on a side stream, as capture requires
+            stream = torch.cuda.Stream()
+            stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(stream):
+                loss = self._backward_step(x)
+            torch.cuda.current_stream().wait_stream(stream)
+            return loss
+        
+        self._train_graph_x = x.clone()
+        self._train_graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(self._train_graph):
+            self._train_graph_loss = self._backward_step(self._train_graph_x)
+        
+        # Capture only records the step; run it for this batch
+        self._train_graph.replay()
+        return self._train_graph_loss
     
     @torch.no_grad()
     def get_embeddings(
@@ -511,6 +866,16 @@ class BrainJEPA(nn.Module):
             return encoded[:, 0]
         else:
             return encoded
+    
+    def to_scripted_embedder(self) -> torch.jit.ScriptModule:
+        """
+        Frozen TorchScript module computing get_embeddings(x, pooling).
+        
+        Weights are snapshotted into the frozen module, so rebuild it after
+        further training. Eager training and get_embeddings are unaffected.
+        """
+        extractor = EmbeddingExtractor(self).eval()
+        return torch.jit.freeze(torch.jit.script(extractor))
 
 
 
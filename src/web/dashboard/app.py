@@ -7,12 +7,15 @@ Streamlit-based dashboard for program management and monitoring.
 Run with: streamlit run src/web/dashboard/app.py
 """
 
+import httpx
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
+from plotly.colors import qualitative
 import plotly.graph_objects as go
 from datetime import datetime, date
 from pathlib import Path
+from typing import List, Optional, Tuple
 import json
 import sys
 
@@ -33,7 +36,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -57,6 +60,15 @@ st.markdown("""
         font-size: 0.9rem;
         opacity: 0.9;
     }
+    .metric-delta {
+        font-size: 0.8rem;
+        opacity: 0.75;
+    }
+    .kpi-grid {
+        display: grid;
+        grid-template-columns: repeat(4, 1fr);
+        gap: 1rem;
+    }
     .section-header {
         font-size: 1.5rem;
         font-weight: 600;
@@ -67,77 +79,143 @@ st.markdown("""
         padding-bottom: 0.5rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+# Static sample content
+ACTIVITIES = (
+    {"date": "2025-12-01", "type": "📄", "description": "김철수 - NeurIPS workshop paper submitted"},
+    {"date": "2025-11-28", "type": "🎓", "description": "이영희 - Princeton visit completed"},
+    {"date": "2025-11-25", "type": "💻", "description": "박민준 - Brain-JEPA v0.2 released"},
+    {"date": "2025-11-20", "type": "🏆", "description": "정수진 - Best poster award at OHBM"},
+    {"date": "2025-11-15", "type": "📊", "description": "Q3 evaluation completed for all fellows"},
+)
+
+MENTORS = (
+    {
+        "name": "유신재 교수",
+        "affiliation": "Brookhaven National Laboratory",
+        "expertise": "Brain Imaging, Biomarkers",
+        "fellows": 2,
+        "hours": 45,
+        "status": "🟢 Active"
+    },
+    {
+        "name": "박기태 박사",
+        "affiliation": "Brookhaven National Laboratory",
+        "expertise": "Computational Neuroscience, ML",
+        "fellows": 1,
+        "hours": 32,
+        "status": "🟢 Active"
+    },
+    {
+        "name": "Uri Hasson",
+        "affiliation": "Princeton University",
+        "expertise": "Language-Brain, Neural Communication",
+        "fellows": 2,
+        "hours": 28,
+        "status": "🟢 Active"
+    },
+)
+
+PROJECTS = (
+    {
+        "title": "BrainLM Korean Adaptation",
+        "lead": "김철수",
+        "progress": 65,
+        "status": "On Track",
+        "next_milestone": "ICLR 2026 submission"
+    },
+    {
+        "title": "Language-Brain Alignment Study",
+        "lead": "이영희",
+        "progress": 80,
+        "status": "Ahead",
+        "next_milestone": "Nature Neuro revision"
+    },
+    {
+        "title": "Brain-JEPA Multimodal Extension",
+        "lead": "박민준",
+        "progress": 45,
+        "status": "On Track",
+        "next_milestone": "NeurIPS 2026 workshop"
+    },
+)
+
+PUBLICATION_PIPELINE = {
+    "In Progress": ("BrainLM Korean Dataset Paper", "Multimodal Review Article"),
+    "Under Review": ("Language-Brain Alignment (Nature Neuro)", "Brain-JEPA Extension (arXiv)"),
+    "Accepted": ("Foundation Models in Neuroscience (Book Chapter)",),
+    "Published": ("ICLR Workshop 2025 Paper", "OHBM Abstract 2025"),
+}
+
+PERFORMANCE_CATEGORIES = ("Research", "Publications", "Participation", "Collaboration", "Initiative")
+PERFORMANCE_SCORES = {  # Sample scores per fellow, in PERFORMANCE_CATEGORIES order
+    "F2025-001": (85, 90, 88, 82, 87),
+    "F2025-002": (93, 95, 90, 88, 91),
+    "F2025-003": (86, 70, 89, 85, 84),
+    "F2025-004": (91, 88, 90, 92, 89),
+    "F2025-005": (88, 85, 86, 84, 90),
+}
+
+MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+MONTHLY_SPENDING = np.array(
+    [15, 18, 22, 25, 30, 35, 40, 45, 50, 55, 60, 65], dtype=np.int16
+)  # Cumulative (millions)
+
+SET2_COLORS = qualitative.Set2
+
+
+@st.cache_resource
+def _inject_css():
+    """Emit the custom CSS; reruns replay the cached element."""
+    st.markdown(CSS, unsafe_allow_html=True)
+
 
+LOGO_URL = "https://via.placeholder.com/200x80?text=Connectome+Lab"
 
+
+@st.cache_resource
+def _logo() -> Optional[bytes]:
+    """Sidebar logo, fetched once per server process (None if unreachable)."""
+    try:
+        response = httpx.get(LOGO_URL, timeout=5.0, follow_redirects=True)
+        response.raise_for_status()
+    except httpx.HTTPError:
+        return None
+    return response.content
+
+
+@st.cache_data(ttl="1h")
 def load_sample_data():
     """Load sample data for demonstration."""
-    # Sample fellows data
-    fellows_data = [
-        {
-            "id": "F2025-001",
-            "name": "김철수",
-            "department": "전기정보공학부",
-            "status": "active",
-            "cohort": 2025,
-            "mentor": "유신재 교수",
-            "research_area": "BrainLM",
-            "score": 88,
-            "publications": 1,
-            "presentations": 2,
-        },
-        {
-            "id": "F2025-002",
-            "name": "이영희",
-            "department": "심리학과",
-            "status": "active",
-            "cohort": 2025,
-            "mentor": "Uri Hasson",
-            "research_area": "Language-Brain Alignment",
-            "score": 92,
-            "publications": 2,
-            "presentations": 3,
-        },
-        {
-            "id": "F2025-003",
-            "name": "박민준",
-            "department": "의과대학",
-            "status": "active",
-            "cohort": 2025,
-            "mentor": "박기태 박사",
-            "research_area": "Brain-JEPA",
-            "score": 85,
-            "publications": 0,
-            "presentations": 1,
-        },
-        {
-            "id": "F2025-004",
-            "name": "정수진",
-            "department": "자유전공학부",
-            "status": "active",
-            "cohort": 2025,
-            "mentor": "유신재 교수",
-            "research_area": "Multimodal Brain FM",
-            "score": 90,
-            "publications": 1,
-            "presentations": 2,
-        },
-        {
-            "id": "F2025-005",
-            "name": "최현우",
-            "department": "컴퓨터공학부",
-            "status": "active",
-            "cohort": 2025,
-            "mentor": "Uri Hasson",
-            "research_area": "Generative Brain Models",
-            "score": 87,
-            "publications": 1,
-            "presentations": 1,
-        },
-    ]
+    # Sample fellows data, one list per column
+    fellows_data = {
+        "id": ["F2025-001", "F2025-002", "F2025-003", "F2025-004", "F2025-005"],
+        "name": ["김철수", "이영희", "박민준", "정수진", "최현우"],
+        "department": pd.Categorical(
+            ["전기정보공학부", "심리학과", "의과대학", "자유전공학부", "컴퓨터공학부"]
+        ),
+        "status": pd.Categorical(["active", "active", "active", "active", "active"]),
+        "cohort": np.array([2025, 2025, 2025, 2025, 2025], dtype=np.int16),
+        "mentor": pd.Categorical(
+            ["유신재 교수", "Uri Hasson", "박기태 박사", "유신재 교수", "Uri Hasson"]
+        ),
+        "research_area": pd.Categorical([
+            "BrainLM",
+            "Language-Brain Alignment",
+            "Brain-JEPA",
+            "Multimodal Brain FM",
+            "Generative Brain Models",
+        ]),
+        "score": np.array([88, 92, 85, 90, 87], dtype=np.int8),
+        "publications": np.array([1, 2, 0, 1, 1], dtype=np.int8),
+        "presentations": np.array([2, 3, 1, 2, 1], dtype=np.int8),
+    }
     return pd.DataFrame(fellows_data)
 
 
+@st.cache_data(ttl="1h")
 def load_budget_data():
     """Load budget tracking data."""
     return {
@@ -152,9 +230,239 @@ def load_budget_data():
     }
 
 
+@st.cache_data(ttl="60s")
+def _now_stamp() -> str:
+    """Current time at minute resolution for the sidebar footer."""
+    return datetime.now().strftime('%Y-%m-%d %H:%M')
+
+
+@st.cache_data
+def _budget_table(budget_data: dict) -> pd.DataFrame:
+    """One row per budget category with spend and utilization (%)."""
+    categories = budget_data['categories']
+    spent = np.array([c['spent'] for c in categories.values()], dtype=np.int64)
+    budget = np.array([c['budget'] for c in categories.values()], dtype=np.int64)
+    return pd.DataFrame({
+        "category": list(categories),
+        "spent": spent,
+        "budget": budget,
+        "utilization": spent / budget * 100,
+    })
+
+
+@st.cache_data
+def _overview_kpis(fellows_df: pd.DataFrame):
+    """Active fellow count, total publications and mean score."""
+    active = int((fellows_df['status'].to_numpy() == 'active').sum())
+    publications = int(fellows_df['publications'].to_numpy().sum())
+    avg_score = float(fellows_df['score'].to_numpy().mean())
+    return active, publications, avg_score
+
+
+@st.cache_data
+def _dept_summary(fellows_df: pd.DataFrame) -> pd.DataFrame:
+    """Per-department fellow, activity and score totals."""
+    return (
+        fellows_df
+        .assign(active=fellows_df['status'] == 'active')
+        .groupby('department', observed=True, sort=False)
+        .agg(
+            fellows=('id', 'size'),
+            active=('active', 'sum'),
+            publications=('publications', 'sum'),
+            presentations=('presentations', 'sum'),
+            score=('score', 'mean'),
+        )
+    )
+
+
+@st.cache_data
+def _dept_pie(fellows_df: pd.DataFrame) -> go.Figure:
+    """Pie chart of fellows per department."""
+    dept_counts = _dept_summary(fellows_df)['fellows']
+    fig = go.Figure(go.Pie(
+        values=dept_counts.to_numpy(),
+        labels=dept_counts.index.tolist(),
+        marker=dict(colors=SET2_COLORS)
+    ))
+    fig.update_layout(margin=dict(t=20, b=20, l=20, r=20))
+    return fig
+
+
+@st.cache_data
+def _area_bar(fellows_df: pd.DataFrame) -> go.Figure:
+    """Bar chart of fellows per research area."""
+    area_counts = fellows_df['research_area'].value_counts()
+    fig = go.Figure(go.Bar(
+        x=area_counts.index.tolist(),
+        y=area_counts.to_numpy(),
+        marker=dict(color=area_counts.to_numpy(), colorscale='Viridis')
+    ))
+    fig.update_layout(
+        xaxis_title="Research Area",
+        yaxis_title="Fellows",
+        showlegend=False,
+        margin=dict(t=20, b=20, l=20, r=20)
+    )
+    return fig
+
+
+@st.cache_data(max_entries=len(PERFORMANCE_SCORES))
+def _performance_bar(fellow_id: str) -> go.Figure:
+    """Performance breakdown chart for the fellow detail panel."""
+    scores = PERFORMANCE_SCORES[fellow_id]
+    fig = go.Figure(go.Bar(
+        x=PERFORMANCE_CATEGORIES,
+        y=scores,
+        marker=dict(color=scores, colorscale="RdYlGn", cmin=0, cmax=100)
+    ))
+    fig.update_layout(
+        title="Performance Breakdown",
+        xaxis_title="Category",
+        yaxis_title="Score",
+        yaxis_range=[0, 100],
+        showlegend=False
+    )
+    return fig
+
+
+# Traces longer than this are downsampled before plotting
+MAX_TRACE_POINTS = 2000
+
+
+def _lttb_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; every bucket in between
+    keeps the point forming the largest triangle with the previously
+    kept point and the mean of the next bucket.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    x = np.arange(n, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        cx = x[next_start:next_end].mean()
+        cy = y[next_start:next_end].mean()
+        area = np.abs(
+            (x[a] - cx) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (cy - y[a])
+        )
+        a = start + int(area.argmax())
+        kept[i + 1] = a
+    return kept
+
+
+def _downsample(x, y, n_out: int = MAX_TRACE_POINTS):
+    """LTTB-downsample a trace to at most `n_out` points."""
+    x, y = np.asarray(x), np.asarray(y)
+    if len(y) <= n_out:
+        return x, y
+    kept = _lttb_indices(y, n_out)
+    return x[kept], y[kept]
+
+
+@st.cache_data
+def _spending_trend() -> go.Figure:
+    """Cumulative monthly spending chart."""
+    months, spending = _downsample(MONTHS, MONTHLY_SPENDING)
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=months,
+        y=spending,
+        mode='lines+markers',
+        fill='tozeroy',
+        line=dict(color='#667eea', width=3),
+        marker=dict(size=8)
+    ))
+    fig.update_layout(
+        yaxis_title="Cumulative Spending (Million ₩)",
+        xaxis_title="Month",
+        showlegend=False
+    )
+    return fig
+
+
+@st.cache_data
+def _dept_choices(fellows_df: pd.DataFrame) -> List[str]:
+    """Options for the Fellows department filter."""
+    return ["All"] + sorted(fellows_df['department'].unique().tolist())
+
+
+@st.cache_data
+def _fellows_by_id(fellows_df: pd.DataFrame) -> pd.DataFrame:
+    """Fellows indexed by ID for detail-panel lookups."""
+    return fellows_df.set_index('id', drop=False)
+
+
+@st.cache_data
+def _search_index(fellows_df: pd.DataFrame):
+    """Lowercased name and ID arrays for the Fellows search box."""
+    return (
+        fellows_df['name'].str.lower().to_numpy(),
+        fellows_df['id'].str.lower().to_numpy(),
+    )
+
+
+def _search_mask(fellows_df: pd.DataFrame, search: str) -> np.ndarray:
+    """Boolean mask of fellows whose name or ID contains `search`."""
+    names, ids = _search_index(fellows_df)
+    query = search.lower()
+    return np.fromiter(
+        (query in name or query in fellow_id for name, fellow_id in zip(names, ids)),
+        dtype=bool,
+        count=len(names),
+    )
+
+
+def _apply_filters(
+    fellows_df: pd.DataFrame,
+    status_filter: str,
+    dept_filter: str,
+    search: str,
+) -> pd.DataFrame:
+    """Fellows matching the status, department and search filters."""
+    mask = np.ones(len(fellows_df), dtype=bool)
+    if status_filter != "All":
+        mask &= (fellows_df['status'] == status_filter).to_numpy()
+    if dept_filter != "All":
+        mask &= (fellows_df['department'] == dept_filter).to_numpy()
+    if search:
+        mask &= _search_mask(fellows_df, search)
+    return fellows_df.loc[mask]
+
+
+def _kpi_grid(cards: List[Tuple[str, str, Optional[str]]]) -> str:
+    """HTML for a row of metric cards given (label, value, delta) tuples."""
+    html = []
+    for label, value, delta in cards:
+        delta_html = f'<div class="metric-delta">{delta}</div>' if delta else ''
+        html.append(
+            '<div class="metric-card">'
+            f'<div class="metric-label">{label}</div>'
+            f'<div class="metric-value">{value}</div>'
+            f'{delta_html}'
+            '</div>'
+        )
+    return f'<div class="kpi-grid">{"".join(html)}</div>'
+
+
 def main():
     """Main dashboard application."""
     
+    _inject_css()
+    
     # Header
     st.markdown('<h1 class="main-header">🧠 SNU Connectome Fellows Program</h1>', unsafe_allow_html=True)
     st.markdown(
@@ -166,7 +474,9 @@ def main():
     
     # Sidebar
     with st.sidebar:
-        st.image("https://via.placeholder.com/200x80?text=Connectome+Lab", use_column_width=True)
+        logo = _logo()
+        if logo is not None:
+            st.image(logo, use_container_width=True)
         st.markdown("---")
         
         page = st.radio(
@@ -182,7 +492,7 @@ def main():
             st.toast("Newsletter scheduled!")
         
         st.markdown("---")
-        st.markdown(f"*Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M')}*")
+        st.markdown(f"*Last updated: {_now_stamp()}*")
     
     # Load data
     fellows_df = load_sample_data()
@@ -203,41 +513,19 @@ def main():
         render_settings()
 
 
+@st.fragment
 def render_overview(fellows_df: pd.DataFrame, budget_data: dict):
     """Render overview page."""
     
     # KPI Metrics
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric(
-            label="Active Fellows",
-            value=len(fellows_df[fellows_df['status'] == 'active']),
-            delta="2 this year"
-        )
-    
-    with col2:
-        st.metric(
-            label="Total Publications",
-            value=fellows_df['publications'].sum(),
-            delta="+3 this quarter"
-        )
-    
-    with col3:
-        avg_score = fellows_df['score'].mean()
-        st.metric(
-            label="Average Score",
-            value=f"{avg_score:.1f}",
-            delta="+2.5 vs last quarter"
-        )
-    
-    with col4:
-        budget_pct = budget_data['spent'] / budget_data['total_budget'] * 100
-        st.metric(
-            label="Budget Utilization",
-            value=f"{budget_pct:.1f}%",
-            delta=None
-        )
+    active, publications, avg_score = _overview_kpis(fellows_df)
+    budget_pct = budget_data['spent'] / budget_data['total_budget'] * 100
+    st.markdown(_kpi_grid([
+        ("Active Fellows", str(active), "2 this year"),
+        ("Total Publications", str(publications), "+3 this quarter"),
+        ("Average Score", f"{avg_score:.1f}", "+2.5 vs last quarter"),
+        ("Budget Utilization", f"{budget_pct:.1f}%", None),
+    ]), unsafe_allow_html=True)
     
     st.markdown("---")
     
@@ -246,47 +534,21 @@ def render_overview(fellows_df: pd.DataFrame, budget_data: dict):
     
     with col1:
         st.markdown('<h3 class="section-header">Fellows by Department</h3>', unsafe_allow_html=True)
-        dept_counts = fellows_df['department'].value_counts()
-        fig = px.pie(
-            values=dept_counts.values,
-            names=dept_counts.index,
-            color_discrete_sequence=px.colors.qualitative.Set2
-        )
-        fig.update_layout(margin=dict(t=20, b=20, l=20, r=20))
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(_dept_pie(fellows_df), use_container_width=True)
     
     with col2:
         st.markdown('<h3 class="section-header">Research Area Distribution</h3>', unsafe_allow_html=True)
-        area_counts = fellows_df['research_area'].value_counts()
-        fig = px.bar(
-            x=area_counts.index,
-            y=area_counts.values,
-            color=area_counts.values,
-            color_continuous_scale='Viridis'
-        )
-        fig.update_layout(
-            xaxis_title="Research Area",
-            yaxis_title="Fellows",
-            showlegend=False,
-            margin=dict(t=20, b=20, l=20, r=20)
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(_area_bar(fellows_df), use_container_width=True)
     
     # Recent activity
     st.markdown('<h3 class="section-header">Recent Activity</h3>', unsafe_allow_html=True)
     
-    activities = [
-        {"date": "2025-12-01", "type": "📄", "description": "김철수 - NeurIPS workshop paper submitted"},
-        {"date": "2025-11-28", "type": "🎓", "description": "이영희 - Princeton visit completed"},
-        {"date": "2025-11-25", "type": "💻", "description": "박민준 - Brain-JEPA v0.2 released"},
-        {"date": "2025-11-20", "type": "🏆", "description": "정수진 - Best poster award at OHBM"},
-        {"date": "2025-11-15", "type": "📊", "description": "Q3 evaluation completed for all fellows"},
-    ]
-    
-    for act in activities:
-        st.markdown(f"**{act['date']}** {act['type']} {act['description']}")
+    st.markdown("\n\n".join(
+        f"**{act['date']}** {act['type']} {act['description']}" for act in ACTIVITIES
+    ))
 
 
+@st.fragment
 def render_fellows(fellows_df: pd.DataFrame):
     """Render fellows management page."""
     
@@ -297,21 +559,19 @@ def render_fellows(fellows_df: pd.DataFrame):
     with col1:
         status_filter = st.selectbox("Status", ["All", "active", "on_leave", "graduated"])
     with col2:
-        dept_filter = st.selectbox("Department", ["All"] + list(fellows_df['department'].unique()))
+        dept_filter = st.selectbox("Department", _dept_choices(fellows_df))
     with col3:
         search = st.text_input("Search", placeholder="Search by name or ID...")
     
     # Apply filters
-    filtered_df = fellows_df.copy()
-    if status_filter != "All":
-        filtered_df = filtered_df[filtered_df['status'] == status_filter]
-    if dept_filter != "All":
-        filtered_df = filtered_df[filtered_df['department'] == dept_filter]
-    if search:
-        filtered_df = filtered_df[
-            filtered_df['name'].str.contains(search, case=False) |
-            filtered_df['id'].str.contains(search, case=False)
-        ]
+    # Reruns that leave the filters untouched reuse the last result
+    filter_key = (status_filter, dept_filter, search)
+    if st.session_state.get("_fellows_filter_key") != filter_key:
+        st.session_state["_fellows_filter_key"] = filter_key
+        st.session_state["_fellows_filtered"] = _apply_filters(
+            fellows_df, status_filter, dept_filter, search
+        )
+    filtered_df = st.session_state["_fellows_filtered"]
     
     # Display table
     st.dataframe(
@@ -335,84 +595,46 @@ def render_fellows(fellows_df: pd.DataFrame):
     selected_fellow = st.selectbox("Select Fellow for Details", filtered_df['id'].tolist())
     
     if selected_fellow:
-        fellow = filtered_df[filtered_df['id'] == selected_fellow].iloc[0]
+        fellow = _fellows_by_id(fellows_df).loc[selected_fellow]
         
         col1, col2 = st.columns([1, 2])
         
         with col1:
-            st.markdown(f"### {fellow['name']}")
-            st.markdown(f"**ID:** {fellow['id']}")
-            st.markdown(f"**Department:** {fellow['department']}")
-            st.markdown(f"**Mentor:** {fellow['mentor']}")
-            st.markdown(f"**Research:** {fellow['research_area']}")
+            st.markdown(
+                f"### {fellow['name']}\n\n"
+                f"**ID:** {fellow['id']}\n\n"
+                f"**Department:** {fellow['department']}\n\n"
+                f"**Mentor:** {fellow['mentor']}\n\n"
+                f"**Research:** {fellow['research_area']}"
+            )
         
         with col2:
             # Performance chart
-            performance_data = {
-                "Category": ["Research", "Publications", "Participation", "Collaboration", "Initiative"],
-                "Score": [85, 90, 88, 82, 87],  # Sample scores
-            }
-            fig = px.bar(
-                performance_data,
-                x="Category",
-                y="Score",
-                color="Score",
-                color_continuous_scale="RdYlGn",
-                range_color=[0, 100]
-            )
-            fig.update_layout(
-                title="Performance Breakdown",
-                yaxis_range=[0, 100],
-                showlegend=False
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(_performance_bar(selected_fellow), use_container_width=True)
 
 
+@st.fragment
 def render_mentors():
     """Render mentors page."""
     
     st.markdown('<h2 class="section-header">Mentor Network</h2>', unsafe_allow_html=True)
     
-    mentors = [
-        {
-            "name": "유신재 교수",
-            "affiliation": "Brookhaven National Laboratory",
-            "expertise": "Brain Imaging, Biomarkers",
-            "fellows": 2,
-            "hours": 45,
-            "status": "🟢 Active"
-        },
-        {
-            "name": "박기태 박사",
-            "affiliation": "Brookhaven National Laboratory",
-            "expertise": "Computational Neuroscience, ML",
-            "fellows": 1,
-            "hours": 32,
-            "status": "🟢 Active"
-        },
-        {
-            "name": "Uri Hasson",
-            "affiliation": "Princeton University",
-            "expertise": "Language-Brain, Neural Communication",
-            "fellows": 2,
-            "hours": 28,
-            "status": "🟢 Active"
-        },
-    ]
-    
-    for mentor in mentors:
+    for mentor in MENTORS:
         with st.expander(f"{mentor['status']} **{mentor['name']}** - {mentor['affiliation']}"):
             col1, col2, col3 = st.columns(3)
             col1.metric("Current Fellows", mentor['fellows'])
             col2.metric("Mentoring Hours", mentor['hours'])
             col3.write(f"**Expertise:** {mentor['expertise']}")
             
-            st.markdown("**Activities:**")
-            st.markdown("- Monthly 1:1 sessions")
-            st.markdown("- Quarterly seminars")
-            st.markdown("- Paper review support")
+            st.markdown(
+                "**Activities:**\n"
+                "- Monthly 1:1 sessions\n"
+                "- Quarterly seminars\n"
+                "- Paper review support"
+            )
 
 
+@st.fragment
 def render_budget(budget_data: dict):
     """Render budget page."""
     
@@ -431,39 +653,28 @@ def render_budget(budget_data: dict):
     # Budget by category
     st.markdown("### Budget by Category")
     
-    categories = budget_data['categories']
-    
-    for cat_name, cat_data in categories.items():
-        progress = cat_data['spent'] / cat_data['budget']
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            st.progress(progress, text=f"{cat_name}: ₩{cat_data['spent']:,.0f} / ₩{cat_data['budget']:,.0f}")
-        with col2:
-            st.write(f"{progress*100:.1f}%")
+    st.dataframe(
+        _budget_table(budget_data),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "spent": st.column_config.NumberColumn("Spent", format="₩%d"),
+            "budget": st.column_config.NumberColumn("Budget", format="₩%d"),
+            "utilization": st.column_config.ProgressColumn(
+                "Utilization",
+                min_value=0,
+                max_value=100,
+                format="%.1f%%",
+            ),
+        }
+    )
     
     # Spending trend chart
     st.markdown("### Monthly Spending Trend")
-    
-    months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-    spending = [15, 18, 22, 25, 30, 35, 40, 45, 50, 55, 60, 65]  # Cumulative (millions)
-    
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=months,
-        y=spending,
-        mode='lines+markers',
-        fill='tozeroy',
-        line=dict(color='#667eea', width=3),
-        marker=dict(size=8)
-    ))
-    fig.update_layout(
-        yaxis_title="Cumulative Spending (Million ₩)",
-        xaxis_title="Month",
-        showlegend=False
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(_spending_trend(), use_container_width=True)
 
 
+@st.fragment
 def render_research_progress(fellows_df: pd.DataFrame):
     """Render research progress page."""
     
@@ -472,31 +683,7 @@ def render_research_progress(fellows_df: pd.DataFrame):
     # Research milestones
     st.markdown("### Active Research Projects")
     
-    projects = [
-        {
-            "title": "BrainLM Korean Adaptation",
-            "lead": "김철수",
-            "progress": 65,
-            "status": "On Track",
-            "next_milestone": "ICLR 2026 submission"
-        },
-        {
-            "title": "Language-Brain Alignment Study",
-            "lead": "이영희",
-            "progress": 80,
-            "status": "Ahead",
-            "next_milestone": "Nature Neuro revision"
-        },
-        {
-            "title": "Brain-JEPA Multimodal Extension",
-            "lead": "박민준",
-            "progress": 45,
-            "status": "On Track",
-            "next_milestone": "NeurIPS 2026 workshop"
-        },
-    ]
-    
-    for proj in projects:
+    for proj in PROJECTS:
         with st.container():
             col1, col2 = st.columns([3, 1])
             with col1:
@@ -515,21 +702,13 @@ def render_research_progress(fellows_df: pd.DataFrame):
     # Publication pipeline
     st.markdown("### Publication Pipeline")
     
-    pipeline = {
-        "In Progress": ["BrainLM Korean Dataset Paper", "Multimodal Review Article"],
-        "Under Review": ["Language-Brain Alignment (Nature Neuro)", "Brain-JEPA Extension (arXiv)"],
-        "Accepted": ["Foundation Models in Neuroscience (Book Chapter)"],
-        "Published": ["ICLR Workshop 2025 Paper", "OHBM Abstract 2025"],
-    }
-    
     cols = st.columns(4)
-    for i, (stage, papers) in enumerate(pipeline.items()):
+    for i, (stage, papers) in enumerate(PUBLICATION_PIPELINE.items()):
         with cols[i]:
-            st.markdown(f"**{stage}**")
-            for paper in papers:
-                st.markdown(f"- {paper}")
+            st.markdown(f"**{stage}**\n" + "\n".join(f"- {paper}" for paper in papers))
 
 
+@st.fragment
 def render_settings():
     """Render settings page."""
     
@@ -0,0 +1,39 @@
+"""Tests for the Brain-JEPA model."""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from src.research.jepa.config import BrainJEPAConfig
+from src.research.jepa.model import BrainJEPA
+
+
+def small_model() -> BrainJEPA:
+    config = BrainJEPAConfig(
+        num_rois=16,
+        d_model=32,
+        n_heads=4,
+        n_encoder_layers=2,
+        n_predictor_layers=1,
+        d_ff=64,
+        max_seq_len=24,
+        predictor_hidden_dim=16,
+        gradient_pos_dim=8,
+        dropout=0.0,
+        amp_dtype=None,
+    )
+    return BrainJEPA(config).eval()
+
+
+@pytest.mark.parametrize("pooling", ["mean", "cls", "none"])
+def test_scripted_embedder_matches_get_embeddings(pooling):
+    torch.manual_seed(0)
+    model = small_model()
+    x = torch.randn(3, 20, 16)
+
+    scripted = model.to_scripted_embedder()
+
+    expected = model.get_embeddings(x, pooling=pooling)
+    actual = scripted(x, pooling)
+    assert actual.shape == expected.shape
+    assert torch.allclose(actual, expected, atol=1e-5)
@@ -0,0 +1,30 @@
+"""Tests for MultiModelClient."""
+
+import asyncio
+
+from src.ai.llm.client import MultiModelClient
+
+
+async def test_identical_deterministic_calls_dispatch_once():
+    client = MultiModelClient()
+    model = client.default_model
+    config, _ = client._routes[model]
+    calls = []
+    release = asyncio.Event()
+
+    async def dispatch(prompt, config, system, max_tokens, temperature,
+                       enable_thinking, thinking_budget):
+        calls.append(prompt)
+        await release.wait()
+        return {"content": "answer", "thinking": "", "usage": {}, "model": config.name}
+
+    client._routes[model] = (config, dispatch)
+
+    first = asyncio.create_task(client.generate("same prompt", temperature=0.0))
+    second = asyncio.create_task(client.generate("same prompt", temperature=0.0))
+    await asyncio.sleep(0.01)
+    release.set()
+    results = await asyncio.gather(first, second)
+
+    assert len(calls) == 1
+    assert [r["content"] for r in results] == ["answer", "answer"]